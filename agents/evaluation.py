@@ -1,18 +1,128 @@
-from typing import Dict, List, Any, TypedDict, Optional
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from typing import Annotated, AsyncIterator, Dict, Iterator, List, Any, Set, TypedDict, Optional
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.language_models.chat_models import BaseChatModel
 # from langchain_openai import ChatOpenAI
-from langchain_community.chat_models import ChatOllama
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, END
 # from langgraph.prebuilt import ToolExecutor
 
+from data_models.evaluation import StructuredEvaluation
+from pydantic import ValidationError
 from utils.config import settings
+from utils.extract_pdf import PDFExtractor
+from utils.external_resources import OllamaHTTPPool
+from utils.llm_cache import LLMCache
+from utils.llm_router import LLMRouter
+from utils.metrics import CASCADE_DECISIONS, LLM_CACHE_LOOKUPS, LLM_ERRORS, LLM_SECONDS, LLM_TOKENS, NODE_SECONDS, PROMPT_TOKENS, SKIPPED_LLM_NODES, record_tokens, timed
+from utils.ollama_client import PooledChatOllama
+from utils.prompt_builder import PromptBuilder, estimate_messages, first_sentence
+from utils.resume_sections import changed_sections, section_hashes
+from utils.skill_matcher import score_technical
+import asyncio
 import json
 import re
-from datetime import datetime
-import PyPDF2
-import io
+import time
+import operator
+from textwrap import dedent
 # import networkx as nx
 
+# Scoring nodes that only depend on extracted_info, job_description and
+# scoring_criteria; they fan out after extraction and join at compute_final_score
+SCORING_NODES = [
+    "analyze_technical_qualifications",
+    "evaluate_experience",
+    "assess_cultural_fit",
+    "calculate_additional_factors",
+]
+
+# Early-reject runs end here instead of generate_feedback once a resume
+# cannot pass; it writes templated feedback without calling the LLM
+REJECT_NODE = "reject_feedback"
+
+# Graph nodes in execution order, with the state keys each one reads and writes.
+# Criteria sections are addressed as "scoring_criteria.<section>" so a change
+# to one section only invalidates the node that reads it.
+NODE_ORDER = [
+    "extract_resume_info",
+    *SCORING_NODES,
+    "compute_final_score",
+    "generate_feedback",
+]
+NODE_INPUTS = {
+    "extract_resume_info": ["resume_text"],
+    "analyze_technical_qualifications": [
+        "extracted_info", "job_description", "scoring_criteria.technical", "resume_text", "skill_matching", "mode",
+    ],
+    "evaluate_experience": ["extracted_info", "job_description", "scoring_criteria.experience", "mode"],
+    "assess_cultural_fit": ["extracted_info", "job_description", "scoring_criteria.cultural_fit", "mode"],
+    "calculate_additional_factors": ["extracted_info", "job_description", "scoring_criteria.additional", "mode"],
+    "compute_final_score": [
+        "technical_score", "experience_score", "cultural_fit_score", "additional_score",
+        "scoring_criteria.pass_threshold",
+    ],
+    "generate_feedback": [
+        "extracted_info", "job_description", "technical_score", "experience_score", "cultural_fit_score",
+        "additional_score", "total_score", "pass_fail_status", "messages", "early_reject",
+    ],
+}
+NODE_OUTPUTS = {
+    "extract_resume_info": ["extracted_info", "messages"],
+    "analyze_technical_qualifications": ["technical_score", "messages"],
+    "evaluate_experience": ["experience_score", "messages"],
+    "assess_cultural_fit": ["cultural_fit_score", "messages"],
+    "calculate_additional_factors": ["additional_score", "messages"],
+    "compute_final_score": ["total_score", "pass_fail_status", "skipped_nodes"],
+    "generate_feedback": ["detailed_feedback", "recommendations"],
+    # Not in NODE_ORDER: it never needs re-running by itself, a rescore of an
+    # early reject re-runs the skipped nodes instead
+    REJECT_NODE: [
+        "technical_score", "experience_score", "cultural_fit_score", "additional_score",
+        "total_score", "pass_fail_status", "detailed_feedback", "recommendations", "skipped_nodes",
+    ],
+}
+# Resume sections each scoring node reads. When both versions of an edited
+# resume split into sections, only the nodes reading a changed section re-run;
+# the extraction re-runs on any change but does not invalidate the others
+NODE_SECTIONS = {
+    "analyze_technical_qualifications": ["skills", "experience", "projects", "certifications"],
+    "evaluate_experience": ["summary", "experience"],
+    "assess_cultural_fit": ["summary", "experience", "achievements"],
+    "calculate_additional_factors": ["education", "certifications", "achievements", "projects"],
+}
+# Update key under which a resumed run first yields what earlier attempts scored
+RESTORED_NODE = "restored_checkpoint"
+# Score line every graph-mode scoring response must contain
+SCORE_PATTERN = re.compile(r'Score:\s*(\d+\.?\d*)')
+# Update key of a cascade run's last update: which tier decided it and why
+CASCADE_NODE = "cascade"
+# Label each node uses for its entry in state["messages"]
+MESSAGE_LABELS = {
+    "extract_resume_info": "extract_resume_info",
+    "analyze_technical_qualifications": "technical_analysis",
+    "evaluate_experience": "experience_evaluation",
+    "assess_cultural_fit": "cultural_fit_assessment",
+    "calculate_additional_factors": "additional_factors",
+}
+
+# Structured mode replaces SCORING_NODES with this single JSON-constrained call;
+# it re-runs whenever any of the nodes it stands in for would
+STRUCTURED_NODE = "score_all_criteria"
+# StructuredEvaluation field -> (scoring node, state key, criteria section, default max points)
+STRUCTURED_FIELDS = {
+    "technical": ("analyze_technical_qualifications", "technical_score", "technical", 35),
+    "experience": ("evaluate_experience", "experience_score", "experience", 30),
+    "cultural_fit": ("assess_cultural_fit", "cultural_fit_score", "cultural_fit", 20),
+    "additional": ("calculate_additional_factors", "additional_score", "additional", 15),
+}
+# Scoring node -> (criterion, state key, criteria section, default max points)
+NODE_CRITERIA = {
+    node: (field, state_key, section, default)
+    for field, (node, state_key, section, default) in STRUCTURED_FIELDS.items()
+}
+# State keys of the four sub-scores
+SCORE_KEYS = [state_key for node, state_key, section, default in STRUCTURED_FIELDS.values()]
+
 # State definition for the resume scoring workflow
 class ResumeState(TypedDict):
     resume_text: str
@@ -27,58 +137,372 @@ class ResumeState(TypedDict):
     detailed_feedback: Dict[str, Any]
     recommendations: List[str]
     pass_fail_status: str
-    messages: List[Any]
+    # Parallel nodes each contribute their own entries, so messages is merged
+    # with a reducer instead of being mutated in place
+    messages: Annotated[List[Any], operator.add]
+    # Re-evaluation only: LLM nodes outside nodes_to_run reuse their previous
+    # outputs and their entries from previous_messages instead of calling the LLM
+    nodes_to_run: Optional[List[str]]
+    previous_messages: List[Any]
+    # "llm" lets the model judge skills, "local" scores the technical node
+    # with utils.skill_matcher only, "hybrid" matches skills locally and asks
+    # the model for the experience share of the score
+    skill_matching: str
+    # "graph" runs SCORING_NODES as separate calls, "structured" runs STRUCTURED_NODE
+    mode: str
+    # Stop scoring once pass_threshold is out of reach and skip the LLM feedback for rejects
+    early_reject: bool
+    # Scoring nodes an early reject did not run
+    skipped_nodes: List[str]
+    # Score with the base models first and re-score borderline or unparsable
+    # results with the escalation models
+    cascade: bool
 
 class ResumeScorer:
-    def __init__(self, model_name: str = "gpt-4"):
-        self.llm = ChatOllama(
-            model=model_name,
-            base_url=settings.llm_url_ollama # Default Ollama endpoint
-        )
-        self.workflow = self._create_workflow()
-        print(self.workflow.get_graph().draw_mermaid())
+    def __init__(self, model_name: str = "gpt-4", cache: Optional[LLMCache] = None, max_retries: int = 0, retry_backoff: float = 1.0, skill_matching: str = "llm", mode: str = "graph", early_reject: bool = False, http_pool: Optional[OllamaHTTPPool] = None, llm: Optional[BaseChatModel] = None, router: Optional[LLMRouter] = None, prompt_budgets: Optional[Dict[str, int]] = None, checkpointer: Optional[BaseCheckpointSaver] = None, node_llms: Optional[Dict[str, BaseChatModel]] = None, escalation_llms: Optional[Dict[str, BaseChatModel]] = None, cascade_band: float = 10.0):
+        if router is not None:
+            # Calls are balanced over the router's endpoints
+            self.llm = router.chat_model()
+            self.json_llm = router.chat_model(format="json")
+        else:
+            # Both clients share http_pool's keep-alive connections when one is given
+            self.llm = llm or PooledChatOllama(
+                model=model_name,
+                base_url=settings.llm_url_ollama, # Default Ollama endpoint
+                http_pool=http_pool,
+            )
+            # Same model constrained to emit JSON, for the structured scoring call;
+            # an injected llm (benchmarks, tests) serves both
+            self.json_llm = llm or PooledChatOllama(model=model_name, base_url=settings.llm_url_ollama, format="json", http_pool=http_pool)
+        self.cache = cache
+        # Failed LLM calls are retried with exponential backoff before the node fails
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.skill_matching = skill_matching
+        self.mode = mode
+        self.early_reject = early_reject
+        # Token budgets for the resume, job description and reasoning parts of the prompts
+        self.prompts = PromptBuilder(prompt_budgets)
+        # Every LLM node is split into a prompt builder and a response parser
+        # so the same logic backs both the sync and the async graph runs
+        self.llm_nodes = {
+            "extract_resume_info": (self._extract_resume_info_messages, self._extract_resume_info_update),
+            "analyze_technical_qualifications": (self._technical_messages, self._technical_update),
+            "evaluate_experience": (self._experience_messages, self._experience_update),
+            "assess_cultural_fit": (self._cultural_fit_messages, self._cultural_fit_update),
+            "calculate_additional_factors": (self._additional_messages, self._additional_update),
+            "generate_feedback": (self._feedback_messages, self._feedback_update),
+            STRUCTURED_NODE: (self._structured_messages, self._structured_update),
+        }
+        # LLM nodes that use another client than self.llm, e.g. a smaller
+        # model for the extraction or a larger one for the feedback
+        self.node_llms = {STRUCTURED_NODE: self.json_llm, **(node_llms or {})}
+        # Clients of the cascade's escalation tier, by node with a "default"
+        # for the rest; a cascade re-scores a result with them when its
+        # total_score is within cascade_band points of pass_threshold
+        self.escalation_llms = escalation_llms or {}
+        self.cascade_band = cascade_band
+        # Responses that fail validation are retried and never cached
+        self.response_validators = {STRUCTURED_NODE: self._parse_structured}
+        # Nodes that can answer without the LLM; they return None to fall through to it
+        self.local_nodes = {
+            "analyze_technical_qualifications": self._technical_local_update,
+        }
+        # Compiled once per mode, requests pick one with the mode and early_reject arguments
+        self.workflows = self._create_workflows()
+        self.workflow = self.workflows["graph"]
+        # Runs given a run_id save a checkpoint after every step, so a failed
+        # or interrupted run picks up after its last completed node
+        self.checkpointer = checkpointer
+        self.checkpointed_workflows = self._create_workflows(checkpointer) if checkpointer is not None else {}
 
-    
-    def _create_workflow(self) -> StateGraph:
+    def _create_workflows(self, checkpointer: Optional[BaseCheckpointSaver] = None) -> Dict[str, Any]:
+        """Compiled workflows keyed by mode, plus a ":early_reject" variant of each"""
+        return {
+            "graph": self._create_workflow(checkpointer),
+            "structured": self._create_structured_workflow(checkpointer),
+            "graph:early_reject": self._create_early_reject_workflow(checkpointer),
+            "structured:early_reject": self._create_structured_workflow(checkpointer, early_reject=True),
+        }
+
+    def _create_workflow(self, checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
         """Create the LangGraph workflow for resume scoring"""
         workflow = StateGraph(ResumeState)
-        
+
         # Add nodes
-        workflow.add_node("extract_resume_info", self.extract_resume_info)
-        workflow.add_node("analyze_technical_qualifications", self.analyze_technical_qualifications)
-        workflow.add_node("evaluate_experience", self.evaluate_experience)
-        workflow.add_node("assess_cultural_fit", self.assess_cultural_fit)
-        workflow.add_node("calculate_additional_factors", self.calculate_additional_factors)
+        workflow.add_node("extract_resume_info", self._node("extract_resume_info"))
+        for node in SCORING_NODES:
+            workflow.add_node(node, self._node(node))
         workflow.add_node("compute_final_score", self.compute_final_score)
-        workflow.add_node("generate_feedback", self.generate_feedback)
-        
-        # Define the flow
+        workflow.add_node("generate_feedback", self._node("generate_feedback"))
+
+        # Define the flow: fan out to the independent scoring nodes after
+        # extraction and join once all of them have produced a score
         workflow.set_entry_point("extract_resume_info")
-        workflow.add_edge("extract_resume_info", "analyze_technical_qualifications")
-        workflow.add_edge("analyze_technical_qualifications", "evaluate_experience")
-        workflow.add_edge("evaluate_experience", "assess_cultural_fit")
-        workflow.add_edge("assess_cultural_fit", "calculate_additional_factors")
-        workflow.add_edge("calculate_additional_factors", "compute_final_score")
+        for node in SCORING_NODES:
+            workflow.add_edge("extract_resume_info", node)
+        workflow.add_edge(SCORING_NODES, "compute_final_score")
         workflow.add_edge("compute_final_score", "generate_feedback")
         workflow.add_edge("generate_feedback", END)
-        
-        return workflow.compile()
-    
+
+        return workflow.compile(checkpointer=checkpointer)
+
+    def _create_structured_workflow(self, checkpointer: Optional[BaseCheckpointSaver] = None, early_reject: bool = False) -> StateGraph:
+        """Workflow that scores all four criteria in one JSON-constrained LLM call"""
+        workflow = StateGraph(ResumeState)
+
+        workflow.add_node("extract_resume_info", self._node("extract_resume_info"))
+        workflow.add_node(STRUCTURED_NODE, self._node(STRUCTURED_NODE))
+        workflow.add_node("compute_final_score", self.compute_final_score)
+        workflow.add_node("generate_feedback", self._node("generate_feedback"))
+
+        workflow.set_entry_point("extract_resume_info")
+        workflow.add_edge("extract_resume_info", STRUCTURED_NODE)
+        workflow.add_edge(STRUCTURED_NODE, "compute_final_score")
+        if early_reject:
+            # All scores come from one call, so only the feedback of rejects can be saved
+            workflow.add_node(REJECT_NODE, self.reject_feedback)
+            workflow.add_conditional_edges("compute_final_score", self._route_feedback, ["generate_feedback", REJECT_NODE])
+            workflow.add_edge(REJECT_NODE, END)
+        else:
+            workflow.add_edge("compute_final_score", "generate_feedback")
+        workflow.add_edge("generate_feedback", END)
+
+        return workflow.compile(checkpointer=checkpointer)
+
+    def _create_early_reject_workflow(self, checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+        """Workflow that scores the criteria one at a time and stops once the resume cannot pass.
+
+        After extraction and after every sub-score, _next_scoring_node picks
+        the next criterion, largest max_points first, or ends the run in
+        REJECT_NODE when even full marks on the rest would miss pass_threshold.
+        """
+        workflow = StateGraph(ResumeState)
+
+        workflow.add_node("extract_resume_info", self._node("extract_resume_info"))
+        for node in SCORING_NODES:
+            workflow.add_node(node, self._node(node))
+        workflow.add_node("compute_final_score", self.compute_final_score)
+        workflow.add_node("generate_feedback", self._node("generate_feedback"))
+        workflow.add_node(REJECT_NODE, self.reject_feedback)
+
+        workflow.set_entry_point("extract_resume_info")
+        for node in ["extract_resume_info", *SCORING_NODES]:
+            workflow.add_conditional_edges(node, self._next_scoring_node, [*SCORING_NODES, "compute_final_score", REJECT_NODE])
+        workflow.add_conditional_edges("compute_final_score", self._route_feedback, ["generate_feedback", REJECT_NODE])
+        workflow.add_edge("generate_feedback", END)
+        workflow.add_edge(REJECT_NODE, END)
+
+        return workflow.compile(checkpointer=checkpointer)
+
+    def _node(self, name: str) -> RunnableLambda:
+        """Wrap an LLM node so LangGraph uses invoke for stream and ainvoke for astream"""
+        def run(state: ResumeState, config: RunnableConfig) -> Dict[str, Any]:
+            with timed(NODE_SECONDS, span=f"node.{name}", node=name):
+                return self._run_node(name, state, config)
+
+        async def arun(state: ResumeState, config: RunnableConfig) -> Dict[str, Any]:
+            with timed(NODE_SECONDS, span=f"node.{name}", node=name):
+                return await self._arun_node(name, state, config)
+
+        return RunnableLambda(run, afunc=arun, name=name)
+
+    def _reused_update(self, name: str, state: ResumeState) -> Optional[Dict[str, Any]]:
+        """Previous outputs of a node that does not need to re-run, or None"""
+        if state.get("nodes_to_run") is None:
+            return None
+        nodes = SCORING_NODES if name == STRUCTURED_NODE else [name]
+        if any(node in state["nodes_to_run"] for node in nodes):
+            return None
+        outputs = [key for node in nodes for key in NODE_OUTPUTS[node]]
+        update = {key: state[key] for key in outputs if key != "messages"}
+        if "messages" in outputs:
+            labels = {MESSAGE_LABELS[node] for node in nodes}
+            update["messages"] = [
+                message for message in state.get("previous_messages", [])
+                if message.get("node") in labels
+            ]
+        return update
+
+    def _run_node(self, name: str, state: ResumeState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        reused = self._reused_update(name, state)
+        if reused is not None:
+            return reused
+        if self._deferred(name, state, config):
+            return {}
+        local_update = self.local_nodes.get(name, lambda state: None)(state)
+        if local_update is not None:
+            return local_update
+        build_messages, build_update = self.llm_nodes[name]
+        messages = build_messages(state)
+        PROMPT_TOKENS.observe(estimate_messages(messages), node=name)
+        try:
+            response = self._invoke_llm(name, messages, config, self._llm(name, config), self.response_validators.get(name))
+        except ValidationError as e:
+            if not self._escalates(state, config):
+                raise
+            return self._unparsed_update(name, e)
+        return self._checked_update(name, response, build_update(state, response))
+
+    async def _arun_node(self, name: str, state: ResumeState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        reused = self._reused_update(name, state)
+        if reused is not None:
+            return reused
+        if self._deferred(name, state, config):
+            return {}
+        local_update = self.local_nodes.get(name, lambda state: None)(state)
+        if local_update is not None:
+            return local_update
+        build_messages, build_update = self.llm_nodes[name]
+        messages = build_messages(state)
+        PROMPT_TOKENS.observe(estimate_messages(messages), node=name)
+        try:
+            response = await self._ainvoke_llm(name, messages, config, self._llm(name, config), self.response_validators.get(name))
+        except ValidationError as e:
+            if not self._escalates(state, config):
+                raise
+            return self._unparsed_update(name, e)
+        return self._checked_update(name, response, build_update(state, response))
+
+    @staticmethod
+    def _tier(config: Optional[RunnableConfig]) -> str:
+        return (config or {}).get("configurable", {}).get("tier", "base")
+
+    def _llm(self, name: str, config: Optional[RunnableConfig]) -> Optional[BaseChatModel]:
+        """Client for ``name`` in the tier the run is scoring with; None means self.llm"""
+        if self._tier(config) == "escalation":
+            return self.escalation_llms.get(name, self.escalation_llms.get("default"))
+        return self.node_llms.get(name)
+
+    def _escalates(self, state: ResumeState, config: Optional[RunnableConfig]) -> bool:
+        """Whether a failure in this run is left to the cascade's escalation tier"""
+        return bool(state.get("cascade")) and self._tier(config) == "base"
+
+    def _deferred(self, name: str, state: ResumeState, config: Optional[RunnableConfig]) -> bool:
+        # The escalation tier writes the feedback of results it re-scores
+        return name == "generate_feedback" and self._escalates(state, config) and self._escalation_reason(state) is not None
+
+    @staticmethod
+    def _checked_update(name: str, response: AIMessage, update: Dict[str, Any]) -> Dict[str, Any]:
+        """Flag the node's message entries when its response could not be parsed"""
+        if name == "extract_resume_info":
+            failed = "error" in update["extracted_info"]
+        else:
+            failed = name in SCORING_NODES and SCORE_PATTERN.search(response.content) is None
+        if failed:
+            for message in update.get("messages", []):
+                message["parse_failed"] = True
+        return update
+
+    @staticmethod
+    def _unparsed_update(name: str, error: Exception) -> Dict[str, Any]:
+        """Zero scores for a response that failed validation, for the escalation tier to redo"""
+        nodes = SCORING_NODES if name == STRUCTURED_NODE else [name]
+        update = {NODE_CRITERIA[node][1]: 0.0 for node in nodes if node in NODE_CRITERIA}
+        update["messages"] = [
+            {"node": MESSAGE_LABELS[node], "score": 0.0, "reasoning": str(error), "parse_failed": True}
+            for node in nodes
+        ]
+        return update
+
+    def _cache_key(self, messages: List[BaseMessage], config: Optional[RunnableConfig], llm=None) -> Optional[str]:
+        """Cache key for this call, or None when caching is off or bypassed"""
+        if self.cache is None or (config or {}).get("configurable", {}).get("bypass_cache"):
+            return None
+        llm = llm or self.llm
+        model_options = getattr(llm, "_identifying_params", {})
+        return LLMCache.make_key(getattr(llm, "model", ""), model_options, messages)
+
+    def _invoke_llm(self, name: str, messages: List[BaseMessage], config: Optional[RunnableConfig] = None, llm=None, validate=None) -> AIMessage:
+        key = self._cache_key(messages, config, llm)
+        if key is not None:
+            cached = self.cache.get(key)
+            LLM_CACHE_LOOKUPS.inc(node=name, result="miss" if cached is None else "hit")
+            if cached is not None:
+                return AIMessage(content=cached)
+        response = self._llm_invoke_with_retry(name, messages, llm, validate)
+        if key is not None:
+            self.cache.set(key, response.content)
+        return response
+
+    async def _ainvoke_llm(self, name: str, messages: List[BaseMessage], config: Optional[RunnableConfig] = None, llm=None, validate=None) -> AIMessage:
+        key = self._cache_key(messages, config, llm)
+        if key is not None:
+            cached = await self.cache.aget(key)
+            LLM_CACHE_LOOKUPS.inc(node=name, result="miss" if cached is None else "hit")
+            if cached is not None:
+                return AIMessage(content=cached)
+        response = await self._llm_ainvoke_with_retry(name, messages, llm, validate)
+        if key is not None:
+            await self.cache.aset(key, response.content)
+        return response
+
+    @staticmethod
+    def _record_tokens(name: str, model: str, response: AIMessage):
+        # Ollama reports prompt and completion token counts on the final chunk
+        metadata = getattr(response, "response_metadata", None) or {}
+        prompt, completion = metadata.get("prompt_eval_count") or 0, metadata.get("eval_count") or 0
+        LLM_TOKENS.inc(prompt, node=name, model=model, kind="prompt")
+        LLM_TOKENS.inc(completion, node=name, model=model, kind="completion")
+        record_tokens(name, prompt, completion)
+
+    def _llm_invoke_with_retry(self, name: str, messages: List[BaseMessage], llm=None, validate=None) -> AIMessage:
+        llm = llm or self.llm
+        model = getattr(llm, "model", "")
+        for attempt in range(self.max_retries + 1):
+            try:
+                with timed(LLM_SECONDS, span=f"llm.{name}", node=name, model=model):
+                    response = llm.invoke(messages)
+                self._record_tokens(name, model, response)
+                if validate is not None:
+                    validate(response.content)
+                return response
+            except Exception:
+                LLM_ERRORS.inc(node=name)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_backoff * 2 ** attempt)
+
+    async def _llm_ainvoke_with_retry(self, name: str, messages: List[BaseMessage], llm=None, validate=None) -> AIMessage:
+        llm = llm or self.llm
+        model = getattr(llm, "model", "")
+        for attempt in range(self.max_retries + 1):
+            try:
+                with timed(LLM_SECONDS, span=f"llm.{name}", node=name, model=model):
+                    response = await llm.ainvoke(messages)
+                self._record_tokens(name, model, response)
+                if validate is not None:
+                    validate(response.content)
+                return response
+            except Exception:
+                LLM_ERRORS.inc(node=name)
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+
+    @staticmethod
+    def _parse_score(content: str) -> float:
+        # Extract score from response (simplified - in production, use more robust parsing)
+        score_match = SCORE_PATTERN.search(content)
+        return float(score_match.group(1)) if score_match else 0
+
     def extract_text_from_pdf(self, pdf_file_path: str) -> str:
         """Extract text from PDF file"""
         try:
-            with open(pdf_file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return PDFExtractor(pdf_file_path).extract_text()
         except Exception as e:
             return f"Error extracting PDF: {str(e)}"
-    
-    def extract_resume_info(self, state: ResumeState) -> ResumeState:
+
+    def _scoring_messages(self, state: ResumeState, instructions: str) -> List[BaseMessage]:
+        """Shared job/resume context first, so every scoring prompt starts with the same prefix"""
+        return self.prompts.scoring_messages(state["job_description"], state["extracted_info"], instructions)
+
+    def extract_resume_info(self, state: ResumeState) -> Dict[str, Any]:
         """Extract structured information from resume text"""
-        system_prompt = """
+        return self._run_node("extract_resume_info", state)
+
+    def _extract_resume_info_messages(self, state: ResumeState) -> List[BaseMessage]:
+        system_prompt = dedent("""
         You are an expert resume parser. Extract structured information from the resume text.
         Focus on:
         1. Personal information (name, contact details)
@@ -88,17 +512,16 @@ class ResumeScorer:
         5. Certifications
         6. Projects
         7. Achievements/awards
-        
+
         Return the information in a structured JSON format.
-        """
-        
-        messages = [
+        """).strip()
+
+        return [
             SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Resume Text:\n{state['resume_text']}")
+            HumanMessage(content=f"Resume Text:\n{self.prompts.resume_text(state['resume_text'])}")
         ]
-        
-        response = self.llm.invoke(messages)
-        
+
+    def _extract_resume_info_update(self, state: ResumeState, response: AIMessage) -> Dict[str, Any]:
         try:
             # Extract JSON from response
             json_match = re.search(r'\{.*\}', response.content, re.DOTALL)
@@ -108,185 +531,427 @@ class ResumeScorer:
                 extracted_info = {"error": "Could not parse resume structure"}
         except:
             extracted_info = {"error": "JSON parsing failed"}
-        
-        state["extracted_info"] = extracted_info
-        state["messages"].append({"node": "extract_resume_info", "output": extracted_info})
-        return state
-    
-    def analyze_technical_qualifications(self, state: ResumeState) -> ResumeState:
+
+        return {
+            "extracted_info": extracted_info,
+            "messages": [{"node": "extract_resume_info", "output": extracted_info}],
+        }
+
+    def analyze_technical_qualifications(self, state: ResumeState) -> Dict[str, Any]:
         """Analyze technical qualifications and assign score"""
+        return self._run_node("analyze_technical_qualifications", state)
+
+    def _skill_match(self, state: ResumeState) -> Dict[str, Any]:
+        text = f"{state['resume_text']}\n{json.dumps(state['extracted_info'])}"
+        return score_technical(text, state["scoring_criteria"].get("technical", {}))
+
+    def _technical_local_update(self, state: ResumeState) -> Optional[Dict[str, Any]]:
+        if state.get("skill_matching", "llm") != "local":
+            return None
+        match = self._skill_match(state)
+        return {
+            "technical_score": match["score"],
+            "messages": [{"node": "technical_analysis", "score": match["score"], "skill_match": match}],
+        }
+
+    def _technical_messages(self, state: ResumeState) -> List[BaseMessage]:
+        if state.get("skill_matching", "llm") == "hybrid":
+            return self._technical_hybrid_messages(state)
         criteria = state["scoring_criteria"].get("technical", {})
         max_score = criteria.get("max_points", 35)
         required_skills = criteria.get("required_skills", [])
         preferred_skills = criteria.get("preferred_skills", [])
         min_experience = criteria.get("min_years_experience", 0)
-        
-        system_prompt = f"""
+
+        instructions = dedent(f"""
         Analyze the technical qualifications based on:
-        
+
         Required Skills: {required_skills}
         Preferred Skills: {preferred_skills}
         Minimum Experience: {min_experience} years
-        Job Description: {state['job_description']}
-        
+
         Score out of {max_score} points based on:
         - Presence of required skills (60% of score)
         - Presence of preferred skills (25% of score)
         - Years of relevant experience (15% of score)
-        
+
         Provide detailed reasoning for the score.
-        """
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Resume Info:\n{json.dumps(state['extracted_info'], indent=2)}")
-        ]
-        
-        response = self.llm.invoke(messages)
-        
-        # Extract score from response (simplified - in production, use more robust parsing)
-        score_match = re.search(r'Score:\s*(\d+\.?\d*)', response.content)
-        technical_score = float(score_match.group(1)) if score_match else 0
-        
-        state["technical_score"] = min(technical_score, max_score)
-        state["messages"].append({"node": "technical_analysis", "score": technical_score, "reasoning": response.content})
-        return state
-    
-    def evaluate_experience(self, state: ResumeState) -> ResumeState:
+        """).strip()
+
+        return self._scoring_messages(state, instructions)
+
+    def _technical_hybrid_messages(self, state: ResumeState) -> List[BaseMessage]:
+        criteria = state["scoring_criteria"].get("technical", {})
+        match = self._skill_match(state)
+
+        instructions = dedent(f"""
+        Required and preferred skills were already matched against the resume:
+
+        Required skills found: {match['required_matched']}, missing: {match['required_missing']}
+        Preferred skills found: {match['preferred_matched']}, missing: {match['preferred_missing']}
+        Years of experience from date ranges: {match['years_experience']}
+        Minimum Experience: {criteria.get('min_years_experience', 0)} years
+
+        Only judge how relevant the candidate's experience is to this role.
+        Score out of {match['max_points'] - match['required_points'] - match['preferred_points']:.2f} points.
+
+        Provide brief reasoning and end with "Score: <number>".
+        """).strip()
+
+        return self._scoring_messages(state, instructions)
+
+    def _technical_update(self, state: ResumeState, response: AIMessage) -> Dict[str, Any]:
+        max_score = state["scoring_criteria"].get("technical", {}).get("max_points", 35)
+        technical_score = self._parse_score(response.content)
+        if state.get("skill_matching", "llm") == "hybrid":
+            # The LLM only scored the residual share on top of the local skill points
+            match = self._skill_match(state)
+            residual = match["max_points"] - match["required_points"] - match["preferred_points"]
+            technical_score = match["required_points"] + match["preferred_points"] + min(technical_score, residual)
+            return {
+                "technical_score": min(technical_score, max_score),
+                "messages": [{"node": "technical_analysis", "score": technical_score, "reasoning": response.content, "skill_match": match}],
+            }
+
+        return {
+            "technical_score": min(technical_score, max_score),
+            "messages": [{"node": "technical_analysis", "score": technical_score, "reasoning": response.content}],
+        }
+
+    def evaluate_experience(self, state: ResumeState) -> Dict[str, Any]:
         """Evaluate work experience relevance"""
+        return self._run_node("evaluate_experience", state)
+
+    def _experience_messages(self, state: ResumeState) -> List[BaseMessage]:
         criteria = state["scoring_criteria"].get("experience", {})
         max_score = criteria.get("max_points", 30)
-        
-        system_prompt = f"""
+
+        instructions = dedent(f"""
         Evaluate work experience relevance out of {max_score} points based on:
         - Direct industry experience (40%)
         - Similar role experience (35%)
         - Career progression (15%)
         - Achievement track record (10%)
-        
-        Job Description: {state['job_description']}
-        
+
         Consider factors like:
         - Relevance of previous roles
         - Progression in responsibilities
         - Quantifiable achievements
         - Industry alignment
-        """
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Resume Info:\n{json.dumps(state['extracted_info'], indent=2)}")
-        ]
-        
-        response = self.llm.invoke(messages)
-        
-        score_match = re.search(r'Score:\s*(\d+\.?\d*)', response.content)
-        experience_score = float(score_match.group(1)) if score_match else 0
-        
-        state["experience_score"] = min(experience_score, max_score)
-        state["messages"].append({"node": "experience_evaluation", "score": experience_score, "reasoning": response.content})
-        return state
-    
-    def assess_cultural_fit(self, state: ResumeState) -> ResumeState:
+        """).strip()
+
+        return self._scoring_messages(state, instructions)
+
+    def _experience_update(self, state: ResumeState, response: AIMessage) -> Dict[str, Any]:
+        max_score = state["scoring_criteria"].get("experience", {}).get("max_points", 30)
+        experience_score = self._parse_score(response.content)
+
+        return {
+            "experience_score": min(experience_score, max_score),
+            "messages": [{"node": "experience_evaluation", "score": experience_score, "reasoning": response.content}],
+        }
+
+    def assess_cultural_fit(self, state: ResumeState) -> Dict[str, Any]:
         """Assess cultural fit indicators"""
+        return self._run_node("assess_cultural_fit", state)
+
+    def _cultural_fit_messages(self, state: ResumeState) -> List[BaseMessage]:
         criteria = state["scoring_criteria"].get("cultural_fit", {})
         max_score = criteria.get("max_points", 20)
         company_values = criteria.get("company_values", [])
-        
-        system_prompt = f"""
+
+        instructions = dedent(f"""
         Assess cultural fit out of {max_score} points based on:
         - Company values alignment (40%)
         - Communication skills evident in resume (25%)
         - Leadership examples (20%)
         - Teamwork indicators (15%)
-        
+
         Company Values: {company_values}
-        Job Description: {state['job_description']}
-        
+
         Look for evidence of:
         - Clear, professional communication
         - Leadership roles or initiatives
         - Collaborative projects
         - Values alignment through activities/roles
-        """
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Resume Info:\n{json.dumps(state['extracted_info'], indent=2)}")
-        ]
-        
-        response = self.llm.invoke(messages)
-        
-        score_match = re.search(r'Score:\s*(\d+\.?\d*)', response.content)
-        cultural_score = float(score_match.group(1)) if score_match else 0
-        
-        state["cultural_fit_score"] = min(cultural_score, max_score)
-        state["messages"].append({"node": "cultural_fit_assessment", "score": cultural_score, "reasoning": response.content})
-        return state
-    
-    def calculate_additional_factors(self, state: ResumeState) -> ResumeState:
+        """).strip()
+
+        return self._scoring_messages(state, instructions)
+
+    def _cultural_fit_update(self, state: ResumeState, response: AIMessage) -> Dict[str, Any]:
+        max_score = state["scoring_criteria"].get("cultural_fit", {}).get("max_points", 20)
+        cultural_score = self._parse_score(response.content)
+
+        return {
+            "cultural_fit_score": min(cultural_score, max_score),
+            "messages": [{"node": "cultural_fit_assessment", "score": cultural_score, "reasoning": response.content}],
+        }
+
+    def calculate_additional_factors(self, state: ResumeState) -> Dict[str, Any]:
         """Calculate additional factors score"""
+        return self._run_node("calculate_additional_factors", state)
+
+    def _additional_messages(self, state: ResumeState) -> List[BaseMessage]:
         criteria = state["scoring_criteria"].get("additional", {})
         max_score = criteria.get("max_points", 15)
-        
-        system_prompt = f"""
+
+        instructions = dedent(f"""
         Evaluate additional factors out of {max_score} points:
         - Extra certifications (30%)
         - Volunteer work/side projects (25%)
         - Professional development (25%)
         - Publications/speaking (20%)
-        
+
         Look for indicators of:
         - Continuous learning
         - Community involvement
         - Thought leadership
         - Innovation and initiative
-        """
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Resume Info:\n{json.dumps(state['extracted_info'], indent=2)}")
-        ]
-        
-        response = self.llm.invoke(messages)
-        
-        score_match = re.search(r'Score:\s*(\d+\.?\d*)', response.content)
-        additional_score = float(score_match.group(1)) if score_match else 0
-        
-        state["additional_score"] = min(additional_score, max_score)
-        state["messages"].append({"node": "additional_factors", "score": additional_score, "reasoning": response.content})
-        return state
-    
-    def compute_final_score(self, state: ResumeState) -> ResumeState:
+        """).strip()
+
+        return self._scoring_messages(state, instructions)
+
+    def _additional_update(self, state: ResumeState, response: AIMessage) -> Dict[str, Any]:
+        max_score = state["scoring_criteria"].get("additional", {}).get("max_points", 15)
+        additional_score = self._parse_score(response.content)
+
+        return {
+            "additional_score": min(additional_score, max_score),
+            "messages": [{"node": "additional_factors", "score": additional_score, "reasoning": response.content}],
+        }
+
+    def score_all_criteria(self, state: ResumeState) -> Dict[str, Any]:
+        """Score all four criteria in a single structured LLM call"""
+        return self._run_node(STRUCTURED_NODE, state)
+
+    def _structured_messages(self, state: ResumeState) -> List[BaseMessage]:
+        criteria = state["scoring_criteria"]
+        technical = criteria.get("technical", {})
+        max_points = {
+            field: criteria.get(section, {}).get("max_points", default)
+            for field, (_, _, section, default) in STRUCTURED_FIELDS.items()
+        }
+
+        instructions = dedent(f"""
+        Score the candidate against the job on four criteria in one pass.
+
+        technical (out of {max_points['technical']} points):
+        - Required skills {technical.get('required_skills', [])} (60%)
+        - Preferred skills {technical.get('preferred_skills', [])} (25%)
+        - At least {technical.get('min_years_experience', 0)} years of relevant experience (15%)
+
+        experience (out of {max_points['experience']} points):
+        - Direct industry experience (40%), similar role experience (35%),
+          career progression (15%), achievement track record (10%)
+
+        cultural_fit (out of {max_points['cultural_fit']} points):
+        - Alignment with company values {criteria.get('cultural_fit', {}).get('company_values', [])} (40%)
+        - Communication (25%), leadership (20%), teamwork (15%)
+
+        additional (out of {max_points['additional']} points):
+        - Extra certifications (30%), volunteer work/side projects (25%),
+          professional development (25%), publications/speaking (20%)
+
+        Respond with JSON only, matching this JSON schema:
+        {json.dumps(StructuredEvaluation.model_json_schema(), separators=(",", ":"))}
+        """).strip()
+
+        return self._scoring_messages(state, instructions)
+
+    @staticmethod
+    def _parse_structured(content: str) -> StructuredEvaluation:
+        try:
+            return StructuredEvaluation.model_validate_json(content)
+        except ValidationError:
+            # Tolerate prose around the JSON object
+            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            if not json_match:
+                raise
+            return StructuredEvaluation.model_validate_json(json_match.group())
+
+    def _structured_update(self, state: ResumeState, response: AIMessage) -> Dict[str, Any]:
+        evaluation = self._parse_structured(response.content)
+        update = {"messages": []}
+        for field, (node, state_key, section, default) in STRUCTURED_FIELDS.items():
+            result = getattr(evaluation, field)
+            max_score = state["scoring_criteria"].get(section, {}).get("max_points", default)
+            update[state_key] = min(max(result.score, 0), max_score)
+            update["messages"].append({"node": MESSAGE_LABELS[node], **result.model_dump()})
+
+        # Local skill matching still overrides the model's technical score
+        local_update = self._technical_local_update(state)
+        if local_update is not None:
+            update["technical_score"] = local_update["technical_score"]
+            update["messages"][0] = local_update["messages"][0]
+        return update
+
+    def compute_final_score(self, state: ResumeState) -> Dict[str, Any]:
         """Compute final score and pass/fail status"""
         total_score = (
-            state["technical_score"] + 
-            state["experience_score"] + 
-            state["cultural_fit_score"] + 
+            state["technical_score"] +
+            state["experience_score"] +
+            state["cultural_fit_score"] +
             state["additional_score"]
         )
-        
+
         # Determine pass/fail status
         pass_threshold = state["scoring_criteria"].get("pass_threshold", 70)
         pass_fail_status = "PASS" if total_score >= pass_threshold else "FAIL"
-        
-        state["total_score"] = total_score
-        state["pass_fail_status"] = pass_fail_status
-        
-        return state
-    
-    def generate_feedback(self, state: ResumeState) -> ResumeState:
+
+        # Every criterion was scored; clears what an early reject of an
+        # earlier tier or attempt left in the result
+        return {"total_score": total_score, "pass_fail_status": pass_fail_status, "skipped_nodes": []}
+
+    @staticmethod
+    def _max_points(state: ResumeState, node: str) -> float:
+        field, state_key, section, default = NODE_CRITERIA[node]
+        return state["scoring_criteria"].get(section, {}).get("max_points", default)
+
+    @staticmethod
+    def _scored_nodes(state: ResumeState) -> List[str]:
+        """Scoring nodes that have already reported in this run"""
+        labels = {message.get("node") for message in state["messages"]}
+        return [node for node in SCORING_NODES if MESSAGE_LABELS[node] in labels]
+
+    def _max_achievable(self, state: ResumeState) -> float:
+        """Total the resume would get with full marks on every criterion not scored yet"""
+        scored = self._scored_nodes(state)
+        return sum(
+            state[NODE_CRITERIA[node][1]] if node in scored else self._max_points(state, node)
+            for node in SCORING_NODES
+        )
+
+    def _next_scoring_node(self, state: ResumeState) -> str:
+        """Early-reject router: the next criterion to score, or where the run ends.
+
+        Criteria scored without the LLM go first, then the one worth the most
+        points, so a weak resume falls below the threshold in as few LLM calls
+        as possible.
+        """
+        if self._max_achievable(state) < state["scoring_criteria"].get("pass_threshold", 70):
+            return REJECT_NODE
+        scored = self._scored_nodes(state)
+        remaining = [node for node in SCORING_NODES if node not in scored]
+        if not remaining:
+            return "compute_final_score"
+        free = {"analyze_technical_qualifications"} if state["skill_matching"] == "local" else set()
+        return min(remaining, key=lambda node: (node not in free, -self._max_points(state, node)))
+
+    @staticmethod
+    def _route_feedback(state: ResumeState) -> str:
+        return "generate_feedback" if state["pass_fail_status"] == "PASS" else REJECT_NODE
+
+    def reject_feedback(self, state: ResumeState, config: RunnableConfig) -> Dict[str, Any]:
+        """Templated FAIL result for an early reject, in place of the feedback LLM call.
+
+        Criteria that were not scored get None rather than 0, so they cannot
+        be mistaken for a zero score.
+        """
+        scored = self._scored_nodes(state)
+        skipped = [node for node in SCORING_NODES if node not in scored]
+        pass_threshold = state["scoring_criteria"].get("pass_threshold", 70)
+        reasoning = {message.get("node"): message.get("summary") or message.get("reasoning", "") for message in state["messages"]}
+
+        strengths, areas = [], []
+        for node in scored:
+            field = NODE_CRITERIA[node][0]
+            score, max_points = state[NODE_CRITERIA[node][1]], self._max_points(state, node)
+            if score >= 0.7 * max_points:
+                strengths.append(f"{field}: {score:g}/{max_points:g}")
+                continue
+            note = first_sentence(reasoning.get(MESSAGE_LABELS[node], ""))
+            areas.append(f"{field}: {score:g}/{max_points:g}" + (f" - {note}" if note else ""))
+
+        total_score = sum(state[NODE_CRITERIA[node][1]] for node in scored)
+        assessment = f"Scored {total_score:g} against a pass threshold of {pass_threshold:g}"
+        if skipped:
+            assessment += (
+                f"; at most {self._max_achievable(state):g} was reachable, so it was not scored on "
+                f"{', '.join(NODE_CRITERIA[node][0] for node in skipped)}"
+            )
+        recommendations = ["Not advanced to interview"]
+
+        update = {NODE_CRITERIA[node][1]: None for node in skipped}
+        update.update({
+            "total_score": total_score,
+            "pass_fail_status": "FAIL",
+            "skipped_nodes": skipped,
+            "detailed_feedback": {
+                "overall_assessment": assessment + ".",
+                "strengths": strengths,
+                "areas_for_improvement": areas,
+                "recommendations": recommendations,
+                "interview_focus": [],
+                "development_suggestions": [],
+            },
+            "recommendations": recommendations,
+        })
+        # A reject the escalation tier re-scores saved nothing
+        if not (self._escalates(state, config) and self._escalation_reason({**state, **update}) is not None):
+            for node in [*skipped, "generate_feedback"]:
+                SKIPPED_LLM_NODES.inc(node=node)
+        return update
+
+    def _escalation_reason(self, state: ResumeState) -> Optional[str]:
+        """Why a base tier result goes to the escalation tier, or None to keep it.
+
+        An early reject only bounds its total: it is borderline when the
+        best it could have reached is within the band.
+        """
+        if any(message.get("parse_failed") for message in state["messages"]):
+            return "parse_failure"
+        pass_threshold = state["scoring_criteria"].get("pass_threshold", 70)
+        lowest = state["total_score"]
+        highest = lowest + sum(self._max_points(state, node) for node in state.get("skipped_nodes") or [])
+        if pass_threshold - self.cascade_band <= highest and lowest <= pass_threshold + self.cascade_band:
+            return "borderline"
+        return None
+
+    def _cascade_decision(self, state: ResumeState, result: Dict[str, Any]):
+        """Escalation tier state for a base tier ``result`` (None to keep it) and the CASCADE_NODE update"""
+        base = {**state, **result}
+        reason = self._escalation_reason(base)
+        tier = "base" if reason is None else "escalation"
+        CASCADE_DECISIONS.inc(tier=tier, reason=reason or "confident")
+        decision = {
+            "decided_by_tier": tier,
+            "cascade": {
+                "reason": reason,
+                "band": self.cascade_band,
+                # Kept to measure how often the tiers agree
+                "base": {key: base.get(key) for key in ["total_score", "pass_fail_status", *SCORE_KEYS]},
+            },
+        }
+        if reason is None:
+            return None, decision
+
+        escalation = {key: value for key, value in base.items() if key in state}
+        # Everything but a parsed extraction runs again, with the escalation models
+        extraction_failed = any(
+            message.get("parse_failed") for message in base["messages"] if message.get("node") == "extract_resume_info"
+        )
+        escalation["nodes_to_run"] = [node for node in NODE_ORDER if node != "extract_resume_info" or extraction_failed]
+        escalation["previous_messages"] = base["messages"]
+        escalation["messages"] = []
+        escalation["skipped_nodes"] = []
+        return escalation, decision
+
+    def generate_feedback(self, state: ResumeState) -> Dict[str, Any]:
         """Generate detailed feedback and recommendations"""
-        system_prompt = f"""
+        return self._run_node("generate_feedback", state)
+
+    def _feedback_messages(self, state: ResumeState) -> List[BaseMessage]:
+        # Reuses the scoring prefix; the node reasoning is cut down to a summary
+        instructions = dedent(f"""
         Generate comprehensive feedback based on the resume scoring results:
-        
+
         Total Score: {state['total_score']}/100
         Technical: {state['technical_score']}
         Experience: {state['experience_score']}
         Cultural Fit: {state['cultural_fit_score']}
         Additional: {state['additional_score']}
         Status: {state['pass_fail_status']}
-        
+
         Provide:
         1. Overall assessment summary
         2. Strengths identified
@@ -294,15 +959,11 @@ class ResumeScorer:
         4. Specific recommendations
         5. Interview focus areas (if pass)
         6. Development suggestions
-        """
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Resume Analysis Context:\n{json.dumps(state['messages'], indent=2)}")
-        ]
-        
-        response = self.llm.invoke(messages)
-        
+        """).strip()
+
+        return self._scoring_messages(state, f"{instructions}\n\nResume Analysis Context:\n{self.prompts.feedback_context(state['messages'])}")
+
+    def _feedback_update(self, state: ResumeState, response: AIMessage) -> Dict[str, Any]:
         # Parse feedback into structured format
         feedback_sections = {
             "overall_assessment": "",
@@ -312,7 +973,7 @@ class ResumeScorer:
             "interview_focus": [],
             "development_suggestions": []
         }
-        
+
         # Simple parsing (in production, use more sophisticated NLP)
         sections = response.content.split('\n\n')
         for section in sections:
@@ -322,15 +983,69 @@ class ResumeScorer:
                 feedback_sections["areas_for_improvement"] = [line.strip('- ') for line in section.split('\n')[1:] if line.strip()]
             elif 'recommendation' in section.lower():
                 feedback_sections["recommendations"] = [line.strip('- ') for line in section.split('\n')[1:] if line.strip()]
-        
-        state["detailed_feedback"] = feedback_sections
-        state["recommendations"] = feedback_sections["recommendations"]
-        
-        return state
-    
-    def score_resume(self, resume_text: str, job_description: str, scoring_criteria: Dict[str, Any]) -> Dict[str, Any]:
-        """Main method to score a resume"""
-        initial_state = {
+
+        return {
+            "detailed_feedback": feedback_sections,
+            "recommendations": feedback_sections["recommendations"],
+        }
+
+    @staticmethod
+    def plan_rescore(previous: Dict[str, Any], resume_text: str, job_description: str, scoring_criteria: Dict[str, Any], skill_matching: str = "llm", mode: str = "graph", early_reject: bool = False) -> List[str]:
+        """Nodes that must re-run when re-evaluating ``previous`` with new inputs.
+
+        ``previous`` is an earlier result that also carries the resume_text,
+        job_description and scoring_criteria it was computed from.
+        """
+        changed = set()
+        sections = None
+        if previous.get("resume_text") != resume_text:
+            changed.add("resume_text")
+            sections = ResumeScorer.changed_resume_sections(previous, resume_text)
+            if sections is not None:
+                changed.update(f"resume.{section}" for section in sections)
+        if previous.get("job_description") != job_description:
+            changed.add("job_description")
+        if previous.get("skill_matching", "llm") != skill_matching:
+            changed.add("skill_matching")
+        if previous.get("mode", "graph") != mode:
+            changed.add("mode")
+        if previous.get("early_reject", False) != early_reject:
+            changed.add("early_reject")
+        # An early reject has no outputs to reuse for the criteria it skipped
+        skipped = set(previous.get("skipped_nodes") or [])
+        previous_criteria = previous.get("scoring_criteria") or {}
+        for section in set(previous_criteria) | set(scoring_criteria):
+            if previous_criteria.get(section) != scoring_criteria.get(section):
+                changed.add(f"scoring_criteria.{section}")
+
+        nodes_to_run = []
+        for node in NODE_ORDER:
+            inputs = NODE_INPUTS[node]
+            if sections is not None and node in NODE_SECTIONS:
+                inputs = [key for key in inputs if key not in ("resume_text", "extracted_info")]
+                inputs += [f"resume.{section}" for section in NODE_SECTIONS[node]]
+            if changed.intersection(inputs) or node in skipped:
+                nodes_to_run.append(node)
+                if sections is not None and node == "extract_resume_info":
+                    continue
+                # Treat a re-run node's outputs as changed for everything downstream
+                changed.update(NODE_OUTPUTS[node])
+        return nodes_to_run
+
+    @staticmethod
+    def changed_resume_sections(previous: Dict[str, Any], resume_text: str) -> Optional[Set[str]]:
+        """Sections that differ from the previous resume text, or None when
+        either version has no recognisable sections to compare"""
+        old_hashes = section_hashes(previous["resume_text"]) if previous.get("resume_text") else previous.get("section_hashes")
+        new_hashes = section_hashes(resume_text)
+        if not old_hashes or set(old_hashes) <= {"header"} or set(new_hashes) <= {"header"}:
+            return None
+        return changed_sections(old_hashes, new_hashes)
+
+    def _initial_state(self, resume_text: str, job_description: str, scoring_criteria: Dict[str, Any], previous: Optional[Dict[str, Any]] = None, skill_matching: Optional[str] = None, mode: Optional[str] = None, early_reject: Optional[bool] = None, cascade: bool = False) -> ResumeState:
+        if cascade and not self.escalation_llms:
+            raise ValueError("Cascade scoring needs escalation_llms")
+        state = {
             "resume_text": resume_text,
             "job_description": job_description,
             "scoring_criteria": scoring_criteria,
@@ -343,11 +1058,175 @@ class ResumeScorer:
             "detailed_feedback": {},
             "recommendations": [],
             "pass_fail_status": "",
-            "messages": []
+            "messages": [],
+            "nodes_to_run": None,
+            "previous_messages": [],
+            "skill_matching": skill_matching or self.skill_matching,
+            "mode": mode or self.mode,
+            "early_reject": self.early_reject if early_reject is None else early_reject,
+            "skipped_nodes": [],
+            "cascade": cascade,
         }
-        
-        for i in self.workflow.stream(initial_state,mode = "updates"):
-            yield i
+        if previous:
+            # Seed the state with the previous outputs; only the nodes whose
+            # inputs changed will overwrite them
+            for node in NODE_ORDER:
+                for key in NODE_OUTPUTS[node]:
+                    if key != "messages" and key in previous:
+                        state[key] = previous[key]
+            state["nodes_to_run"] = self.plan_rescore(
+                previous, resume_text, job_description, scoring_criteria,
+                state["skill_matching"], state["mode"], state["early_reject"],
+            )
+            state["previous_messages"] = previous.get("messages", [])
+        return state
+
+    def _run_setup(self, state: ResumeState, bypass_cache: bool, run_id: Optional[str], tier: str):
+        """Workflow and config for one tier of a run; runs with a run_id are checkpointed under it"""
+        key = f"{state['mode']}:early_reject" if state["early_reject"] else state["mode"]
+        config = {"configurable": {"bypass_cache": bypass_cache, "tier": tier}}
+        if run_id is None or self.checkpointer is None:
+            return self.workflows[key], config
+        # Each tier of a cascade resumes from its own checkpoints
+        config["configurable"]["thread_id"] = run_id if tier == "base" else f"{run_id}:{tier}"
+        return self.checkpointed_workflows[key], config
+
+    def _thread_ids(self, run_id: Optional[str], cascade: bool) -> List[str]:
+        """Checkpoint threads a run leaves behind until it finishes"""
+        if run_id is None or self.checkpointer is None:
+            return []
+        return [run_id, f"{run_id}:escalation"] if cascade else [run_id]
+
+    @staticmethod
+    def _restored_update(snapshot) -> Optional[Dict[str, Any]]:
+        """Outputs saved by an earlier attempt of this run, as one update, or None for a new run"""
+        if not snapshot.values:
+            return None
+        outputs = {key for keys in NODE_OUTPUTS.values() for key in keys}
+        return {RESTORED_NODE: {key: value for key, value in snapshot.values.items() if key in outputs}}
+
+    @staticmethod
+    def _replayed(update: Dict[str, Any]) -> bool:
+        # On resume LangGraph re-emits the saved writes of nodes that already
+        # finished; they are part of the restored update
+        return bool((update.get("__metadata__") or {}).get("cached"))
+
+    def score_resume(self, resume_text: str, job_description: str, scoring_criteria: Dict[str, Any], bypass_cache: bool = False, previous: Optional[Dict[str, Any]] = None, skill_matching: Optional[str] = None, mode: Optional[str] = None, early_reject: Optional[bool] = None, cascade: bool = False, run_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Main method to score a resume.
+
+        Pass an earlier result (see plan_rescore) as ``previous`` to only
+        re-run the nodes affected by what changed since then. With a
+        checkpointer, calling again with the run_id of a failed run resumes
+        it: the first update is RESTORED_NODE with everything already scored.
+        With ``early_reject`` the criteria are scored one at a time and a
+        resume that can no longer reach pass_threshold ends in REJECT_NODE.
+        With ``cascade`` a result the base models leave borderline or
+        unparsable is scored again by the escalation models; the last update
+        is CASCADE_NODE with the tier that decided it.
+        """
+        state = self._initial_state(resume_text, job_description, scoring_criteria, previous, skill_matching, mode, early_reject, cascade)
+        result = {}
+        for update in self._score_tier(state, bypass_cache, run_id, "base"):
+            self.merge_update(result, update)
+            yield update
+        if cascade:
+            escalation, decision = self._cascade_decision(state, result)
+            if escalation is not None:
+                yield from self._score_tier(escalation, bypass_cache, run_id, "escalation")
+            yield {CASCADE_NODE: decision}
+        for thread_id in self._thread_ids(run_id, cascade):
+            self.checkpointer.delete_thread(thread_id)
+
+    def _score_tier(self, state: ResumeState, bypass_cache: bool, run_id: Optional[str], tier: str) -> Iterator[Dict[str, Any]]:
+        workflow, config = self._run_setup(state, bypass_cache, run_id, tier)
+        graph_input = state
+        if "thread_id" in config["configurable"]:
+            snapshot = workflow.get_state(config)
+            restored = self._restored_update(snapshot)
+            if restored is not None:
+                yield restored
+                if not snapshot.next:
+                    # Finished, but the process stopped before cleaning up
+                    return
+                graph_input = None
+
+        for i in workflow.stream(graph_input, config, stream_mode="updates"):
+            if not self._replayed(i):
+                yield i
+
+    async def ascore_resume(self, resume_text: str, job_description: str, scoring_criteria: Dict[str, Any], bypass_cache: bool = False, previous: Optional[Dict[str, Any]] = None, skill_matching: Optional[str] = None, mode: Optional[str] = None, early_reject: Optional[bool] = None, cascade: bool = False, run_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of score_resume; LLM nodes run through ainvoke"""
+        async for item in self.astream_progress(
+            resume_text, job_description, scoring_criteria, bypass_cache, previous=previous,
+            skill_matching=skill_matching, mode=mode, early_reject=early_reject, cascade=cascade, run_id=run_id,
+        ):
+            yield item["update"]
+
+    async def astream_progress(self, resume_text: str, job_description: str, scoring_criteria: Dict[str, Any], bypass_cache: bool = False, token_nodes: Optional[List[str]] = None, previous: Optional[Dict[str, Any]] = None, skill_matching: Optional[str] = None, mode: Optional[str] = None, early_reject: Optional[bool] = None, cascade: bool = False, run_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Like ascore_resume, but also yields LLM tokens produced by ``token_nodes``.
+
+        Yields {"type": "update", "update": ...} for every finished node and
+        {"type": "token", "node": ..., "text": ...} for every streamed token.
+        Cached responses produce no tokens, only the node update.
+        """
+        state = self._initial_state(resume_text, job_description, scoring_criteria, previous, skill_matching, mode, early_reject, cascade)
+        token_nodes = set(token_nodes or [])
+        result = {}
+        async for item in self._astream_tier(state, bypass_cache, run_id, "base", token_nodes):
+            if item["type"] == "update":
+                self.merge_update(result, item["update"])
+            yield item
+        if cascade:
+            escalation, decision = self._cascade_decision(state, result)
+            if escalation is not None:
+                async for item in self._astream_tier(escalation, bypass_cache, run_id, "escalation", token_nodes):
+                    yield item
+            yield {"type": "update", "update": {CASCADE_NODE: decision}}
+        for thread_id in self._thread_ids(run_id, cascade):
+            await self.checkpointer.adelete_thread(thread_id)
+
+    async def _astream_tier(self, state: ResumeState, bypass_cache: bool, run_id: Optional[str], tier: str, token_nodes: Set[str]) -> AsyncIterator[Dict[str, Any]]:
+        workflow, config = self._run_setup(state, bypass_cache, run_id, tier)
+        graph_input = state
+        if "thread_id" in config["configurable"]:
+            snapshot = await workflow.aget_state(config)
+            restored = self._restored_update(snapshot)
+            if restored is not None:
+                yield {"type": "update", "update": restored}
+                if not snapshot.next:
+                    return
+                graph_input = None
+        stream_mode = ["updates", "messages"] if token_nodes else ["updates"]
+
+        async for chunk_type, chunk in workflow.astream(graph_input, config, stream_mode=stream_mode):
+            if chunk_type == "updates":
+                if not self._replayed(chunk):
+                    yield {"type": "update", "update": chunk}
+                continue
+            message, metadata = chunk
+            node = metadata.get("langgraph_node")
+            if node in token_nodes and message.content:
+                yield {"type": "token", "node": node, "text": message.content}
+
+    @staticmethod
+    def merge_update(result: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        """Fold one streamed node update into an accumulated result.
+
+        Nodes only return the keys they produce, so callers that need the
+        full scoring outcome accumulate the stream with this helper. Message
+        entries replace earlier ones from the same node, which is how the
+        escalation tier of a cascade supersedes the base tier.
+        """
+        for node_output in update.values():
+            for key, value in (node_output or {}).items():
+                if key == "messages":
+                    nodes = {message.get("node") for message in value}
+                    result["messages"] = [
+                        message for message in result.get("messages", []) if message.get("node") not in nodes
+                    ] + value
+                else:
+                    result[key] = value
+        return result
 
 # Example usage and configuration
 def create_default_scoring_criteria():
@@ -0,0 +1,71 @@
+"""Weigh the escalation band of cascade scoring against cost and agreement.
+
+Scores synthetic resumes with a small fake model, a large fake model (the
+escalation tier alone, as the reference) and in cascade mode for every
+--bands value, then prints per band how many results were escalated, the
+LLM calls per resume by tier, and how often the cascade's pass/fail agrees
+with the large model's. The fakes answer differently per model name, so
+the numbers show the trade-off, not real model quality.
+
+    python -m benchmarks.bench_cascade --resumes 100 --bands 0 5 10 20
+"""
+import argparse
+from collections import Counter
+
+from benchmarks.fakes import FakeChatModel
+from benchmarks.load_test import DEFAULT_JOB_DESCRIPTION
+from benchmarks.synthetic_resumes import resume_text
+from utils.metrics import LLM_SECONDS
+
+
+def llm_calls(scorer, model: str) -> int:
+    """Calls ``model`` has answered so far, from the LLM latency histogram"""
+    return sum(LLM_SECONDS.count(node=node, model=model) for node in scorer.llm_nodes)
+
+
+def score(scorer, text, criteria, **kwargs):
+    result = {}
+    for update in scorer.score_resume(text, DEFAULT_JOB_DESCRIPTION, criteria, **kwargs):
+        scorer.merge_update(result, update)
+    return result
+
+
+def main():
+    from agents.evaluation import STRUCTURED_NODE, ResumeScorer, create_default_scoring_criteria
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=3, help="work history entries per synthetic resume")
+    parser.add_argument("--bands", type=float, nargs="+", default=[0, 5, 10, 20], help="points around pass_threshold that escalate")
+    parser.add_argument("--mode", choices=["graph", "structured"], default="graph")
+    parser.add_argument("--unparsable", type=float, default=0.02, help="share of small model scoring replies without a score")
+    args = parser.parse_args()
+
+    small = FakeChatModel(model="fake-small", latency=0, unparsable=args.unparsable)
+    large = FakeChatModel(model="fake-large", latency=0)
+    escalation_llms = {"default": large, STRUCTURED_NODE: large}
+    criteria = create_default_scoring_criteria()
+    texts = [resume_text(seed, args.jobs) for seed in range(args.resumes)]
+
+    reference_scorer = ResumeScorer(model_name=large.model, llm=large, mode=args.mode)
+    reference = [score(reference_scorer, text, criteria)["pass_fail_status"] for text in texts]
+
+    print(f"{'band':>6} {'escalated':>10} {'small calls':>12} {'large calls':>12} {'agreement':>10}")
+    for band in args.bands:
+        scorer = ResumeScorer(model_name=small.model, llm=small, mode=args.mode, escalation_llms=escalation_llms, cascade_band=band)
+        tiers, agreed = Counter(), 0
+        small_before, large_before = llm_calls(scorer, small.model), llm_calls(scorer, large.model)
+        for text, expected in zip(texts, reference):
+            result = score(scorer, text, criteria, cascade=True)
+            tiers[result["decided_by_tier"]] += 1
+            agreed += result["pass_fail_status"] == expected
+        small_calls = (llm_calls(scorer, small.model) - small_before) / len(texts)
+        large_calls = (llm_calls(scorer, large.model) - large_before) / len(texts)
+        print(
+            f"{band:>6g} {tiers['escalation'] / len(texts):>10.0%} {small_calls:>12.2f}"
+            f" {large_calls:>12.2f} {agreed / len(texts):>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
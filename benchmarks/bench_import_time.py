@@ -0,0 +1,60 @@
+"""Measure cold import time of the service and worker entry points.
+
+Each module is imported in a fresh interpreter, so nothing is shared with
+earlier runs. Exits non-zero when the median exceeds the budget, which makes
+it usable as a CI gate for worker cold-start.
+
+    python -m benchmarks.bench_import_time --budget 1.5
+    python -m benchmarks.bench_import_time --modules service --top 15
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_time(module: str) -> float:
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module: str, top: int):
+    """(cumulative_us, name) of the slowest top-level imports, from -X importtime"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True, capture_output=True, text=True,
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only direct children of the measured import, nested ones are included in them
+        if len(name) - len(name.lstrip()) == 3:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=["service", "worker"])
+    parser.add_argument("--budget", type=float, default=1.5, help="Seconds allowed per module import")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Also list the slowest imports of each module")
+    args = parser.parse_args()
+
+    over_budget = False
+    print(f"{'module':>10} {'median_s':>9} {'max_s':>7} {'budget_s':>9}")
+    for module in args.modules:
+        timings = [import_time(module) for _ in range(args.repeat)]
+        median = statistics.median(timings)
+        over_budget |= median > args.budget
+        print(f"{module:>10} {median:>9.3f} {max(timings):>7.3f} {args.budget:>9.3f}{'  OVER' if median > args.budget else ''}")
+        for cumulative, name in slowest_imports(module, args.top):
+            print(f"{'':>10} {cumulative / 1e6:>9.3f} {name}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
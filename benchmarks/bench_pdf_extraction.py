@@ -0,0 +1,58 @@
+"""Compare serial, process-parallel and budgeted PDF extraction on multi-page fixtures.
+
+The fixtures are built in memory by repeating the pages of a sample resume,
+so no extra files need to be checked in. The parallel column includes pool
+start-up, since extract_text_parallel parses the document once per worker
+in a fresh pool for every call.
+
+    python -m benchmarks.bench_pdf_extraction --pdf RISHI-JUL_2025.pdf --pages 2 20 100 200
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+
+import PyPDF2
+
+from utils.extract_pdf import PDFExtractor
+
+
+def build_fixture(pdf_path: str, page_count: int) -> bytes:
+    reader = PyPDF2.PdfReader(pdf_path)
+    writer = PyPDF2.PdfWriter()
+    for index in range(page_count):
+        writer.add_page(reader.pages[index % len(reader.pages)])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def time_call(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", default="RISHI-JUL_2025.pdf")
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 20, 100, 200])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'serial_s':>10} {'parallel_s':>11} {'speedup':>8} {'max_pages=20_s':>15}")
+    for page_count in args.pages:
+        pdf_bytes = build_fixture(args.pdf, page_count)
+        serial = time_call(lambda: PDFExtractor(pdf_bytes).extract_text(), args.repeat)
+        parallel = time_call(lambda: PDFExtractor(pdf_bytes).extract_text_parallel(args.workers), args.repeat)
+        budgeted = time_call(lambda: PDFExtractor(pdf_bytes, max_pages=20).extract_text(), args.repeat)
+        print(f"{page_count:>6} {serial:>10.3f} {parallel:>11.3f} {serial / parallel:>8.2f} {budgeted:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Report the prompt tokens each scoring node sends to the model.
+
+Scores synthetic resumes with the fake chat model from benchmarks.fakes and
+prints, per node, the median prompt and completion tokens it reported (the
+fake counts four characters per token, like utils.prompt_builder). It also
+prints how many leading tokens the scoring nodes' prompts have in common:
+Ollama keeps that prefix in its KV cache between calls, so only the rest of
+each prompt is prefilled again. With --early-reject it also counts the LLM
+calls per resume and how many resumes were rejected before all criteria
+were scored.
+
+    python -m benchmarks.bench_prompt_tokens --resumes 20 --jobs 3 8
+"""
+import argparse
+import os
+import statistics
+from typing import Dict, List
+
+from benchmarks.fakes import FakeChatModel
+from benchmarks.load_test import DEFAULT_JOB_DESCRIPTION
+from benchmarks.synthetic_resumes import resume_text
+from utils.metrics import collect_tokens
+from utils.prompt_builder import estimate_tokens
+
+
+def rendered(messages) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+def shared_prefix_tokens(prompts: List[str]) -> int:
+    return estimate_tokens(os.path.commonprefix(prompts)) if prompts else 0
+
+
+def run(args, jobs: int):
+    from agents.evaluation import SCORING_NODES, STRUCTURED_NODE, ResumeScorer, create_default_scoring_criteria
+
+    scorer = ResumeScorer(model_name="fake-chat", llm=FakeChatModel(latency=0), mode=args.mode, early_reject=args.early_reject)
+    criteria = create_default_scoring_criteria()
+    per_node: Dict[str, List[Dict[str, int]]] = {}
+    prefixes, totals, calls, rejected = [], [], [], 0
+    for seed in range(args.resumes):
+        text = resume_text(seed, jobs)
+        state = scorer._initial_state(text, DEFAULT_JOB_DESCRIPTION, criteria)
+        with collect_tokens() as tokens:
+            for update in scorer.score_resume(text, DEFAULT_JOB_DESCRIPTION, criteria):
+                scorer.merge_update(state, update)
+        for node, counts in tokens.items():
+            per_node.setdefault(node, []).append(counts)
+        calls.append(len(tokens))
+        rejected += bool(state.get("skipped_nodes"))
+
+        nodes = [STRUCTURED_NODE] if args.mode == "structured" else SCORING_NODES
+        prompts = [rendered(scorer.llm_nodes[node][0](state)) for node in nodes]
+        prefixes.append(shared_prefix_tokens(prompts))
+        totals.append(sum(estimate_tokens(prompt) for prompt in prompts))
+
+    print(f"jobs per resume: {jobs}")
+    print(f"{'node':<34} {'prompt':>8} {'completion':>11}")
+    for node, counts in per_node.items():
+        prompt = statistics.median(count["prompt"] for count in counts)
+        completion = statistics.median(count["completion"] for count in counts)
+        print(f"{node:<34} {prompt:>8.0f} {completion:>11.0f}")
+    total = sum(sum(count["prompt"] for count in counts) for counts in per_node.values()) / args.resumes
+    print(f"{'total prompt tokens per resume':<34} {total:>8.0f}")
+    print(f"{'LLM calls per resume':<34} {statistics.mean(calls):>8.2f}")
+    if args.early_reject:
+        print(f"{'rejected before scoring all':<34} {rejected:>8} of {args.resumes}")
+    print(f"{'scoring prompts, shared prefix':<34} {statistics.median(prefixes):>8.0f} of {statistics.median(totals):.0f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[3, 8], help="work history entries per synthetic resume")
+    parser.add_argument("--mode", choices=["graph", "structured"], default="graph")
+    parser.add_argument("--early-reject", action="store_true", help="stop scoring resumes that can no longer pass")
+    args = parser.parse_args()
+    for jobs in args.jobs:
+        run(args, jobs)
+
+
+if __name__ == "__main__":
+    main()
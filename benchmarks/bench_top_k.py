@@ -0,0 +1,94 @@
+"""Time top-k ranking queries on the evaluations collection.
+
+Seeds synthetic evaluations for one job, then times EvaluationStore.top.
+By default this runs on the in-memory Mongo fake, which checks the query
+path without any server. With --mongo it seeds a scratch database on the
+configured Mongo instead and also prints the winning query plan, which
+should be an index scan without an in-memory SORT stage.
+
+    python -m benchmarks.bench_top_k --k 10 50
+    python -m benchmarks.bench_top_k --mongo --evaluations 50000 --k 10 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fakes import InMemoryMongo
+from utils.evaluation_store import RANKING_PROJECTION, EvaluationStore
+
+
+def synthetic_documents(job_id: str, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        total = round(rng.uniform(20, 95), 1)
+        yield {
+            "job_id": job_id,
+            "resume_id": f"resume-{index}",
+            "filename": f"resume_{index}.pdf",
+            "upload_time": start + timedelta(minutes=index),
+            "evaluated_at": start + timedelta(minutes=index, seconds=30),
+            "pass_fail_status": "PASS" if total >= 70 else "FAIL",
+            "total_score": total,
+            "detailed_feedback": {"strengths": ["x" * 200], "areas_for_improvement": ["y" * 200]},
+            "recommendations": ["z" * 100],
+            "mode": "graph",
+        }
+
+
+async def run(args):
+    if args.mongo:
+        from utils.external_resources import AsyncMongoDBClient
+
+        mongo = AsyncMongoDBClient()
+    else:
+        mongo = InMemoryMongo()
+    evaluations = args.evaluations or (50_000 if args.mongo else 1_000)
+    collection = mongo.get_database(args.database)["evaluations"]
+    store = EvaluationStore(collection)
+    try:
+        if args.mongo:
+            await collection.drop()
+        await store.create_indexes()
+        # Noise from other jobs, so the index has to narrow the scan
+        for job_id, count in [("bench-job", evaluations), ("other-job", evaluations)]:
+            documents = list(synthetic_documents(job_id, count))
+            for offset in range(0, len(documents), 5000):
+                await store.save_many(documents[offset:offset + 5000])
+
+        if args.mongo:
+            plan = await collection.find({"job_id": "bench-job"}, RANKING_PROJECTION).sort([("total_score", -1)]).limit(10).explain()
+            print(f"winning plan: {plan['queryPlanner']['winningPlan']}")
+        print(f"{'k':>6} {'status':>7} {'median_ms':>10} {'p95_ms':>8}")
+        for k in args.k:
+            for status in (None, "PASS"):
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    await store.top("bench-job", k, status)
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                print(f"{k:>6} {status or 'any':>7} {statistics.median(timings):>10.2f} {timings[int(0.95 * (len(timings) - 1))]:>8.2f}")
+    finally:
+        if args.mongo and not args.keep:
+            await collection.drop()
+        await mongo.client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo", action="store_true", help="run on the configured Mongo instead of the in-memory fake")
+    parser.add_argument("--evaluations", type=int, help="evaluations seeded for the benchmarked job (50000 with --mongo, else 1000)")
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database", default="resume_bench")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded collection in place (--mongo only)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""Deterministic stand-ins for Ollama, S3 and Mongo used by the benchmarks.
+
+They implement only what ResumeScorer, service.py and utils.job_queue call,
+with an optional per-call latency so I/O waits still show up in the numbers.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from benchmarks.synthetic_resumes import SKILLS
+from utils.external_resources import UsageCounter
+
+
+def _fraction(text: str, salt: str = "") -> float:
+    """Stable pseudo-random number in [0.2, 1.0) derived from ``text``"""
+    digest = hashlib.sha256((salt + text).encode()).digest()
+    return 0.2 + 0.8 * int.from_bytes(digest[:4], "big") / 2 ** 32
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers every ResumeScorer prompt without a server.
+
+    Replies depend only on the prompt, so runs are reproducible. Each call
+    waits ``latency`` seconds plus one second per ``tokens_per_second``
+    completion tokens (0 means instant generation). ``capacity`` caps the
+    calls served at once, like an inference host with a fixed batch size.
+    Another ``model`` name gives other scores for the same prompt, to stand
+    in for the tiers of a cascade, and ``unparsable`` is the share of
+    scoring replies that come without a score line.
+    """
+    model: str = "fake-chat"
+    latency: float = 0.05
+    tokens_per_second: float = 0.0
+    capacity: int = 0
+    unparsable: float = 0.0
+    _slots: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+    _sync_slots: Optional[threading.Semaphore] = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model}
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(message.content) for message in messages)
+        if self.model != "fake-chat":
+            prompt = f"{self.model}\n{prompt}"
+        if "expert resume parser" in prompt:
+            found = [skill for skill in SKILLS if skill.lower() in prompt.lower()]
+            roles = re.findall(r"^\s*(.+?) at (.+?) \((\d{4})-(\d{4})\)", prompt, re.MULTILINE)
+            return json.dumps({
+                "name": prompt.split("Resume Text:", 1)[-1].strip().splitlines()[0] if "Resume Text:" in prompt else "",
+                "skills": found,
+                "experience": [
+                    {"role": role, "company": company, "start": start, "end": end}
+                    for role, company, start, end in roles
+                ],
+            })
+        if "matching this JSON schema" in prompt:
+            maxima = dict(re.findall(r"(technical|experience|cultural_fit|additional) \(out of ([\d.]+) points\)", prompt))
+            return json.dumps({
+                field: {
+                    "score": round(float(maxima.get(field, 10)) * _fraction(prompt, field), 1),
+                    "strengths": ["Relevant background"],
+                    "weaknesses": ["Limited detail"],
+                    "summary": f"{field} assessment",
+                    "reasoning": f"Deterministic {field} reasoning",
+                }
+                for field in ("technical", "experience", "cultural_fit", "additional")
+            })
+        if "Generate comprehensive feedback" in prompt:
+            return (
+                "Overall assessment\nSolid candidate.\n\n"
+                "Strengths\n- Strong Python\n- Relevant experience\n\n"
+                "Areas for improvement\n- Cloud depth\n\n"
+                "Recommendations\n- Proceed to a technical interview"
+            )
+        match = re.search(r"out of ([\d.]+)\s*points", prompt)
+        max_points = float(match.group(1)) if match else 10.0
+        if _fraction(prompt, "unparsable") - 0.2 < 0.8 * self.unparsable:
+            return "The candidate matches most criteria."
+        return f"The candidate matches most criteria.\nScore: {round(max_points * _fraction(prompt), 1)}"
+
+    def _result(self, messages: List[BaseMessage]):
+        text = self._reply(messages)
+        prompt_tokens = sum(len(str(message.content)) for message in messages) // 4
+        completion_tokens = max(len(text) // 4, 1)
+        delay = self.latency + (completion_tokens / self.tokens_per_second if self.tokens_per_second else 0)
+        message = AIMessage(
+            content=text,
+            response_metadata={"prompt_eval_count": prompt_tokens, "eval_count": completion_tokens},
+        )
+        return delay, ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay, result = self._result(messages)
+        if not self.capacity:
+            time.sleep(delay)
+            return result
+        if self._sync_slots is None:
+            self._sync_slots = threading.Semaphore(self.capacity)
+        with self._sync_slots:
+            time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay, result = self._result(messages)
+        if not self.capacity:
+            await asyncio.sleep(delay)
+            return result
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.capacity)
+        async with self._slots:
+            await asyncio.sleep(delay)
+        return result
+
+
+class InMemoryS3:
+    """Async S3 stand-in with the AsyncS3Client interface"""
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.objects: Dict[str, bytes] = {}
+        self.usage = UsageCounter()
+
+    async def _wait(self):
+        self.usage.acquire()
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.usage.release()
+
+    async def upload_fileobj(self, fileobj, bucket_name, object_name, content_type=None):
+        await self._wait()
+        self.objects[f"{bucket_name}/{object_name}"] = fileobj.read()
+
+    async def get_object(self, bucket_name, object_name) -> bytes:
+        await self._wait()
+        return self.objects[f"{bucket_name}/{object_name}"]
+
+    async def head_bucket(self, bucket_name):
+        await self._wait()
+        return {}
+
+    def pool_stats(self):
+        return self.usage.stats()
+
+    def close(self):
+        pass
+
+
+def _get(doc: Dict[str, Any], path: str, default=None):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return default
+        doc = doc[part]
+    return doc
+
+
+def _set(doc: Dict[str, Any], path: str, value):
+    *parents, last = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[last] = value
+
+
+_MISSING = object()
+
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in condition):
+                return False
+            continue
+        value = _get(doc, key, _MISSING)
+        if isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+            for op, operand in condition.items():
+                present = value is not _MISSING
+                if op == "$exists" and present != operand:
+                    return False
+                if op == "$in" and (not present or value not in operand):
+                    return False
+                if op == "$nin" and present and value in operand:
+                    return False
+                if op == "$ne" and present and value == operand:
+                    return False
+                if op in ("$lt", "$lte", "$gt", "$gte"):
+                    if not present or value is None:
+                        return False
+                    if op == "$lt" and not value < operand:
+                        return False
+                    if op == "$lte" and not value <= operand:
+                        return False
+                    if op == "$gt" and not value > operand:
+                        return False
+                    if op == "$gte" and not value >= operand:
+                        return False
+        elif value is _MISSING or value != condition:
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, int]]):
+    if not projection:
+        return copy.deepcopy(doc)
+    included = [key for key, flag in projection.items() if flag]
+    if included:
+        result = {}
+        for key in included:
+            value = _get(doc, key, _MISSING)
+            if value is not _MISSING:
+                _set(result, key, copy.deepcopy(value))
+        if projection.get("_id", 1):
+            result["_id"] = doc["_id"]
+        return result
+    return {key: copy.deepcopy(value) for key, value in doc.items() if projection.get(key, 1)}
+
+
+def _sort_key(sort):
+    def key(doc):
+        # Missing values sort first, like Mongo's null ordering
+        return tuple((_get(doc, field) is not None, _get(doc, field) or 0) for field, _ in sort)
+    return key
+
+
+class InMemoryCursor:
+    def __init__(self, docs: List[Dict[str, Any]], projection=None):
+        self._docs = docs
+        self._projection = projection
+        self._sort = None
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = [(key_or_list, direction or 1)] if isinstance(key_or_list, str) else list(key_or_list)
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def _results(self):
+        docs = self._docs
+        if self._sort:
+            # Stable multi-key sort, least significant key first
+            for field, direction in reversed(self._sort):
+                docs = sorted(docs, key=_sort_key([(field, direction)]), reverse=direction < 0)
+        if self._limit:
+            docs = docs[:self._limit]
+        return [_project(doc, self._projection) for doc in docs]
+
+    def __aiter__(self):
+        self._iter = iter(self._results())
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        return self._results()
+
+
+class InMemoryCollection:
+    """Async collection with the subset of the pymongo API this service uses"""
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.docs: Dict[Any, Dict[str, Any]] = {}
+        # Field tuples of the unique indexes; docs missing a field are not indexed
+        self.unique_fields: List[Tuple[str, ...]] = []
+        self.usage = UsageCounter()
+
+    async def _wait(self):
+        self.usage.acquire()
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.usage.release()
+
+    async def create_index(self, keys, unique=False, **kwargs):
+        if unique and isinstance(keys, str):
+            self.unique_fields.append((keys,))
+        elif unique:
+            self.unique_fields.append(tuple(field for field, _ in keys))
+        return str(keys)
+
+    def _check_unique(self, doc, ignore_id=None):
+        for fields in self.unique_fields:
+            value = tuple(_get(doc, field) for field in fields)
+            if None in value:
+                continue
+            for other in self.docs.values():
+                if other["_id"] != ignore_id and tuple(_get(other, field) for field in fields) == value:
+                    raise DuplicateKeyError(f"E11000 duplicate key on {', '.join(fields)}")
+
+    async def insert_one(self, doc):
+        await self._wait()
+        doc = copy.deepcopy(doc)
+        doc.setdefault("_id", hashlib.sha1(str(time.perf_counter_ns()).encode()).hexdigest()[:24])
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("E11000 duplicate key on _id")
+        self._check_unique(doc)
+        self.docs[doc["_id"]] = doc
+
+    def _find(self, query):
+        return [doc for doc in self.docs.values() if _matches(doc, query or {})]
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        await self._wait()
+        docs = InMemoryCursor(self._find(query), projection)
+        if sort:
+            docs.sort(sort)
+        results = docs.limit(1)._results()
+        return results[0] if results else None
+
+    def find(self, query=None, projection=None, sort=None, limit=0):
+        cursor = InMemoryCursor(self._find(query), projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.limit(limit)
+
+    async def count_documents(self, query):
+        await self._wait()
+        return len(self._find(query))
+
+    def _apply(self, doc, update, inserting=False):
+        for path, value in update.get("$set", {}).items():
+            _set(doc, path, copy.deepcopy(value))
+        if inserting:
+            for path, value in update.get("$setOnInsert", {}).items():
+                _set(doc, path, copy.deepcopy(value))
+        for path, value in update.get("$inc", {}).items():
+            _set(doc, path, (_get(doc, path) or 0) + value)
+        for path, value in update.get("$push", {}).items():
+            current = _get(doc, path) or []
+            _set(doc, path, current + [copy.deepcopy(value)])
+        for path in update.get("$unset", {}):
+            parent = _get(doc, ".".join(path.split(".")[:-1])) if "." in path else doc
+            if isinstance(parent, dict):
+                parent.pop(path.split(".")[-1], None)
+
+    def _upsert(self, query, update):
+        doc = {key: value for key, value in query.items() if not isinstance(value, dict)}
+        self._apply(doc, update, inserting=True)
+        doc.setdefault("_id", hashlib.sha1(str(time.perf_counter_ns()).encode()).hexdigest()[:24])
+        self._check_unique(doc)
+        self.docs[doc["_id"]] = doc
+        return doc
+
+    def _update_one(self, query, update, upsert=False, sort=None):
+        docs = self._find(query)
+        if sort:
+            docs = sorted(docs, key=_sort_key(sort))
+        if docs:
+            # Update a copy so a duplicate key leaves the stored doc untouched
+            doc = copy.deepcopy(docs[0]) if self.unique_fields else docs[0]
+            self._apply(doc, update)
+            self._check_unique(doc, ignore_id=doc["_id"])
+            self.docs[doc["_id"]] = doc
+            return doc, True
+        if upsert:
+            return self._upsert(query, update), False
+        return None, False
+
+    async def update_one(self, query, update, upsert=False):
+        await self._wait()
+        self._update_one(query, update, upsert)
+
+    async def update_many(self, query, update):
+        await self._wait()
+        for doc in self._find(query):
+            self._apply(doc, update)
+
+    async def delete_many(self, query):
+        await self._wait()
+        for doc in self._find(query):
+            del self.docs[doc["_id"]]
+
+    async def find_one_and_update(self, query, update, sort=None, return_document=ReturnDocument.BEFORE, upsert=False, projection=None):
+        await self._wait()
+        docs = self._find(query)
+        if sort:
+            docs = sorted(docs, key=_sort_key(sort))
+        before = copy.deepcopy(docs[0]) if docs else None
+        doc, _ = self._update_one({"_id": docs[0]["_id"]} if docs else query, update, upsert)
+        result = doc if return_document == ReturnDocument.AFTER else before
+        return _project(result, projection) if result is not None else None
+
+    async def bulk_write(self, operations, ordered=True):
+        await self._wait()
+        for operation in operations:
+            self._update_one(operation._filter, operation._doc, operation._upsert)
+
+
+class InMemoryDatabase:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.collections: Dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self.collections:
+            self.collections[name] = InMemoryCollection(self.latency)
+        return self.collections[name]
+
+    async def command(self, name, *args, **kwargs):
+        return {"ok": 1}
+
+
+class _PoolStats:
+    def __init__(self, databases):
+        self.databases = databases
+
+    def stats(self):
+        in_flight = sum(
+            collection.usage.in_flight
+            for database in self.databases.values() for collection in database.collections.values()
+        )
+        return {"checked_out": in_flight}
+
+
+class _Client:
+    async def close(self):
+        pass
+
+
+class InMemoryMongo:
+    """Async Mongo stand-in with the AsyncMongoDBClient interface"""
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.databases: Dict[str, InMemoryDatabase] = {}
+        self.client = _Client()
+        self.pool_stats = _PoolStats(self.databases)
+
+    def get_database(self, name: str) -> InMemoryDatabase:
+        if name not in self.databases:
+            self.databases[name] = InMemoryDatabase(self.latency)
+        return self.databases[name]
@@ -0,0 +1,394 @@
+"""Offline load test of the scorer and the HTTP service.
+
+Runs the real ResumeScorer graph and the real service.py endpoints against
+the stand-ins in benchmarks.fakes: a deterministic chat model with a fixed
+per-call latency and token rate, in-memory S3 and Mongo, and a corpus of
+synthetic resume PDFs. No Ollama, MinIO or Mongo is needed, so it runs in CI.
+
+For every concurrency level it reports p50/p95/p99 latency, resumes per
+second and peak memory. With --ci each level's throughput and p95 latency,
+relative to the concurrency 1 run of the same invocation, are checked
+against the same ratios in a baseline file, and the exit code is 1 on a
+regression beyond --tolerance. Ratios carry over between machines of
+different speed; absolute latencies do not.
+
+    python -m benchmarks.load_test --target scorer --concurrency 1 4 16
+    python -m benchmarks.load_test --target service --endpoint stream --resumes 32
+    python -m benchmarks.load_test --target service --replay requests.jsonl
+    python -m benchmarks.load_test --ci --baseline benchmarks/baseline.json
+
+A replay file has one JSON request per line. Lines with "method" and "path"
+are sent as they are ("{resume_id}" in the path is filled with an uploaded
+resume, "json" is the body); any other line is scored with the batch
+endpoint, using its "job_description", "body" or "title" as the job
+description.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.fakes import FakeChatModel, InMemoryMongo, InMemoryS3
+from benchmarks.synthetic_resumes import corpus
+from utils.extract_pdf import extract_pdf_text
+from utils.llm_cache import LLMCache
+
+DEFAULT_JOB_DESCRIPTION = """
+We are looking for a Data Scientist with 3+ years of experience in Python, SQL,
+machine learning and cloud platforms (AWS or GCP), who communicates results
+clearly and works well in cross-functional teams.
+"""
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(name: str, concurrency: int, latencies: List[float], errors: int, elapsed: float, traced_peak: Optional[int]) -> Dict[str, Any]:
+    row = {
+        "name": name,
+        "concurrency": concurrency,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "p50_s": round(percentile(latencies, 0.50), 4),
+        "p95_s": round(percentile(latencies, 0.95), 4),
+        "p99_s": round(percentile(latencies, 0.99), 4),
+        "resumes_per_s": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    if traced_peak is not None:
+        row["traced_peak_mb"] = round(traced_peak / (1024 * 1024), 2)
+    return row
+
+
+async def run_bounded(jobs, concurrency: int):
+    """Await every job factory with at most ``concurrency`` in flight.
+
+    Returns (latencies, error count, wall time); setup such as uploads is not timed.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], []
+
+    async def run(job):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await job()
+            except Exception as e:
+                errors.append(repr(e))
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(job) for job in jobs))
+    elapsed = time.perf_counter() - start
+    if errors:
+        print(f"  {len(errors)} failed, first error: {errors[0]}", file=sys.stderr)
+    return latencies, len(errors), elapsed
+
+
+def create_fake_router(args):
+    """LLMRouter over --llm-hosts fake inference hosts of --host-capacity slots each"""
+    from utils.llm_router import LLMRouter
+
+    def client(endpoint, format):
+        return FakeChatModel(latency=args.llm_latency, tokens_per_second=args.tokens_per_second, capacity=args.host_capacity)
+
+    return LLMRouter([f"http://fake-{index}" for index in range(max(args.llm_hosts, 1))], "fake-chat", client_factory=client)
+
+
+def create_fake_scorer(args, cache: Optional[LLMCache], router=None):
+    from agents.evaluation import ResumeScorer
+    from utils.checkpointer import ScoringCheckpointer, SqliteCheckpointStore
+
+    # Queued jobs run checkpointed under their job id when this is set
+    checkpointer = ScoringCheckpointer(SqliteCheckpointStore()) if args.checkpoints else None
+    if args.llm_hosts:
+        return ResumeScorer(model_name="fake-chat", cache=cache, router=router or create_fake_router(args), mode=args.mode, checkpointer=checkpointer)
+    llm = FakeChatModel(latency=args.llm_latency, tokens_per_second=args.tokens_per_second, capacity=args.host_capacity)
+    return ResumeScorer(model_name=llm.model, cache=cache, llm=llm, mode=args.mode, checkpointer=checkpointer)
+
+
+async def bench_scorer(args, concurrency: int, seed: int):
+    """Score extracted resume texts straight through ResumeScorer.ascore_resume"""
+    from agents.evaluation import create_default_scoring_criteria
+
+    scorer = create_fake_scorer(args, LLMCache())
+    criteria = create_default_scoring_criteria()
+    texts = [extract_pdf_text(pdf) for pdf in corpus(args.resumes, seed=seed)]
+
+    def job(text):
+        async def score():
+            async for _ in scorer.ascore_resume(text, DEFAULT_JOB_DESCRIPTION, criteria):
+                pass
+        return score
+
+    return await run_bounded([job(text) for text in texts], concurrency)
+
+
+def install_fake_resources(args, concurrency: int):
+    """Point the service globals at in-memory stand-ins, as init_resources would at startup"""
+    import service
+    from utils.evaluation_store import EvaluationStore
+    from utils.job_queue import JobQueue, JobWorkerPool
+    from utils.resume_versions import ResumeVersions
+    from utils.scheduler import AdmissionScheduler
+
+    service.s3 = InMemoryS3(latency=args.io_latency)
+    service.mongo = InMemoryMongo(latency=args.io_latency)
+    db = service.mongo.get_database("resume_db")
+    service.resume_collection = db["resumes"]
+    service.resume_versions = ResumeVersions(service.resume_collection)
+    service.evaluation_store = EvaluationStore(db["evaluations"])
+    service.job_queue = JobQueue(db["jobs"])
+    service.pdf_executor = ProcessPoolExecutor(max_workers=args.pdf_workers)
+    service.llm_cache = LLMCache()
+    service.resume_index = None
+    # Never started, so it does no warmup or health-check I/O; without --llm-hosts it
+    # only backs /api/pool_stats and the in-flight gauge
+    service.llm_router = create_fake_router(args)
+    service.scorer = create_fake_scorer(args, service.llm_cache, service.llm_router)
+    service.job_workers = JobWorkerPool(service.job_queue, service.run_evaluation_job, concurrency=concurrency, poll_interval=0.01)
+    service.admission = AdmissionScheduler(args.admission_concurrency or concurrency, args.admission_queue)
+    return service
+
+
+async def upload_corpus(client, pdfs: List[bytes]) -> List[str]:
+    resume_ids = []
+    for index, pdf in enumerate(pdfs):
+        response = await client.post(
+            "/api/upload_resume", files={"file": (f"resume_{index}.pdf", pdf, "application/pdf")},
+        )
+        response.raise_for_status()
+        resume_ids.append(response.json()["resume_id"])
+    return resume_ids
+
+
+def replay_jobs(client, path: str, resume_ids: List[str], mode: str):
+    """Job factories for every line of a replay file, cycling over the uploaded resumes"""
+    ids = itertools.cycle(resume_ids)
+    jobs = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            resume_id = next(ids)
+            if "method" in entry and "path" in entry:
+                jobs.append(http_job(client, entry["method"], entry["path"].replace("{resume_id}", resume_id), entry.get("json")))
+            else:
+                job_description = entry.get("job_description") or entry.get("body") or entry.get("title") or DEFAULT_JOB_DESCRIPTION
+                jobs.append(http_job(client, "POST", "/api/process_resumes", {
+                    "resume_ids": [resume_id], "job_description": job_description, "mode": mode,
+                }))
+    return jobs
+
+
+def http_job(client, method: str, path: str, body=None):
+    async def send():
+        response = await client.request(method, path, json=body)
+        response.raise_for_status()
+    return send
+
+
+def endpoint_job(client, endpoint: str, resume_id: str, mode: str):
+    if endpoint == "batch":
+        return http_job(client, "POST", "/api/process_resumes", {
+            "resume_ids": [resume_id], "job_description": DEFAULT_JOB_DESCRIPTION, "mode": mode,
+        })
+
+    if endpoint == "stream":
+        async def stream():
+            async with client.stream("GET", f"/api/process_resume/{resume_id}/stream", params={"mode": mode}) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line.startswith("event: error"):
+                        raise RuntimeError(f"stream failed for {resume_id}")
+        return stream
+
+    async def queued():
+        response = await client.post(f"/api/process_resume/{resume_id}", params={"mode": mode})
+        response.raise_for_status()
+        job_id = response.json()["job_id"]
+        # Latency is measured from enqueue to the job finishing on the worker pool
+        while True:
+            job = (await client.get(f"/api/jobs/{job_id}")).json()
+            if job["status"] == "succeeded":
+                return
+            if job["status"] == "failed":
+                raise RuntimeError(job["error"])
+            await asyncio.sleep(0.01)
+    return queued
+
+
+async def bench_service(args, concurrency: int, seed: int):
+    """Drive the FastAPI app in process through httpx's ASGI transport"""
+    import httpx
+
+    service = install_fake_resources(args, concurrency)
+    if args.endpoint == "queue":
+        service.job_workers.start()
+    try:
+        transport = httpx.ASGITransport(app=service.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Distinct seeds per level, or content-hash dedup would hand back earlier records
+            resume_ids = await upload_corpus(client, corpus(args.resumes, seed=seed))
+            if args.replay:
+                jobs = replay_jobs(client, args.replay, resume_ids, args.mode)
+            else:
+                jobs = [endpoint_job(client, args.endpoint, resume_id, args.mode) for resume_id in resume_ids]
+            return await run_bounded(jobs, concurrency)
+    finally:
+        await service.close_resources()
+
+
+async def run_level(args, concurrency: int, seed: int):
+    bench = bench_scorer if args.target == "scorer" else bench_service
+    if args.trace_memory:
+        tracemalloc.start()
+    # The service prints every node update; keep the report readable
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        latencies, errors, elapsed = await bench(args, concurrency, seed)
+    traced_peak = None
+    if args.trace_memory:
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return latencies, errors, elapsed, traced_peak
+
+
+def run_name(args) -> str:
+    if args.target == "scorer":
+        name = f"scorer/{args.mode}"
+    else:
+        name = f"service/{'replay' if args.replay else args.endpoint}/{args.mode}"
+    return name + (f"/{args.llm_hosts}x{args.host_capacity}" if args.llm_hosts else "")
+
+
+def relative_to_serial(rows: List[Dict[str, Any]]) -> Dict[Tuple[str, int], Dict[str, float]]:
+    """Throughput and p95 latency of every row against the concurrency 1 row of the same run.
+
+    ``speedup`` is resumes/s over the serial resumes/s and ``p95_ratio`` is
+    p95 latency over the serial p50; rows of a run without a serial row are
+    left out.
+    """
+    serial = {row["name"]: row for row in rows if row["concurrency"] == 1}
+    return {
+        (row["name"], row["concurrency"]): {
+            "speedup": row["resumes_per_s"] / serial[row["name"]]["resumes_per_s"],
+            "p95_ratio": row["p95_s"] / serial[row["name"]]["p50_s"],
+        }
+        for row in rows if row["name"] in serial
+    }
+
+
+def check_baseline(rows: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """Regressions of relative p95 latency or speedup beyond ``tolerance`` against the baseline"""
+    with open(baseline_path) as f:
+        baseline = relative_to_serial(json.load(f)["results"])
+    current = relative_to_serial(rows)
+    failures = []
+    for row in rows:
+        key = (row["name"], row["concurrency"])
+        if row["errors"]:
+            failures.append(f"{row['name']} c={row['concurrency']}: {row['errors']} failed requests")
+        if key not in current:
+            print(f"No concurrency 1 run to compare {row['name']} at concurrency {row['concurrency']} with, skipped")
+            continue
+        if key not in baseline:
+            print(f"No baseline for {row['name']} at concurrency {row['concurrency']}, skipped")
+            continue
+        ratios, reference = current[key], baseline[key]
+        if ratios["p95_ratio"] > reference["p95_ratio"] * (1 + tolerance):
+            failures.append(
+                f"{row['name']} c={row['concurrency']}: p95 {ratios['p95_ratio']:.2f}x the serial p50"
+                f" > baseline {reference['p95_ratio']:.2f}x"
+            )
+        if ratios["speedup"] < reference["speedup"] * (1 - tolerance):
+            failures.append(
+                f"{row['name']} c={row['concurrency']}: {ratios['speedup']:.2f}x the serial throughput"
+                f" < baseline {reference['speedup']:.2f}x"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["scorer", "service"], default="scorer")
+    parser.add_argument("--endpoint", choices=["batch", "stream", "queue"], default="batch")
+    parser.add_argument("--mode", choices=["graph", "structured"], default="graph")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--resumes", type=int, default=32, help="resumes per concurrency level")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="fake generation speed, 0 for instant")
+    parser.add_argument("--llm-hosts", type=int, default=0, help="route over this many fake hosts, 0 for one unrouted model")
+    parser.add_argument("--host-capacity", type=int, default=0, help="calls each fake host serves at once, 0 for unlimited")
+    parser.add_argument("--admission-concurrency", type=int, default=0, help="service scheduler slots, 0 for the concurrency level")
+    parser.add_argument("--admission-queue", type=int, default=1024, help="service scheduler wait queue bound")
+    parser.add_argument("--checkpoints", action="store_true", help="checkpoint queued jobs in an in-memory SQLite store")
+    parser.add_argument("--io-latency", type=float, default=0.0, help="seconds per fake S3/Mongo call")
+    parser.add_argument("--pdf-workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--replay", help="JSONL request log to replay against the service")
+    parser.add_argument("--trace-memory", action="store_true", help="also report the tracemalloc peak (slower)")
+    parser.add_argument("--verbose", action="store_true", help="keep the service's own output")
+    parser.add_argument("--json", dest="json_path", help="write the results to this file")
+    parser.add_argument("--ci", action="store_true", help="compare against --baseline and fail on regressions")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression in --ci mode")
+    args = parser.parse_args()
+    if args.replay:
+        args.target = "service"
+
+    name = run_name(args)
+    rows = []
+    print(f"{'run':<28} {'conc':>5} {'reqs':>5} {'errs':>5} {'p50_s':>8} {'p95_s':>8} {'p99_s':>8} {'resumes/s':>10} {'rss_mb':>8}")
+    for level, concurrency in enumerate(args.concurrency):
+        latencies, errors, elapsed, traced_peak = asyncio.run(run_level(args, concurrency, seed=level * 10_000))
+        row = summarize(name, concurrency, latencies, errors, elapsed, traced_peak)
+        rows.append(row)
+        print(
+            f"{name:<28} {concurrency:>5} {row['requests']:>5} {errors:>5} {row['p50_s']:>8.3f} {row['p95_s']:>8.3f} "
+            f"{row['p99_s']:>8.3f} {row['resumes_per_s']:>10.2f} {row['peak_rss_mb']:>8.1f}"
+            + (f"  traced_peak={row['traced_peak_mb']}MB" if traced_peak is not None else "")
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "settings": {
+                    "llm_latency": args.llm_latency,
+                    "tokens_per_second": args.tokens_per_second,
+                    "io_latency": args.io_latency,
+                    "resumes": args.resumes,
+                },
+                "results": rows,
+            }, f, indent=2)
+
+    if args.ci:
+        failures = check_baseline(rows, args.baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
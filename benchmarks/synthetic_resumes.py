@@ -0,0 +1,93 @@
+"""Deterministic corpus of synthetic resume PDFs for benchmarks.
+
+PDFs are written by hand (one Helvetica text stream per page) so no PDF
+authoring library is needed; PyPDF2 extracts their text like a real resume.
+"""
+import random
+from typing import List
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Riley", "Casey", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Patel", "Garcia", "Chen", "Okafor", "Kowalski", "Nguyen", "Silva", "Müller", "Haddad"]
+ROLES = ["Data Scientist", "Data Analyst", "ML Engineer", "Backend Engineer", "Data Engineer"]
+COMPANIES = ["Tech Corp", "StartupXYZ", "DataWorks", "Acme Analytics", "CloudNine", "Initech"]
+SKILLS = [
+    "Python", "SQL", "Machine Learning", "AWS", "Docker", "Tableau", "Spark", "PyTorch",
+    "Kubernetes", "Pandas", "NumPy", "Statistical analysis", "Scikit-learn", "GCP", "Git",
+]
+BULLETS = [
+    "Led machine learning projects using {skill} and {skill2}",
+    "Built data pipelines on {skill} serving 40 internal teams",
+    "Mentored junior engineers and ran weekly {skill} workshops",
+    "Reduced reporting latency by 35% with {skill}",
+    "Shipped a {skill} model that improved retention by 8%",
+]
+
+
+def resume_text(seed: int, jobs: int = 3) -> str:
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, rng.randint(4, 9))
+    lines = [name, rng.choice(ROLES), f"{name.split()[0].lower()}.{seed}@example.com | (555) 010-{seed % 10000:04d}", "", "EXPERIENCE:"]
+    year = 2025
+    for _ in range(jobs):
+        length = rng.randint(1, 4)
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({year - length}-{year})")
+        for template in rng.sample(BULLETS, 2):
+            lines.append("- " + template.format(skill=rng.choice(skills), skill2=rng.choice(skills)))
+        year -= length
+    lines += [
+        "", "EDUCATION:", f"MS in Data Science, University ABC ({year})",
+        "", "SKILLS:", ", ".join(skills),
+        "", "CERTIFICATIONS:", "AWS Certified Solutions Architect" if rng.random() < 0.5 else "None",
+    ]
+    return "\n".join(lines)
+
+
+def _escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_to_pdf(text: str, lines_per_page: int = 45) -> bytes:
+    """Minimal multi-page PDF with ``text`` set in 10pt Helvetica"""
+    lines = text.splitlines() or [""]
+    pages = [lines[index:index + lines_per_page] for index in range(0, len(lines), lines_per_page)]
+
+    objects = []  # object bodies, object number = index + 1
+    font_id = 3
+    page_ids = []
+    objects.append(None)  # 1: catalog, filled below
+    objects.append(None)  # 2: page tree, filled below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for page_lines in pages:
+        commands = ["BT", "/F1 10 Tf", "12 TL", "50 790 Td"]
+        commands += [f"({_escape(line)}) Tj T*" for line in page_lines]
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+def corpus(count: int, seed: int = 0, jobs: int = 3) -> List[bytes]:
+    """``count`` distinct resume PDFs; the same arguments always give the same bytes"""
+    return [text_to_pdf(resume_text(seed + index, jobs)) for index in range(count)]
@@ -1,8 +1,50 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
 
 class EvaluationResult(BaseModel):
     score: float
     strengths: List[str]
     weaknesses: List[str]
-    summary: Optional[str]
\ No newline at end of file
+    summary: Optional[str]
+
+class CriterionEvaluation(EvaluationResult):
+    reasoning: str = Field(..., description="Why the score was given")
+
+class StructuredEvaluation(BaseModel):
+    """All four sub-scores of a resume, as returned by the single-call scoring mode"""
+    technical: CriterionEvaluation
+    experience: CriterionEvaluation
+    cultural_fit: CriterionEvaluation
+    additional: CriterionEvaluation
+
+class EvaluationOptions(BaseModel):
+    bypass_cache: bool = Field(False, description="Skip the LLM response cache")
+    incremental: bool = Field(False, description="Only re-run the nodes affected by changes since the resume's last evaluation")
+    skill_matching: Literal["llm", "hybrid", "local"] = Field("llm", description="How the technical node matches skills: by the LLM, locally, or locally with the LLM judging experience")
+    mode: Literal["graph", "structured"] = Field("graph", description="Score each criterion in its own LLM call, or all four in one JSON-constrained call")
+    early_reject: bool = Field(False, description="Stop scoring once the pass threshold is out of reach and return a templated FAIL without LLM feedback")
+    cascade: bool = Field(False, description="Score with the base model first and re-score borderline or unparsable results with the cascade model")
+
+    def scorer_kwargs(self) -> Dict[str, Any]:
+        """Options forwarded to ResumeScorer.score_resume and friends"""
+        return {"bypass_cache": self.bypass_cache, "skill_matching": self.skill_matching, "mode": self.mode, "early_reject": self.early_reject, "cascade": self.cascade}
+
+class BatchEvaluationRequest(EvaluationOptions):
+    job_description: str = Field(..., description="Job description every resume is scored against")
+    job_id: Optional[str] = Field(None, description="Job opening the results are ranked under, defaults to a hash of the job description")
+    scoring_criteria: Optional[Dict[str, Any]] = Field(None, description="Scoring criteria, defaults to create_default_scoring_criteria()")
+    resume_ids: List[str] = Field(..., min_length=1, description="IDs of the resumes to score")
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Upper bound on resumes scored at once")
+
+class PrefilterRequest(BaseModel):
+    scoring_criteria: Optional[Dict[str, Any]] = Field(None, description="Scoring criteria, only the technical section is used")
+    resume_ids: List[str] = Field(..., min_length=1, description="IDs of the resumes to rank")
+    min_required_ratio: float = Field(1.0, ge=0, le=1, description="Minimum share of required skills a resume must match")
+    limit: Optional[int] = Field(None, ge=1, description="Return at most this many resumes")
+
+class ShortlistRequest(BaseModel):
+    job_description: str = Field(..., description="Job description to match resumes against")
+    k: int = Field(50, ge=1, le=1000, description="Number of resumes to return")
+
+class IndexResumesRequest(BaseModel):
+    resume_ids: List[str] = Field(..., min_length=1, description="IDs of the resumes to index")
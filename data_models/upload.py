@@ -7,4 +7,7 @@ class ResumeUploadMetadata(BaseModel):
     content_type: str = Field(..., description="MIME type of the uploaded file")
     upload_time: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of upload")
     file_size: int = Field(..., description="Size of the file in bytes")
-    uploader_id: Optional[str] = Field(None, description="ID of the user who uploaded the file")
\ No newline at end of file
+    uploader_id: Optional[str] = Field(None, description="ID of the user who uploaded the file")
+    content_hash: Optional[str] = Field(None, description="SHA-256 of the file bytes, used to deduplicate uploads")
+    object_name: Optional[str] = Field(None, description="Key of the file in the resumes bucket")
+    candidate_id: Optional[str] = Field(None, description="Links uploads of the same candidate; derived from the resume's e-mail when omitted")
@@ -1,39 +1,326 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
-import os
+from fastapi import Depends, FastAPI, File, Form, Query, Request, UploadFile, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+import json
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import Dict, Literal, Optional
+from data_models.evaluation import BatchEvaluationRequest, EvaluationOptions, IndexResumesRequest, PrefilterRequest, ShortlistRequest
 from data_models.upload import ResumeUploadMetadata
-from utils.external_resources import S3Client, MongoDBClient
-from utils.extract_pdf import PDFExtractor
-from agents.evaluation import ResumeScorer, create_default_scoring_criteria
+from utils.config import settings
+from utils.evaluation_store import EvaluationStore, job_key
+from utils.external_resources import AsyncS3Client, AsyncMongoDBClient, MongoDBClient
+from utils.extract_pdf import extract_pdf_text
+from utils.job_queue import JobQueue, JobWorkerPool
+from utils.llm_cache import DiskCacheStore, LLMCache, MongoCacheStore
+from utils.resume_sections import diff_sections
+from utils.resume_versions import ResumeVersions
+from utils.scheduler import AdmissionScheduler, Overloaded
+from utils.metrics import (
+    HTTP_REQUEST_SECONDS, IO_SECONDS, REGISTRY, Gauge, collect_timings, collect_tokens, new_trace_id, timed, trace_id_var,
+)
+from utils.skill_matcher import prefilter
+from utils.vector_index import NumpyVectorIndex, QdrantVectorIndex, ResumeIndex
 
 from bson import ObjectId
-scorer = ResumeScorer(model_name="gemma3:1b")
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 
-app = FastAPI()
+def create_llm_cache(cache_mongo=None) -> LLMCache:
+    if settings.llm_cache_backend == "mongo":
+        # The cache store is shared with the sync graph path, so it uses the sync client
+        store = MongoCacheStore(cache_mongo.get_database("resume_db")["llm_cache"])
+    elif settings.llm_cache_backend == "disk":
+        store = DiskCacheStore(settings.llm_cache_dir)
+    else:
+        store = None
+    return LLMCache(
+        max_entries=settings.llm_cache_max_entries,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        store=store,
+    )
+
+def create_checkpointer(sync_mongo=None):
+    """Checkpoint saver for resumable scoring runs, or None when disabled"""
+    from utils.checkpointer import MongoCheckpointStore, ScoringCheckpointer, SqliteCheckpointStore
+
+    if settings.checkpoint_backend == "mongo":
+        db = sync_mongo.get_database("resume_db")
+        store = MongoCheckpointStore(db["checkpoints"], db["checkpoint_writes"], settings.checkpoint_ttl_seconds)
+    elif settings.checkpoint_backend == "sqlite":
+        store = SqliteCheckpointStore(settings.checkpoint_path, settings.checkpoint_ttl_seconds)
+    elif settings.checkpoint_backend == "memory":
+        store = SqliteCheckpointStore(":memory:", settings.checkpoint_ttl_seconds)
+    else:
+        return None
+    return ScoringCheckpointer(store)
+
+def create_resume_index() -> ResumeIndex:
+    from langchain_community.embeddings import OllamaEmbeddings
+
+    if settings.vector_backend == "qdrant":
+        backend = QdrantVectorIndex(settings.qdrant_uri)
+    else:
+        backend = NumpyVectorIndex()
+    embeddings = OllamaEmbeddings(model=settings.embedding_model, base_url=settings.llm_url_ollama)
+    return ResumeIndex(embeddings, backend)
+
+SCORER_MODEL = "gemma3:1b"
+
+def scorer_node_models() -> Dict[str, str]:
+    """Per-node model overrides from SCORER_NODE_MODELS"""
+    pairs = (item.split("=", 1) for item in settings.scorer_node_models.split(",") if "=" in item)
+    return {node.strip(): model.strip() for node, model in pairs}
+
+def scorer_models():
+    """Every model the scorer calls, the base one first"""
+    models = [SCORER_MODEL, *scorer_node_models().values()]
+    if settings.cascade_model:
+        models.append(settings.cascade_model)
+    return list(dict.fromkeys(models))
+
+def create_llm_router(model_name: str = SCORER_MODEL):
+    # Pulls in langchain, import it on startup rather than with this module
+    from utils.llm_router import LLMRouter, configured_urls
+
+    return LLMRouter(configured_urls(), model_name)
+
+def create_scorer(cache: LLMCache, routers, checkpointer=None):
+    from agents.evaluation import STRUCTURED_NODE, ResumeScorer
+
+    def chat_model(node, model):
+        # The structured scoring call needs the JSON-constrained client
+        return routers[model].chat_model(format="json" if node == STRUCTURED_NODE else None)
+
+    escalation_llms = None
+    if settings.cascade_model:
+        escalation_llms = {
+            "default": chat_model("default", settings.cascade_model),
+            STRUCTURED_NODE: chat_model(STRUCTURED_NODE, settings.cascade_model),
+        }
+    return ResumeScorer(
+        model_name=SCORER_MODEL,
+        cache=cache,
+        router=routers[SCORER_MODEL],
+        checkpointer=checkpointer,
+        max_retries=settings.llm_max_retries,
+        retry_backoff=settings.llm_retry_backoff,
+        node_llms={node: chat_model(node, model) for node, model in scorer_node_models().items()},
+        escalation_llms=escalation_llms,
+        cascade_band=settings.cascade_band,
+    )
+
+def check_options(options: EvaluationOptions):
+    """Refuse options this deployment cannot serve before any work is queued"""
+    if options.cascade and not scorer.escalation_llms:
+        raise HTTPException(status_code=400, detail="Cascade scoring is not configured, set CASCADE_MODEL")
 
-s3 = S3Client()
-mongo = MongoDBClient()
-db = mongo.get_database("resume_db")
-resume_collection = db["resumes"]
+def default_scoring_criteria():
+    from agents.evaluation import create_default_scoring_criteria
+
+    return create_default_scoring_criteria()
+
+# Clients, the scorer and the worker pool are created once per process by
+# init_resources, so importing this module has no side effects
+s3 = None
+mongo = None
+cache_mongo = None
+llm_router = None
+# One router per model in scorer_models(); llm_router is the SCORER_MODEL one
+llm_routers = {}
+resume_collection = None
+resume_versions = None
+evaluation_store = None
+job_queue = None
+pdf_executor = None
+llm_cache = None
+resume_index = None
+scorer = None
+job_workers = None
+admission = None
+
+async def init_resources():
+    """Create the clients and the scorer; called by the app lifespan and worker.py"""
+    global s3, mongo, cache_mongo, llm_router, llm_routers, resume_collection, resume_versions, evaluation_store, job_queue, pdf_executor, llm_cache, resume_index, scorer, job_workers, admission
+    if scorer is not None:
+        return
+
+    s3 = AsyncS3Client()
+    mongo = AsyncMongoDBClient()
+    db = mongo.get_database("resume_db")
+    resume_collection = db["resumes"]
+    resume_versions = ResumeVersions(resume_collection)
+    evaluation_store = EvaluationStore(db["evaluations"])
+    job_queue = JobQueue(
+        db["jobs"],
+        visibility_timeout=settings.job_visibility_timeout,
+        max_attempts=settings.job_max_attempts,
+        retry_backoff=settings.job_retry_backoff,
+    )
+    # PDF parsing is CPU bound, keep it off the event loop and out of the GIL
+    pdf_executor = ProcessPoolExecutor(max_workers=settings.pdf_workers)
+    # The LLM cache and the checkpoints are written from the sync graph path too
+    if settings.llm_cache_backend == "mongo" or settings.checkpoint_backend == "mongo":
+        cache_mongo = MongoDBClient()
+    llm_cache = create_llm_cache(cache_mongo)
+    try:
+        resume_index = create_resume_index()
+    except Exception as e:
+        # Shortlisting is optional, scoring works without it
+        print(f"Resume index disabled: {e}")
+        resume_index = None
+    llm_routers = {model: create_llm_router(model) for model in scorer_models()}
+    llm_router = llm_routers[SCORER_MODEL]
+    scorer = create_scorer(llm_cache, llm_routers, create_checkpointer(cache_mongo))
+    # Every evaluation in this process, queued, streamed or batched, takes a slot here
+    admission = AdmissionScheduler(settings.admission_max_concurrency, settings.admission_max_queue)
+    job_workers = JobWorkerPool(job_queue, run_evaluation_job, concurrency=settings.job_workers)
+
+    await resume_collection.create_index("content_hash", unique=True, sparse=True)
+    await job_queue.create_indexes()
+    await evaluation_store.create_indexes()
+    await resume_versions.create_indexes()
+    # Loads the models on every endpoint in the background and keeps health-checking them
+    for router in llm_routers.values():
+        router.start()
+
+async def close_resources():
+    global scorer
+    if job_workers is not None:
+        await job_workers.stop()
+    if pdf_executor is not None:
+        pdf_executor.shutdown(cancel_futures=True)
+    if mongo is not None:
+        await mongo.client.close()
+    if cache_mongo is not None:
+        cache_mongo.client.close()
+    for router in llm_routers.values():
+        await router.aclose()
+    if s3 is not None:
+        s3.close()
+    scorer = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_resources()
+    if settings.job_workers > 0:
+        job_workers.start()
+    yield
+    await close_resources()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Tag each request with a trace id and record its latency per route"""
+    trace_id = request.headers.get("x-trace-id") or new_trace_id()
+    token = trace_id_var.set(trace_id)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method, route=getattr(route, "path", "unmatched"), status=status,
+        )
+        trace_id_var.reset(token)
+    response.headers["X-Trace-Id"] = trace_id
+    return response
+
+def pool_in_flight():
+    if scorer is None:
+        return {}
+    in_flight = {
+        ("s3",): s3.pool_stats()["in_flight"],
+        ("mongo",): mongo.pool_stats.stats()["checked_out"],
+    }
+    for endpoint in llm_router.endpoints:
+        in_flight[(f"ollama:{endpoint.url}",)] = endpoint.in_flight
+    for model, router in llm_routers.items():
+        if router is not llm_router:
+            for endpoint in router.endpoints:
+                in_flight[(f"ollama:{model}:{endpoint.url}",)] = endpoint.in_flight
+    return in_flight
+
+REGISTRY.register(Gauge("resume_pool_in_flight", "Requests or connections currently using each pool", ("pool",), pool_in_flight))
+
+def scheduler_depth():
+    if admission is None:
+        return {}
+    depth = {(priority, "queued"): count for priority, count in admission.stats()["queued"].items()}
+    depth[("all", "running")] = admission.in_flight
+    return depth
+
+REGISTRY.register(Gauge("resume_scheduler_depth", "Evaluations waiting for or holding a scorer slot", ("priority", "state"), scheduler_depth))
+
+@app.exception_handler(Overloaded)
+async def overloaded_response(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "reason": exc.reason, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 BUCKET_NAME = "resumes"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_JOB_DESCRIPTION = """
+    We're seeking a Senior Data Scientist to join our AI team. 
+    Requirements: 3+ years experience, Python, SQL, Machine Learning.
+    Preferred: AWS, Docker, team leadership experience.
+    """
+
+# Fields computed downstream of an upload that are returned for duplicates
+REUSABLE_FIELDS = ["extracted_text", "extracted_info", "evaluation"]
+
+def duplicate_response(record):
+    content = {
+        "message": "Resume already uploaded",
+        "filename": record["filename"],
+        "resume_id": record["_id"],
+        "duplicate": True,
+    }
+    for field in REUSABLE_FIELDS:
+        if field in record:
+            content[field] = record[field]
+    return JSONResponse(content=content)
 
 @app.post("/api/upload_resume")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(file: UploadFile = File(...), candidate_id: Optional[str] = Form(None)):
+    """Store an uploaded resume in S3 under its content hash, reusing the record of identical bytes.
+
+    The multipart parser buffers uploads up to 1 MB in memory and spools larger
+    ones to a local temporary file before this handler runs. The hash and the
+    S3 upload then read that spool in chunks, so memory stays bounded but a
+    large upload costs one local disk write.
+    """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file uploaded")
     
-    # Save file temporarily
-    temp_path = os.path.join("/tmp", file.filename)
-    with open(temp_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
-    # Upload to S3 (MinIO)
-    s3.upload_file(temp_path, BUCKET_NAME, file.filename)
-    file_size = os.path.getsize(temp_path)
-    os.remove(temp_path)
+    # Hash the upload in bounded chunks instead of reading it into memory
+    digest = hashlib.sha256()
+    file_size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        digest.update(chunk)
+        file_size += len(chunk)
+    content_hash = digest.hexdigest()
+
+    # Identical bytes were uploaded before, reuse that record and its artifacts
+    existing = await resume_collection.find_one({"content_hash": content_hash})
+    if existing:
+        return duplicate_response(existing)
+
+    # Stream to S3 (MinIO), keyed by content so same-named files never collide
+    object_name = content_hash
+    await file.seek(0)
+    await s3.upload_fileobj(file.file, BUCKET_NAME, object_name, content_type=file.content_type)
 
     # Create metadata
     metadata = ResumeUploadMetadata(
@@ -41,13 +328,20 @@ async def upload_resume(file: UploadFile = File(...)):
         content_type=file.content_type,
         upload_time=datetime.now(timezone.utc),
         file_size=file_size,
-        uploader_id=None  # Set uploader_id if available
+        uploader_id=None,  # Set uploader_id if available
+        content_hash=content_hash,
+        object_name=object_name,
+        candidate_id=candidate_id,
     )
 
     # Insert metadata into MongoDB
     record = metadata.model_dump()
     record["_id"] = str(ObjectId())
-    resume_collection.insert_one(record)
+    try:
+        await resume_collection.insert_one(record)
+    except DuplicateKeyError:
+        # A concurrent upload of the same bytes won the insert
+        return duplicate_response(await resume_collection.find_one({"content_hash": content_hash}))
 
     return JSONResponse(content={
         "message": "Resume uploaded successfully",
@@ -55,41 +349,484 @@ async def upload_resume(file: UploadFile = File(...)):
         "resume_id": record["_id"]
     })
 
+async def get_resume_text(record):
+    """Extract text from the resume PDF, unless it was already extracted for this document"""
+    pdf_text = record.get("extracted_text")
+    if pdf_text is None:
+        # Read the file from S3 into memory; older records are keyed by filename
+        object_name = record.get("object_name") or record["filename"]
+        pdf_bytes = await s3.get_object(BUCKET_NAME, object_name)
+        loop = asyncio.get_running_loop()
+        with timed(IO_SECONDS, span="pdf.extract", system="pdf", operation="extract"):
+            pdf_text = await loop.run_in_executor(
+                pdf_executor, extract_pdf_text, pdf_bytes, settings.pdf_max_pages, settings.pdf_max_chars
+            )
+        del pdf_bytes
+        # Stored right away, so prefilter, index and diff calls never parse it again
+        await resume_collection.update_one({"_id": record["_id"]}, {"$set": {"extracted_text": pdf_text}})
+        record["extracted_text"] = pdf_text
+    if resume_index is not None and record.get("indexed_in") != resume_index.name:
+        await index_resume_text(record, pdf_text)
+    if "section_hashes" not in record:
+        await link_resume_version(record, pdf_text)
+    return pdf_text
+
+async def link_resume_version(record, pdf_text):
+    """Attach the record to its candidate's earlier uploads; failures never block scoring"""
+    try:
+        await resume_versions.link(record, pdf_text)
+    except Exception as e:
+        print(f"Could not link resume {record['_id']} to earlier versions: {e}")
+
+async def index_resume_text(record, pdf_text):
+    """Add the text to the shortlist index and mark the record indexed; failures never block scoring"""
+    try:
+        with timed(IO_SECONDS, span="embedding.index_resume", system="embedding", operation="index_resume"):
+            await asyncio.to_thread(resume_index.index_resume, record["_id"], pdf_text)
+    except Exception as e:
+        print(f"Could not index resume {record['_id']}: {e}")
+        return
+    await resume_collection.update_one({"_id": record["_id"]}, {"$set": {"indexed_in": resume_index.name}})
+    record["indexed_in"] = resume_index.name
+
+async def previous_evaluation(record):
+    """Last stored evaluation of a resume with the inputs it was computed from, or None.
+
+    A new version that was never scored reuses the evaluation of the version
+    before it, so only the nodes reading changed sections re-run.
+    """
+    source = record
+    if not (record.get("evaluation") or {}).get("job_description") and record.get("previous_version_id"):
+        source = await resume_collection.find_one(
+            {"_id": record["previous_version_id"]}, {"evaluation": 1, "extracted_text": 1},
+        ) or {}
+    evaluation = source.get("evaluation")
+    if not evaluation or "job_description" not in evaluation:
+        return None
+    return {**evaluation, "resume_text": source.get("extracted_text")}
+
+async def evaluate_record(record, job_description, scoring_criteria, options, on_node=None, trace_id=None, run_id=None):
+    """Score one resume; the result carries the trace id, a {span: seconds} timing
+    breakdown and the prompt and completion tokens of each LLM node.
+
+    Runs with a run_id are checkpointed; evaluating again with the same id
+    after a failure resumes after the last completed node.
+    """
+    with collect_timings(trace_id) as timings, collect_tokens() as tokens:
+        pdf_text = await get_resume_text(record)
+        # Incremental mode only re-runs the nodes whose inputs changed since the last evaluation
+        previous = await previous_evaluation(record) if options.incremental else None
+        result = {}
+        async for update in scorer.ascore_resume(pdf_text, job_description, scoring_criteria, previous=previous, run_id=run_id, **options.scorer_kwargs()):
+            scorer.merge_update(result, update)
+            if on_node is not None:
+                for node in update:
+                    await on_node(node)
+        result["trace_id"] = trace_id_var.get()
+    result["timings"] = timings
+    result["tokens"] = tokens
+    return pdf_text, result
+
+def artifacts_update(pdf_text, result, job_description, scoring_criteria, options):
+    return {"$set": {
+        "extracted_text": pdf_text,
+        "extracted_info": result.get("extracted_info", {}),
+        # Inputs are stored with the result so a later incremental run can diff them
+        "evaluation": {
+            **result,
+            "job_description": job_description,
+            "scoring_criteria": scoring_criteria,
+            "skill_matching": options.skill_matching,
+            "mode": options.mode,
+            "early_reject": options.early_reject,
+        },
+    }}
+
+async def run_evaluation_job(job, report_progress):
+    """Job handler for the worker pool: score one resume and persist its artifacts"""
+    payload = job["payload"]
+    record = await resume_collection.find_one({"_id": payload["resume_id"]})
+    if not record:
+        raise ValueError(f"Resume {payload['resume_id']} not found")
+
+    options = EvaluationOptions(**payload.get("options", {}))
+    # Give up the slot wait well before the job's visibility timeout; an
+    # Overloaded job is requeued with backoff like any other failure
+    async with admission.slot("interactive", job_queue.visibility_timeout / 2):
+        pdf_text, result = await evaluate_record(
+            record, payload["job_description"], payload["scoring_criteria"], options,
+            on_node=report_progress, trace_id=payload.get("trace_id") or job["_id"],
+            # A retried or re-claimed job continues from the last attempt's checkpoint
+            run_id=job["_id"],
+        )
+
+    # Keep the artifacts on the record so re-uploads of the same bytes reuse them
+    await resume_collection.update_one(
+        {"_id": record["_id"]},
+        artifacts_update(pdf_text, result, payload["job_description"], payload["scoring_criteria"], options),
+    )
+    job_id = payload.get("job_id") or job_key(payload["job_description"])
+    await evaluation_store.save(EvaluationStore.document(job_id, record, result, options.mode))
+    return result
+
 #api to process the uploaded resume for evaluation feature
-@app.post("/api/process_resume/{resume_id}")
-async def process_resume(resume_id: str):
+@app.post("/api/process_resume/{resume_id}", status_code=202)
+async def process_resume(resume_id: str, job_id: Optional[str] = None, options: EvaluationOptions = Depends()):
     if not resume_id:
         raise HTTPException(status_code=400, detail="Resume ID is required")
     
     # Fetch metadata from MongoDB
-    record = resume_collection.find_one({"_id": resume_id})
+    record = await resume_collection.find_one({"_id": resume_id}, {"_id": 1})
     if not record:
         raise HTTPException(status_code=404, detail="Resume not found")
+    check_options(options)
+    # Shed here rather than grow a backlog the workers cannot drain in time;
+    # the backlog is the shared job queue, not this process's scheduler
+    queued, wait = await job_queue.estimated_wait(settings.job_capacity or settings.job_workers, admission.service_seconds)
+    admission.check_backlog("interactive", queued, wait, settings.admission_interactive_wait)
 
-    # Download file from S3
-    temp_path = os.path.join("/tmp", record["filename"])
-    s3.download_file(BUCKET_NAME, record["filename"], temp_path)
+    # Scoring runs on the worker pool; poll /api/jobs/{job_id} for the outcome
+    queued_job_id = await job_queue.enqueue("evaluate_resume", {
+        "resume_id": resume_id,
+        "job_description": DEFAULT_JOB_DESCRIPTION,
+        "scoring_criteria": default_scoring_criteria(),
+        "options": options.model_dump(),
+        # Job opening the result is ranked under, not the id of this queued job
+        "job_id": job_id or job_key(DEFAULT_JOB_DESCRIPTION),
+        # The worker scores under the trace id of the request that queued the job
+        "trace_id": trace_id_var.get(),
+    })
 
-    # result = scorer.score_resume(sample_resume, job_description, scoring_criteria)
-    # Extract text from PDF'
-    job_description = """
-    We're seeking a Senior Data Scientist to join our AI team. 
-    Requirements: 3+ years experience, Python, SQL, Machine Learning.
-    Preferred: AWS, Docker, team leadership experience.
-    """
-    extractor = PDFExtractor(temp_path)
-    pdf_text = extractor.extract_text()
-    scoring_criteria = create_default_scoring_criteria()
-    for result in scorer.score_resume(pdf_text, job_description, scoring_criteria):
-            print(f"Criteria: {result}")
-    result = result["generate_feedback"]
-    # Clean up temporary file
-    os.remove(temp_path)
+    return JSONResponse(status_code=202, content={
+        "message": "Resume queued for processing",
+        "resume_id": resume_id,
+        "job_id": queued_job_id,
+        "ranking_url": f"/api/jobs/{job_id or job_key(DEFAULT_JOB_DESCRIPTION)}/top",
+    })
 
-    return JSONResponse(content={
-        "message": "Resume processed successfully",
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JSONResponse(content=jsonable_encoder({
+        "job_id": job["_id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }))
+
+#api to list every uploaded version of a candidate's resume
+@app.get("/api/candidates/{candidate_id}/versions")
+async def candidate_versions(candidate_id: str):
+    versions = await resume_versions.versions(candidate_id)
+    if not versions:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return JSONResponse(content=jsonable_encoder({"candidate_id": candidate_id, "versions": versions}))
+
+#api to diff a resume against an earlier version, section by section
+@app.get("/api/resumes/{resume_id}/diff")
+async def resume_diff(resume_id: str, against: Optional[str] = None):
+    record = await resume_collection.find_one({"_id": resume_id})
+    if not record:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    # Read-only: diff the stored text, never fetch, parse or index on a GET
+    pdf_text = record.get("extracted_text")
+    if pdf_text is None:
+        raise HTTPException(status_code=409, detail="Resume has not been parsed yet")
+    against = against or record.get("previous_version_id")
+    if not against:
+        raise HTTPException(status_code=404, detail="Resume has no earlier version")
+    other = await resume_collection.find_one({"_id": against})
+    if not other:
+        raise HTTPException(status_code=404, detail="Earlier version not found")
+    other_text = other.get("extracted_text")
+    if other_text is None:
+        raise HTTPException(status_code=409, detail="Earlier version has not been parsed yet")
+
+    content = {
         "resume_id": resume_id,
-        "extracted_text": pdf_text,
-        "result": result
+        "against": against,
+        "candidate_id": record.get("candidate_id"),
+        "sections": diff_sections(other_text, pdf_text),
+    }
+    # Nodes a re-score against the earlier version's job would run
+    evaluation = other.get("evaluation")
+    if evaluation and "job_description" in evaluation:
+        content["nodes_to_rerun"] = scorer.plan_rescore(
+            {**evaluation, "resume_text": other_text}, pdf_text,
+            evaluation["job_description"], evaluation.get("scoring_criteria") or {},
+            evaluation.get("skill_matching", "llm"), evaluation.get("mode", "graph"),
+            evaluation.get("early_reject", False),
+        )
+    return JSONResponse(content=content)
+
+#api to rank the evaluated resumes of a job opening by total score
+@app.get("/api/jobs/{job_id}/top")
+async def top_candidates(
+    job_id: str,
+    k: int = Query(10, ge=1, le=1000),
+    status: Optional[Literal["PASS", "FAIL"]] = None,
+    include_feedback: bool = False,
+):
+    candidates = await evaluation_store.top(job_id, k, status, include_feedback)
+    return JSONResponse(content=jsonable_encoder({"job_id": job_id, "candidates": candidates}))
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+#api to stream per-node scoring progress as server-sent events
+@app.get("/api/process_resume/{resume_id}/stream")
+async def stream_process_resume(resume_id: str, stream_tokens: bool = False, job_id: Optional[str] = None, options: EvaluationOptions = Depends()):
+    record = await resume_collection.find_one({"_id": resume_id})
+    if not record:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    check_options(options)
+    # The body streams after the tracing middleware returned, keep its trace id
+    trace_id = trace_id_var.get()
+    ranking_job_id = job_id or job_key(DEFAULT_JOB_DESCRIPTION)
+    # Shed before the response starts, so an overloaded scorer still answers 429/503
+    admission.check("interactive", settings.admission_interactive_wait)
+
+    async def events():
+        # The slot is taken once the body starts: a generator that never runs,
+        # because the client left first, has no finally to release it in
+        try:
+            await admission.acquire("interactive", settings.admission_interactive_wait)
+        except Overloaded as e:
+            yield sse_event("error", {"resume_id": resume_id, "detail": str(e), "retry_after": e.retry_after})
+            return
+        start = time.perf_counter()
+        try:
+            with collect_timings(trace_id) as timings, collect_tokens() as tokens:
+                pdf_text = await get_resume_text(record)
+                yield sse_event("extracted_text", {"resume_id": resume_id, "extracted_text": pdf_text})
+
+                result = {}
+                scoring_criteria = default_scoring_criteria()
+                progress = scorer.astream_progress(
+                    pdf_text, DEFAULT_JOB_DESCRIPTION, scoring_criteria,
+                    token_nodes=["generate_feedback"] if stream_tokens else None,
+                    previous=await previous_evaluation(record) if options.incremental else None,
+                    **options.scorer_kwargs(),
+                )
+                async for item in progress:
+                    if item["type"] == "token":
+                        yield sse_event("token", {"node": item["node"], "text": item["text"]})
+                        continue
+                    scorer.merge_update(result, item["update"])
+                    for node, values in item["update"].items():
+                        yield sse_event("node", {"node": node, "update": values})
+            result["trace_id"] = trace_id
+            result["timings"] = timings
+            result["tokens"] = tokens
+
+            await resume_collection.update_one(
+                {"_id": resume_id},
+                artifacts_update(pdf_text, result, DEFAULT_JOB_DESCRIPTION, scoring_criteria, options),
+            )
+            await evaluation_store.save(EvaluationStore.document(ranking_job_id, record, result, options.mode))
+            yield sse_event("result", {
+                "resume_id": resume_id, "result": result, "ranking_url": f"/api/jobs/{ranking_job_id}/top",
+            })
+        except Exception as e:
+            yield sse_event("error", {"resume_id": resume_id, "detail": str(e)})
+        finally:
+            admission.release(time.perf_counter() - start)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+#api to score many resumes against one job description
+@app.post("/api/process_resumes")
+async def process_resumes(request: BatchEvaluationRequest):
+    scoring_criteria = request.scoring_criteria or default_scoring_criteria()
+    resume_ids = list(dict.fromkeys(request.resume_ids))
+    job_id = request.job_id or job_key(request.job_description)
+
+    # One query for all metadata instead of one round-trip per resume
+    records = {
+        record["_id"]: record
+        async for record in resume_collection.find({"_id": {"$in": resume_ids}})
+    }
+
+    check_options(request)
+    # Refuse the whole batch up front when it could not start in time
+    admission.check("batch", settings.admission_batch_wait)
+    semaphore = asyncio.Semaphore(request.max_concurrency or settings.batch_max_concurrency)
 
-    })
\ No newline at end of file
+    async def run(record):
+        async with semaphore:
+            try:
+                async with admission.slot("batch", settings.admission_batch_wait):
+                    pdf_text, result = await evaluate_record(
+                        record, request.job_description, scoring_criteria, request
+                    )
+            except Exception as e:
+                return record["_id"], None, str(e)
+            return record["_id"], (pdf_text, result), None
+
+    outcomes = await asyncio.gather(*(run(records[resume_id]) for resume_id in resume_ids if resume_id in records))
+
+    results, errors, writes, evaluations = {}, {}, [], []
+    for resume_id, outcome, error in outcomes:
+        if error is not None:
+            errors[resume_id] = error
+            continue
+        pdf_text, result = outcome
+        results[resume_id] = result
+        writes.append(UpdateOne(
+            {"_id": resume_id},
+            artifacts_update(pdf_text, result, request.job_description, scoring_criteria, request),
+        ))
+        evaluations.append(EvaluationStore.document(job_id, records[resume_id], result, request.mode))
+    if writes:
+        await resume_collection.bulk_write(writes, ordered=False)
+    await evaluation_store.save_many(evaluations)
+
+    return JSONResponse(content={
+        "message": "Resumes processed",
+        "job_id": job_id,
+        "ranking_url": f"/api/jobs/{job_id}/top",
+        "results": results,
+        "errors": errors,
+        "not_found": [resume_id for resume_id in resume_ids if resume_id not in records],
+    })
+
+#api to rank resumes by deterministic skill matching before any LLM call
+@app.post("/api/prefilter_resumes")
+async def prefilter_resumes(request: PrefilterRequest):
+    scoring_criteria = request.scoring_criteria or default_scoring_criteria()
+    resume_ids = list(dict.fromkeys(request.resume_ids))
+    records = {
+        record["_id"]: record
+        async for record in resume_collection.find({"_id": {"$in": resume_ids}})
+    }
+
+    # Only resumes that were never parsed hit S3, bound how many do so at once
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    async def text_of(record):
+        async with semaphore:
+            return await get_resume_text(record)
+
+    texts = await asyncio.gather(*(text_of(record) for record in records.values()))
+    ranked = prefilter(
+        dict(zip(records, texts)),
+        scoring_criteria.get("technical", {}),
+        min_required_ratio=request.min_required_ratio,
+    )
+
+    return JSONResponse(content={
+        "message": "Resumes ranked",
+        "ranked": ranked[:request.limit] if request.limit else ranked,
+        "not_found": [resume_id for resume_id in resume_ids if resume_id not in records],
+    })
+
+#api to embed resumes into the shortlist index, e.g. to backfill ones uploaded before it existed
+@app.post("/api/index_resumes")
+async def index_resumes(request: IndexResumesRequest):
+    if resume_index is None:
+        raise HTTPException(status_code=503, detail="Resume index is not available")
+    resume_ids = list(dict.fromkeys(request.resume_ids))
+    records = {
+        record["_id"]: record
+        async for record in resume_collection.find({"_id": {"$in": resume_ids}})
+    }
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    async def index(record):
+        async with semaphore:
+            # Embeds the resumes not yet in this index
+            await get_resume_text(record)
+
+    await asyncio.gather(*(index(record) for record in records.values()))
+    return JSONResponse(content={
+        "message": "Resumes indexed",
+        "indexed": list(records),
+        "not_found": [resume_id for resume_id in resume_ids if resume_id not in records],
+    })
+
+#api to shortlist the resumes most similar to a job description before running the scorer
+@app.post("/api/shortlist_resumes")
+async def shortlist_resumes(request: ShortlistRequest):
+    if resume_index is None:
+        raise HTTPException(status_code=503, detail="Resume index is not available")
+    with timed(IO_SECONDS, system="embedding", operation="shortlist"):
+        shortlist = await asyncio.to_thread(resume_index.shortlist, request.job_description, request.k)
+    return JSONResponse(content={"message": "Resumes shortlisted", "shortlist": shortlist})
+
+#api to size the S3, Mongo and Ollama pools against traffic
+@app.get("/api/pool_stats")
+async def pool_stats():
+    if scorer is None:
+        raise HTTPException(status_code=503, detail="Service is starting")
+    stats = {
+        "s3": s3.pool_stats(),
+        "mongo": mongo.pool_stats.stats(),
+        "ollama": llm_router.stats(),
+        "scheduler": admission.stats(),
+    }
+    for model, router in llm_routers.items():
+        if router is not llm_router:
+            stats[f"ollama:{model}"] = router.stats()
+    if cache_mongo is not None:
+        stats["mongo_llm_cache"] = cache_mongo.pool_stats.stats()
+    return JSONResponse(content=stats)
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/llm_cache/stats")
+async def llm_cache_stats():
+    return JSONResponse(content=llm_cache.stats())
+
+async def check_dependency(check):
+    try:
+        await asyncio.wait_for(check(), timeout=settings.readiness_timeout)
+        return "ok"
+    except Exception as e:
+        return f"error: {e!r}"
+
+def ping_ollama():
+    """Ready while at least one LLM endpoint serves the model"""
+    results = llm_router.check_health()
+    if not any(result == "ok" for result in results.values()):
+        raise RuntimeError(results)
+
+#liveness: the process is up and its event loop is responsive
+@app.get("/healthz")
+async def healthz():
+    return JSONResponse(content={"status": "ok"})
+
+#readiness: resources are initialized and every dependency answers
+@app.get("/readyz")
+async def readyz():
+    if scorer is None:
+        return JSONResponse(status_code=503, content={"status": "starting", "dependencies": {}})
+
+    names = ["mongo", "s3", "ollama"]
+    results = await asyncio.gather(
+        check_dependency(lambda: mongo.get_database("admin").command("ping")),
+        check_dependency(lambda: s3.head_bucket(BUCKET_NAME)),
+        check_dependency(lambda: asyncio.to_thread(ping_ollama)),
+    )
+    dependencies = dict(zip(names, results))
+    ready = all(result == "ok" for result in results)
+    # The shortlist index is optional and does not affect readiness
+    dependencies["vector_index"] = "ok" if resume_index is not None else "disabled"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "degraded", "dependencies": dependencies},
+    )
@@ -38,10 +38,11 @@ if __name__ == "__main__":
     
     # Score the resume
     scoring_criteria = create_default_scoring_criteria()
-    for result in scorer.score_resume(sample_resume, job_description, scoring_criteria):
-        print(f"Criteria: {result}")
+    result = {}
+    for update in scorer.score_resume(sample_resume, job_description, scoring_criteria):
+        print(f"Criteria: {update}")
+        ResumeScorer.merge_update(result, update)
     # result = scorer.score_resume(sample_resume, job_description, scoring_criteria)
-    result = result["generate_feedback"]
     # Display results
     print(f"Final Score: {result['total_score']}/100")
     print(f"Status: {result['pass_fail_status']}")
@@ -0,0 +1,80 @@
+import re
+
+from agents.evaluation import CASCADE_NODE, REJECT_NODE, STRUCTURED_NODE, ResumeScorer, create_default_scoring_criteria
+from benchmarks.fakes import FakeChatModel
+from benchmarks.load_test import DEFAULT_JOB_DESCRIPTION
+from benchmarks.synthetic_resumes import resume_text
+from utils.metrics import SKIPPED_LLM_NODES
+
+
+class FixedScoreChat(FakeChatModel):
+    """Fake that gives every graph-mode criterion ``ratio`` of its max points"""
+    ratio: float = 0.5
+
+    def _reply(self, messages):
+        reply = super()._reply(messages)
+        match = re.search(r"out of ([\d.]+)\s*points", "\n".join(str(message.content) for message in messages))
+        if reply.startswith("The candidate") and match:
+            return f"The candidate matches some criteria.\nScore: {float(match.group(1)) * self.ratio:g}"
+        return reply
+
+
+def score(scorer, **kwargs):
+    result, nodes = {}, []
+    for update in scorer.score_resume(resume_text(1, 3), DEFAULT_JOB_DESCRIPTION, create_default_scoring_criteria(), **kwargs):
+        nodes.extend(update)
+        scorer.merge_update(result, update)
+    return result, nodes
+
+
+def skipped_count():
+    return sum(SKIPPED_LLM_NODES.value(node=node) for node in [
+        "evaluate_experience", "assess_cultural_fit", "calculate_additional_factors", "generate_feedback",
+    ])
+
+
+def cascade_scorer(base_ratio: float, escalation_ratio: float, band: float = 10.0) -> ResumeScorer:
+    large = FixedScoreChat(model="fake-large", latency=0, ratio=escalation_ratio)
+    return ResumeScorer(
+        model_name="fake-small", llm=FixedScoreChat(model="fake-small", latency=0, ratio=base_ratio),
+        escalation_llms={"default": large, STRUCTURED_NODE: large}, cascade_band=band,
+    )
+
+
+def test_escalated_early_reject_leaves_no_skipped_nodes():
+    # 0.05 of the technical points leaves at most 66.75 reachable: rejected
+    # early, but within the band, so the escalation tier scores it in full
+    scorer = cascade_scorer(0.05, 0.9)
+    before = skipped_count()
+    result, nodes = score(scorer, cascade=True, early_reject=True)
+
+    assert REJECT_NODE in nodes and nodes[-1] == CASCADE_NODE
+    assert result["decided_by_tier"] == "escalation"
+    assert result["cascade"]["base"]["pass_fail_status"] == "FAIL"
+    assert result["pass_fail_status"] == "PASS"
+    assert result["skipped_nodes"] == []
+    assert None not in [result[key] for key in ("technical_score", "experience_score", "cultural_fit_score", "additional_score")]
+    # The base tier's reject saved no calls, the escalation tier made them
+    assert skipped_count() == before
+
+
+def test_early_reject_kept_by_base_tier_counts_skipped_nodes():
+    # Far below the band: the base tier's reject is final
+    scorer = cascade_scorer(0.05, 0.9, band=0)
+    before = skipped_count()
+    result, nodes = score(scorer, cascade=True, early_reject=True)
+
+    assert result["decided_by_tier"] == "base"
+    assert result["pass_fail_status"] == "FAIL"
+    assert result["skipped_nodes"] == ["evaluate_experience", "assess_cultural_fit", "calculate_additional_factors"]
+    assert skipped_count() == before + 4
+
+
+def test_escalated_result_has_one_message_per_node():
+    result, nodes = score(cascade_scorer(0.7, 0.9), cascade=True)
+
+    labels = [message["node"] for message in result["messages"]]
+    assert result["decided_by_tier"] == "escalation"
+    assert len(labels) == len(set(labels))
+    # The base tier left the feedback to the escalation tier
+    assert nodes.count("generate_feedback") == 2 and result["detailed_feedback"]["strengths"]
@@ -0,0 +1,68 @@
+from typing import List
+
+import pytest
+
+from agents.evaluation import MESSAGE_LABELS, RESTORED_NODE, SCORING_NODES, ResumeScorer, create_default_scoring_criteria
+from benchmarks.fakes import FakeChatModel
+from benchmarks.load_test import DEFAULT_JOB_DESCRIPTION
+from benchmarks.synthetic_resumes import resume_text
+from utils.checkpointer import ScoringCheckpointer, SqliteCheckpointStore
+
+
+class FlakyChat(FakeChatModel):
+    """Fake that raises on prompts containing ``fail_on`` and records the others"""
+    fail_on: str = ""
+    prompts: List[str] = []
+
+    def _reply(self, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("LLM endpoint down")
+        self.prompts.append(prompt)
+        return super()._reply(messages)
+
+
+def run(scorer, run_id):
+    nodes = []
+    for update in scorer.score_resume(resume_text(1, 3), DEFAULT_JOB_DESCRIPTION, create_default_scoring_criteria(), run_id=run_id):
+        nodes.append((list(update)[0], update))
+    return nodes
+
+
+@pytest.mark.parametrize("fail_on, failed_node", [
+    ("Generate comprehensive feedback", "generate_feedback"),
+    ("Assess cultural fit", "assess_cultural_fit"),
+])
+def test_failed_run_resumes_after_the_last_completed_node(fail_on, failed_node):
+    llm = FlakyChat(latency=0, fail_on=fail_on)
+    store = SqliteCheckpointStore()
+    scorer = ResumeScorer(model_name="fake-chat", llm=llm, checkpointer=ScoringCheckpointer(store))
+    with pytest.raises(RuntimeError):
+        run(scorer, "run-1")
+    assert store.get_checkpoints("run-1", None)
+
+    llm.fail_on, llm.prompts = "", []
+    updates = run(scorer, "run-1")
+    nodes = [node for node, _ in updates]
+    restored = updates[0][1][RESTORED_NODE]
+
+    assert nodes[0] == RESTORED_NODE
+    assert restored["extracted_info"] and "extract_resume_info" not in nodes
+    # Each scoring node is either restored or re-run; a fan-out failure may
+    # cancel siblings before they finish, those re-run too
+    rerun = [node for node in SCORING_NODES if node in nodes]
+    finished = {message["node"] for message in restored.get("messages", [])}
+    for node in SCORING_NODES:
+        assert (MESSAGE_LABELS[node] in finished) != (node in rerun)
+    assert failed_node in nodes and "generate_feedback" in nodes
+    assert len(llm.prompts) == len(rerun) + 1
+    # A finished run leaves no checkpoints behind
+    assert store.get_checkpoints("run-1", None) == []
+
+
+def test_runs_without_a_run_id_are_not_checkpointed():
+    store = SqliteCheckpointStore()
+    scorer = ResumeScorer(model_name="fake-chat", llm=FlakyChat(latency=0, fail_on="Generate comprehensive feedback"), checkpointer=ScoringCheckpointer(store))
+    with pytest.raises(RuntimeError):
+        run(scorer, None)
+    assert store.get_checkpoints(None, None) == []
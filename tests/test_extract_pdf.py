@@ -0,0 +1,11 @@
+from benchmarks.bench_pdf_extraction import build_fixture
+from utils.extract_pdf import PDFExtractor
+
+PDF = "RISHI-JUL_2025.pdf"
+
+
+def test_parallel_extraction_matches_serial():
+    pdf_bytes = build_fixture(PDF, 7)
+    for budgets in ({}, {"max_pages": 5}, {"max_chars": 3000}):
+        serial = PDFExtractor(pdf_bytes, **budgets).extract_text()
+        assert PDFExtractor(pdf_bytes, **budgets).extract_text_parallel(workers=3) == serial
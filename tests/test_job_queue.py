@@ -0,0 +1,93 @@
+import asyncio
+
+from benchmarks.fakes import InMemoryMongo
+from utils.job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue
+
+
+def make_queue(**kwargs) -> JobQueue:
+    return JobQueue(InMemoryMongo().get_database("test")["jobs"], **kwargs)
+
+
+def test_expired_job_is_reclaimed_by_another_worker():
+    async def run():
+        queue = make_queue(visibility_timeout=0, max_attempts=3)
+        job_id = await queue.enqueue("evaluate_resume", {})
+        first = await queue.claim("worker-a")
+        # worker-a died: with a zero visibility timeout the lease is already over
+        second = await queue.claim("worker-b")
+        assert first["_id"] == second["_id"] == job_id
+        assert second["attempts"] == 2 and second["worker_id"] == "worker-b"
+
+        # The lost worker can no longer finish it
+        await queue.complete(job_id, "worker-a", "stale")
+        assert (await queue.get(job_id))["status"] == RUNNING
+        await queue.complete(job_id, "worker-b", "done")
+        job = await queue.get(job_id)
+        assert job["status"] == SUCCEEDED and job["result"] == "done"
+
+    asyncio.run(run())
+
+
+def test_running_job_is_not_claimed_before_its_lease_expires():
+    async def run():
+        queue = make_queue(visibility_timeout=60)
+        await queue.enqueue("evaluate_resume", {})
+        assert await queue.claim("worker-a") is not None
+        assert await queue.claim("worker-b") is None
+
+    asyncio.run(run())
+
+
+def test_failing_handler_is_retried_up_to_max_attempts():
+    async def run():
+        queue = make_queue(visibility_timeout=60, max_attempts=2, retry_backoff=0)
+        job_id = await queue.enqueue("evaluate_resume", {})
+        job = await queue.claim("worker-a")
+        await queue.fail(job, "worker-a", "boom")
+        assert (await queue.get(job_id))["status"] == QUEUED
+
+        job = await queue.claim("worker-a")
+        await queue.fail(job, "worker-a", "boom again")
+        job = await queue.get(job_id)
+        assert job["status"] == FAILED and job["error"] == "boom again"
+        assert await queue.claim("worker-a") is None
+
+    asyncio.run(run())
+
+
+def test_job_whose_worker_keeps_dying_is_failed_after_max_attempts():
+    async def run():
+        queue = make_queue(visibility_timeout=0, max_attempts=2, sweep_interval=0)
+        job_id = await queue.enqueue("evaluate_resume", {})
+        # Two claims whose workers die without calling fail() or complete()
+        assert await queue.claim("worker-a") is not None
+        assert await queue.claim("worker-b") is not None
+
+        assert await queue.claim("worker-c") is None
+        job = await queue.get(job_id)
+        assert job["status"] == FAILED and job["attempts"] == 2
+        assert "all 2 attempts" in job["error"]
+
+    asyncio.run(run())
+
+
+def test_estimated_wait_counts_jobs_queued_for_every_worker_process():
+    async def run():
+        queue = make_queue(visibility_timeout=60)
+        assert await queue.estimated_wait(workers=2, default_service_seconds=10) == (0, 0.0)
+
+        for _ in range(5):
+            await queue.enqueue("evaluate_resume", {})
+        # Two workers, in another process, each running a job that took 4s before
+        for worker_id in ("worker-a", "worker-b"):
+            job = await queue.claim(worker_id)
+        await queue.complete(job["_id"], "worker-b", "done", seconds=4.0)
+        await queue.claim("worker-b")
+
+        queued, wait = await queue.estimated_wait(workers=2, default_service_seconds=10)
+        assert queued == 2
+        # Measured service time, not the default, for the 2 ahead plus this one
+        assert wait == 3 * 4.0 / 2
+
+    asyncio.run(run())
+
@@ -0,0 +1,61 @@
+import asyncio
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.fakes import FakeChatModel
+from utils.llm_router import LLMRouter
+
+MESSAGES = [HumanMessage(content="Summarize this resume")]
+
+
+def make_router(latency: float = 0.05) -> LLMRouter:
+    return LLMRouter(["http://fake"], "fake-chat", client_factory=lambda endpoint, format: FakeChatModel(latency=latency))
+
+
+def upstream_calls(router: LLMRouter) -> int:
+    return sum(endpoint.total for endpoint in router.endpoints)
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    async def run():
+        router = make_router()
+        chat = router.chat_model()
+        results = await asyncio.gather(*(chat.ainvoke(MESSAGES) for _ in range(3)))
+        assert len({result.content for result in results}) == 1
+        assert upstream_calls(router) == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_leader_does_not_fail_joined_callers():
+    async def run():
+        router = make_router()
+        chat = router.chat_model()
+        leader = asyncio.create_task(chat.ainvoke(MESSAGES))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(chat.ainvoke(MESSAGES))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        result = await follower
+        assert leader.cancelled() and result.content
+        # The follower re-issued the call the leader abandoned
+        assert upstream_calls(router) == 2
+        assert not router._async_flights
+
+    asyncio.run(run())
+
+
+def test_streaming_calls_are_not_coalesced():
+    async def run():
+        router = make_router()
+        chat = router.chat_model()
+
+        async def stream():
+            return [event["event"] async for event in chat.astream_events(MESSAGES, version="v2")]
+
+        for events in await asyncio.gather(stream(), stream()):
+            assert "on_chat_model_end" in events
+        assert upstream_calls(router) == 2
+
+    asyncio.run(run())
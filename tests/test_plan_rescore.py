@@ -0,0 +1,75 @@
+import pytest
+
+from agents.evaluation import NODE_ORDER, SCORING_NODES, ResumeScorer, create_default_scoring_criteria
+from benchmarks.load_test import DEFAULT_JOB_DESCRIPTION
+from benchmarks.synthetic_resumes import resume_text
+
+RESUME = resume_text(1, 3)
+DOWNSTREAM = ["compute_final_score", "generate_feedback"]
+
+
+def previous(**overrides):
+    return {
+        "resume_text": RESUME,
+        "job_description": DEFAULT_JOB_DESCRIPTION,
+        "scoring_criteria": create_default_scoring_criteria(),
+        **overrides,
+    }
+
+
+def plan(resume=RESUME, job_description=DEFAULT_JOB_DESCRIPTION, scoring_criteria=None, earlier=None, **kwargs):
+    return ResumeScorer.plan_rescore(
+        earlier or previous(), resume, job_description, scoring_criteria or create_default_scoring_criteria(), **kwargs,
+    )
+
+
+def changed_criteria(section, key, value):
+    criteria = create_default_scoring_criteria()
+    if isinstance(criteria[section], dict):
+        criteria[section][key] = value
+    else:
+        criteria[section] = value
+    return criteria
+
+
+def test_unchanged_inputs_rerun_nothing():
+    assert plan() == []
+
+
+def test_new_job_description_rescores_every_criterion_but_keeps_the_extraction():
+    assert plan(job_description=DEFAULT_JOB_DESCRIPTION + "\nKubernetes is a plus.") == [*SCORING_NODES, *DOWNSTREAM]
+
+
+@pytest.mark.parametrize("section, node", [
+    ("technical", "analyze_technical_qualifications"),
+    ("experience", "evaluate_experience"),
+    ("cultural_fit", "assess_cultural_fit"),
+    ("additional", "calculate_additional_factors"),
+])
+def test_changed_criterion_rescores_only_its_node(section, node):
+    assert plan(scoring_criteria=changed_criteria(section, "max_points", 99)) == [node, *DOWNSTREAM]
+
+
+def test_new_pass_threshold_only_recomputes_the_total():
+    assert plan(scoring_criteria=changed_criteria("pass_threshold", None, 55)) == DOWNSTREAM
+
+
+def test_edited_resume_section_rescores_the_nodes_that_read_it():
+    edited = RESUME.replace("MS in Data Science", "PhD in Data Science")
+    assert plan(resume=edited) == ["extract_resume_info", "calculate_additional_factors", *DOWNSTREAM]
+
+
+def test_resume_without_sections_reruns_everything():
+    earlier = previous(resume_text="Jordan Haddad, data analyst since 2014")
+    assert plan(earlier=earlier) == NODE_ORDER
+
+
+def test_new_scoring_mode_rescores_every_criterion():
+    assert plan(mode="structured") == [*SCORING_NODES, *DOWNSTREAM]
+    assert plan(earlier=previous(mode="structured"), mode="structured") == []
+
+
+def test_nodes_an_early_reject_skipped_are_scored_on_rescore():
+    skipped = ["evaluate_experience", "assess_cultural_fit", "calculate_additional_factors"]
+    earlier = previous(early_reject=True, skipped_nodes=skipped)
+    assert plan(earlier=earlier, early_reject=True) == [*skipped, *DOWNSTREAM]
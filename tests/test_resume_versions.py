@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fakes import InMemoryMongo
+from utils.resume_versions import ResumeVersions
+
+TEXT = "Jane Doe\njane@example.com\nSkills\nPython, SQL\n"
+
+
+async def make_versions(latency: float = 0.0) -> ResumeVersions:
+    versions = ResumeVersions(InMemoryMongo(latency).get_database("test")["resumes"])
+    await versions.create_indexes()
+    return versions
+
+
+async def upload(versions: ResumeVersions, count: int):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    records = [{"_id": f"resume-{index}", "upload_time": start + timedelta(days=index)} for index in range(count)]
+    for record in records:
+        await versions.collection.insert_one(record)
+    return records
+
+
+def test_versions_follow_upload_order_not_processing_order():
+    async def run():
+        versions = await make_versions()
+        first, second, third = await upload(versions, 3)
+        # The newest upload is processed first
+        for record in (third, first, second):
+            await versions.link(record, TEXT)
+
+        listed = await versions.versions(third["candidate_id"])
+        assert [(item["_id"], item["version"], item["previous_version_id"]) for item in listed] == [
+            ("resume-0", 1, None), ("resume-1", 2, "resume-0"), ("resume-2", 3, "resume-1"),
+        ]
+        assert (second["version"], second["previous_version_id"]) == (2, "resume-0")
+
+    asyncio.run(run())
+
+
+def test_concurrent_links_never_share_a_version():
+    async def run():
+        versions = await make_versions(latency=0.001)
+        records = await upload(versions, 4)
+        await asyncio.gather(*(versions.link(record, TEXT) for record in reversed(records)))
+
+        listed = await versions.versions(records[0]["candidate_id"])
+        assert [item["version"] for item in listed] == [1, 2, 3, 4]
+        assert [item["_id"] for item in listed] == [record["_id"] for record in records]
+
+    asyncio.run(run())
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from utils.scheduler import AdmissionScheduler, Overloaded
+
+
+def test_backlog_beyond_the_deadline_is_shed():
+    scheduler = AdmissionScheduler(max_concurrency=1, max_queue=10)
+    scheduler.check_backlog("interactive", queued=3, wait=20.0, max_wait=30.0)
+    with pytest.raises(Overloaded) as deadline:
+        scheduler.check_backlog("interactive", queued=3, wait=40.0, max_wait=30.0)
+    assert deadline.value.status_code == 503 and deadline.value.retry_after == 40
+    with pytest.raises(Overloaded) as full:
+        scheduler.check_backlog("interactive", queued=10, wait=0.0, max_wait=30.0)
+    assert full.value.status_code == 429
+
+
+async def queue_waiter(scheduler: AdmissionScheduler, priority: str, max_wait=None) -> asyncio.Task:
+    task = asyncio.create_task(scheduler.acquire(priority, max_wait))
+    # Let it reach the wait queue
+    await asyncio.sleep(0)
+    return task
+
+
+def test_full_queue_displaces_the_newest_lower_priority_waiter():
+    async def run():
+        scheduler = AdmissionScheduler(max_concurrency=1, max_queue=2)
+        await scheduler.acquire("interactive")
+        older_batch = await queue_waiter(scheduler, "batch")
+        newer_batch = await queue_waiter(scheduler, "batch")
+
+        interactive = await queue_waiter(scheduler, "interactive")
+        with pytest.raises(Overloaded) as displaced:
+            await newer_batch
+        assert displaced.value.reason == "displaced" and displaced.value.status_code == 503
+        assert not older_batch.done()
+
+        # The interactive request goes ahead of the batch one that queued first
+        scheduler.release()
+        await interactive
+        assert not older_batch.done()
+        scheduler.release()
+        await older_batch
+        assert scheduler.rejected == {"interactive": 0, "batch": 1}
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_a_newcomer_nobody_can_make_room_for():
+    async def run():
+        scheduler = AdmissionScheduler(max_concurrency=1, max_queue=1)
+        await scheduler.acquire("interactive")
+        waiter = await queue_waiter(scheduler, "interactive")
+        with pytest.raises(Overloaded) as full:
+            await scheduler.acquire("batch")
+        assert full.value.reason == "queue_full" and full.value.status_code == 429
+        waiter.cancel()
+
+    asyncio.run(run())
+
+
+def test_waiter_that_outlives_its_deadline_times_out_and_leaves_the_queue():
+    async def run():
+        scheduler = AdmissionScheduler(max_concurrency=1, max_queue=4)
+        await scheduler.acquire("interactive")
+        with pytest.raises(Overloaded) as timeout:
+            await scheduler.acquire("interactive", max_wait=0.01)
+        assert timeout.value.reason == "timeout"
+        assert scheduler.queued() == 0
+
+        # The slot goes back to the pool instead of to the abandoned waiter
+        scheduler.release()
+        assert scheduler.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_request_whose_estimated_wait_exceeds_its_deadline_is_shed_on_arrival():
+    async def run():
+        scheduler = AdmissionScheduler(max_concurrency=1, max_queue=4, default_service_seconds=10.0)
+        await scheduler.acquire("interactive")
+        with pytest.raises(Overloaded) as deadline:
+            await scheduler.acquire("interactive", max_wait=5.0)
+        assert deadline.value.reason == "deadline" and deadline.value.retry_after == 10
+        assert scheduler.queued() == 0
+
+    asyncio.run(run())
+
+
+def test_waiter_displaced_as_its_deadline_passes_is_rejected(monkeypatch):
+    async def late_wait_for(awaitable, timeout):
+        # The queue settles the waiter in the same tick the deadline fires
+        try:
+            await awaitable
+        except Overloaded:
+            pass
+        raise asyncio.TimeoutError
+
+    async def run():
+        scheduler = AdmissionScheduler(max_concurrency=1, max_queue=1)
+        await scheduler.acquire("interactive")
+        batch = await queue_waiter(scheduler, "batch", max_wait=30.0)
+        interactive = await queue_waiter(scheduler, "interactive")
+        with pytest.raises(Overloaded) as displaced:
+            await batch
+        assert displaced.value.reason == "displaced"
+
+        scheduler.release()
+        await interactive
+        assert scheduler.admitted["batch"] == 0 and scheduler.in_flight == 1
+
+    monkeypatch.setattr(asyncio, "wait_for", late_wait_for)
+    asyncio.run(run())
@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from benchmarks.load_test import install_fake_resources
+from benchmarks.synthetic_resumes import corpus
+from utils.vector_index import NumpyVectorIndex, ResumeIndex
+
+ARGS = argparse.Namespace(
+    io_latency=0.0, pdf_workers=1, llm_hosts=0, host_capacity=0, llm_latency=0.0, tokens_per_second=0.0,
+    mode="graph", checkpoints=False, admission_concurrency=0, admission_queue=64,
+)
+
+
+def run_service(test):
+    """Run ``test(service, client, s3_reads)`` against the app on in-memory stand-ins"""
+    async def run():
+        service = install_fake_resources(ARGS, concurrency=2)
+        service.pdf_executor.shutdown()
+        service.pdf_executor = ThreadPoolExecutor(max_workers=1)
+        reads = []
+        get_object = service.s3.get_object
+
+        async def counted_get_object(bucket_name, object_name):
+            reads.append(object_name)
+            return await get_object(bucket_name, object_name)
+
+        service.s3.get_object = counted_get_object
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=service.app), base_url="http://test") as client:
+                await test(service, client, reads)
+        finally:
+            await service.close_resources()
+
+    asyncio.run(run())
+
+
+async def upload(client, pdfs):
+    resume_ids = []
+    for index, pdf in enumerate(pdfs):
+        response = await client.post("/api/upload_resume", files={"file": (f"resume_{index}.pdf", pdf, "application/pdf")})
+        resume_ids.append(response.json()["resume_id"])
+    return resume_ids
+
+
+def test_prefilter_parses_each_resume_once():
+    async def test(service, client, reads):
+        resume_ids = await upload(client, corpus(2, seed=7))
+        for _ in range(2):
+            response = await client.post("/api/prefilter_resumes", json={"resume_ids": resume_ids, "min_required_ratio": 0})
+            assert len(response.json()["ranked"]) == 2
+        assert len(reads) == 2
+        record = await service.resume_collection.find_one({"_id": resume_ids[0]})
+        assert record["extracted_text"]
+
+    run_service(test)
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    calls: int = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return super().embed_documents(texts)
+
+
+def test_resumes_are_embedded_once_per_index():
+    async def test(service, client, reads):
+        embeddings = CountingEmbeddings(size=8)
+        service.resume_index = ResumeIndex(embeddings, NumpyVectorIndex())
+        resume_ids = await upload(client, corpus(2, seed=8))
+        await client.post("/api/prefilter_resumes", json={"resume_ids": resume_ids, "min_required_ratio": 0})
+        await client.post("/api/index_resumes", json={"resume_ids": resume_ids})
+        await client.post("/api/prefilter_resumes", json={"resume_ids": resume_ids, "min_required_ratio": 0})
+        assert embeddings.calls == 2
+
+        # A new index, e.g. the in-process one after a restart, embeds them again
+        service.resume_index = ResumeIndex(embeddings, NumpyVectorIndex())
+        await client.post("/api/index_resumes", json={"resume_ids": resume_ids})
+        assert embeddings.calls == 4
+        shortlist = (await client.post("/api/shortlist_resumes", json={"job_description": "Python", "k": 5})).json()["shortlist"]
+        assert {item["resume_id"] for item in shortlist} == set(resume_ids)
+
+    run_service(test)
+
+
+def test_resume_diff_reads_only_stored_text():
+    async def test(service, client, reads):
+        old_id, new_id = await upload(client, corpus(2, seed=11))
+        response = await client.get(f"/api/resumes/{new_id}/diff", params={"against": old_id})
+        assert response.status_code == 409
+        assert reads == []
+
+        await client.post("/api/prefilter_resumes", json={"resume_ids": [new_id], "min_required_ratio": 0})
+        response = await client.get(f"/api/resumes/{new_id}/diff", params={"against": old_id})
+        assert response.status_code == 409
+        assert len(reads) == 1
+
+        await client.post("/api/prefilter_resumes", json={"resume_ids": [old_id], "min_required_ratio": 0})
+        response = await client.get(f"/api/resumes/{new_id}/diff", params={"against": old_id})
+        assert response.status_code == 200
+        assert response.json()["sections"]
+        assert len(reads) == 2
+
+    run_service(test)
@@ -0,0 +1,27 @@
+import pytest
+
+from utils.skill_matcher import SkillMatcher
+
+SKILLS = ["Computer Vision", "TypeScript", "TensorFlow", "Deep Learning", "Node.js", "Artificial Intelligence", "Docker"]
+
+
+@pytest.mark.parametrize("text", [
+    "Please find my CV attached.",
+    "Led the TS/SCI cleared analytics team.",
+    "Managed TF-IDF search tuning and DL shipping routes.",
+    "Each node in the supply chain was audited.",
+    "Contact: A.I. Smith, AI team lead assistant.",
+    "Experience with containerization and virtual machines.",
+])
+def test_ambiguous_aliases_do_not_match_free_text(text):
+    assert SkillMatcher(SKILLS).find(text) == set()
+
+
+def test_ambiguous_aliases_match_in_the_skills_section():
+    text = "Jane Doe\nSummary\nSent my CV to many teams.\nSkills\nTS, Node, CV, TF, DL, AI\n"
+    assert SkillMatcher(SKILLS).find(text) == set(SKILLS) - {"Docker"}
+
+
+def test_full_names_and_unambiguous_aliases_match_anywhere():
+    text = "Built computer vision models in TypeScript and nodejs, shipped with a Dockerfile."
+    assert SkillMatcher(SKILLS).find(text) == {"Computer Vision", "TypeScript", "Node.js", "Docker"}
@@ -0,0 +1,292 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+
+class MongoCheckpointStore:
+    """Checkpoint rows in two Mongo collections.
+
+    Old rows are removed by TTL indexes on ``created_at``; runs that finish
+    delete their own rows, so only failed or interrupted ones wait for it.
+    """
+    def __init__(self, checkpoints, writes, ttl_seconds: int):
+        self.checkpoints = checkpoints
+        self.writes = writes
+        self.ttl_seconds = ttl_seconds
+        self._index_created = False
+
+    def _create_indexes(self):
+        if not self._index_created:
+            for collection in (self.checkpoints, self.writes):
+                collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+                collection.create_index([("thread_id", ASCENDING), ("checkpoint_ns", ASCENDING), ("checkpoint_id", DESCENDING)])
+            self._index_created = True
+
+    def put_checkpoint(self, row: Dict[str, Any]):
+        self._create_indexes()
+        key = {field: row[field] for field in ("thread_id", "checkpoint_ns", "checkpoint_id")}
+        self.checkpoints.replace_one(key, {**row, "created_at": _utcnow()}, upsert=True)
+
+    def get_checkpoints(self, thread_id: Optional[str], checkpoint_ns: Optional[str], checkpoint_id: Optional[str] = None, before: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query: Dict[str, Any] = {}
+        if thread_id is not None:
+            query["thread_id"] = thread_id
+        if checkpoint_ns is not None:
+            query["checkpoint_ns"] = checkpoint_ns
+        if checkpoint_id is not None:
+            query["checkpoint_id"] = checkpoint_id
+        elif before is not None:
+            query["checkpoint_id"] = {"$lt": before}
+        cursor = self.checkpoints.find(query, {"_id": 0}).sort([("checkpoint_id", DESCENDING)])
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    def put_writes(self, rows: List[Dict[str, Any]], replace: bool):
+        self._create_indexes()
+        operations = []
+        for row in rows:
+            key = {field: row[field] for field in ("thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx")}
+            update = {"$set": {**row, "created_at": _utcnow()}} if replace else {"$setOnInsert": {**row, "created_at": _utcnow()}}
+            operations.append(UpdateOne(key, update, upsert=True))
+        if operations:
+            self.writes.bulk_write(operations, ordered=False)
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Dict[str, Any]]:
+        query = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}
+        return list(self.writes.find(query, {"_id": 0}).sort([("task_id", ASCENDING), ("idx", ASCENDING)]))
+
+    def delete_thread(self, thread_id: str):
+        self.checkpoints.delete_many({"thread_id": thread_id})
+        self.writes.delete_many({"thread_id": thread_id})
+
+
+class SqliteCheckpointStore:
+    """Checkpoint rows in a SQLite file, or in memory with ``":memory:"``.
+
+    Meant for local runs and tests. Rows older than ``ttl_seconds`` are
+    pruned every few hundred writes.
+    """
+    def __init__(self, path: str = ":memory:", ttl_seconds: int = 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._writes = 0
+        # Checkpoints are written from the event loop and from LangGraph's executor threads
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, parent_checkpoint_id TEXT,
+                    checkpoint_type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB, created_at REAL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                );
+                CREATE TABLE IF NOT EXISTS writes (
+                    thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, task_id TEXT, idx INTEGER,
+                    task_path TEXT, channel TEXT, value_type TEXT, value BLOB, created_at REAL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                );
+                CREATE INDEX IF NOT EXISTS checkpoints_created_at ON checkpoints (created_at);
+                CREATE INDEX IF NOT EXISTS writes_created_at ON writes (created_at);
+            """)
+
+    CHECKPOINT_FIELDS = (
+        "thread_id", "checkpoint_ns", "checkpoint_id", "parent_checkpoint_id",
+        "checkpoint_type", "checkpoint", "metadata_type", "metadata",
+    )
+    WRITE_FIELDS = ("thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx", "task_path", "channel", "value_type", "value")
+
+    def _written(self):
+        self._writes += 1
+        if self._writes % 200 == 0:
+            self.prune()
+
+    def put_checkpoint(self, row: Dict[str, Any]):
+        with self._lock, self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO checkpoints ({', '.join(self.CHECKPOINT_FIELDS)}, created_at) VALUES ({', '.join('?' * (len(self.CHECKPOINT_FIELDS) + 1))})",
+                [row[field] for field in self.CHECKPOINT_FIELDS] + [time.time()],
+            )
+        self._written()
+
+    def get_checkpoints(self, thread_id: Optional[str], checkpoint_ns: Optional[str], checkpoint_id: Optional[str] = None, before: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        for field, value, operator in (
+            ("thread_id", thread_id, "="), ("checkpoint_ns", checkpoint_ns, "="),
+            ("checkpoint_id", checkpoint_id, "="), ("checkpoint_id", None if checkpoint_id else before, "<"),
+        ):
+            if value is not None:
+                clauses.append(f"{field} {operator} ?")
+                params.append(value)
+        query = f"SELECT {', '.join(self.CHECKPOINT_FIELDS)} FROM checkpoints"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self.connection.execute(query, params).fetchall()
+        return [dict(zip(self.CHECKPOINT_FIELDS, row)) for row in rows]
+
+    def put_writes(self, rows: List[Dict[str, Any]], replace: bool):
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with self._lock, self.connection:
+            self.connection.executemany(
+                f"{verb} INTO writes ({', '.join(self.WRITE_FIELDS)}, created_at) VALUES ({', '.join('?' * (len(self.WRITE_FIELDS) + 1))})",
+                [[row[field] for field in self.WRITE_FIELDS] + [time.time()] for row in rows],
+            )
+        self._written()
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(self.WRITE_FIELDS)} FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchall()
+        return [dict(zip(self.WRITE_FIELDS, row)) for row in rows]
+
+    def delete_thread(self, thread_id: str):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self.connection.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    def prune(self):
+        """Drop rows older than ttl_seconds"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM checkpoints WHERE created_at < ?", (cutoff,))
+            self.connection.execute("DELETE FROM writes WHERE created_at < ?", (cutoff,))
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ScoringCheckpointer(BaseCheckpointSaver[str]):
+    """LangGraph checkpoint saver on top of a Mongo or SQLite checkpoint store.
+
+    Each checkpoint is stored whole, channel values included; a scoring run
+    only has a handful of them and its state is small. Async methods run the
+    blocking store in a thread, like the LLM cache's persistent tier.
+    """
+    def __init__(self, store, serde=None):
+        super().__init__(serde=serde)
+        self.store = store
+
+    def _tuple(self, row: Dict[str, Any]) -> CheckpointTuple:
+        config = {"configurable": {
+            "thread_id": row["thread_id"], "checkpoint_ns": row["checkpoint_ns"], "checkpoint_id": row["checkpoint_id"],
+        }}
+        writes = self.store.get_writes(row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"])
+        return CheckpointTuple(
+            config=config,
+            checkpoint=self.serde.loads_typed((row["checkpoint_type"], row["checkpoint"])),
+            metadata=self.serde.loads_typed((row["metadata_type"], row["metadata"])),
+            parent_config=(
+                {"configurable": {**config["configurable"], "checkpoint_id": row["parent_checkpoint_id"]}}
+                if row["parent_checkpoint_id"] else None
+            ),
+            pending_writes=[
+                (write["task_id"], write["channel"], self.serde.loads_typed((write["value_type"], write["value"])))
+                for write in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        rows = self.store.get_checkpoints(
+            configurable["thread_id"], configurable.get("checkpoint_ns", ""), get_checkpoint_id(config), limit=1,
+        )
+        return self._tuple(rows[0]) if rows else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None, before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        configurable = (config or {}).get("configurable", {})
+        rows = self.store.get_checkpoints(
+            configurable.get("thread_id"), configurable.get("checkpoint_ns"), get_checkpoint_id(config) if config else None,
+            before=get_checkpoint_id(before) if before else None,
+            # Metadata filters are applied here, so the limit can only be pushed down without one
+            limit=None if filter else limit,
+        )
+        for row in rows:
+            checkpoint = self._tuple(row)
+            if filter and not all(checkpoint.metadata.get(key) == value for key, value in filter.items()):
+                continue
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield checkpoint
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        configurable = config["configurable"]
+        checkpoint_type, checkpoint_bytes = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_bytes = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        self.store.put_checkpoint({
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": configurable.get("checkpoint_id"),
+            "checkpoint_type": checkpoint_type,
+            "checkpoint": checkpoint_bytes,
+            "metadata_type": metadata_type,
+            "metadata": metadata_bytes,
+        })
+        return {"configurable": {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": checkpoint["id"],
+        }}
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        configurable = config["configurable"]
+        rows = []
+        for index, (channel, value) in enumerate(writes):
+            value_type, value_bytes = self.serde.dumps_typed(value)
+            rows.append({
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": configurable["checkpoint_id"],
+                "task_id": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, index),
+                "task_path": task_path,
+                "channel": channel,
+                "value_type": value_type,
+                "value": value_bytes,
+            })
+        # Regular writes are kept on retries; special ones (errors, interrupts) are overwritten
+        self.store.put_writes(rows, replace=all(channel in WRITES_IDX_MAP for channel, _ in writes))
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.store.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None, before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -16,6 +16,60 @@ class Settings(BaseSettings):
     postgres_username: str = Field(..., env="POSTGRES_USERNAME")
     postgres_password: str = Field(..., env="POSTGRES_PASSWORD")
     llm_url_ollama: Optional[str] = Field(..., env="OLLAMA_URI")
+    pdf_workers: int = Field(2, env="PDF_WORKERS")
+    pdf_max_pages: int = Field(20, env="PDF_MAX_PAGES")
+    pdf_max_chars: int = Field(100_000, env="PDF_MAX_CHARS")
+    batch_max_concurrency: int = Field(8, env="BATCH_MAX_CONCURRENCY")
+    llm_max_retries: int = Field(2, env="LLM_MAX_RETRIES")
+    llm_retry_backoff: float = Field(1.0, env="LLM_RETRY_BACKOFF")
+    job_workers: int = Field(2, env="JOB_WORKERS")  # in-process workers, 0 to only run worker.py
+    job_capacity: int = Field(0, env="JOB_CAPACITY")  # workers across all processes, 0 for job_workers
+    job_visibility_timeout: int = Field(300, env="JOB_VISIBILITY_TIMEOUT")
+    job_max_attempts: int = Field(3, env="JOB_MAX_ATTEMPTS")
+    job_retry_backoff: float = Field(5.0, env="JOB_RETRY_BACKOFF")
+    s3_multipart_threshold: int = Field(8 * 1024 * 1024, env="S3_MULTIPART_THRESHOLD")
+    s3_multipart_chunksize: int = Field(8 * 1024 * 1024, env="S3_MULTIPART_CHUNKSIZE")
+    llm_cache_backend: str = Field("mongo", env="LLM_CACHE_BACKEND")  # mongo, disk or memory
+    llm_cache_dir: str = Field(".llm_cache", env="LLM_CACHE_DIR")
+    llm_cache_max_entries: int = Field(1024, env="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_ttl_seconds: int = Field(7 * 24 * 3600, env="LLM_CACHE_TTL_SECONDS")
+    vector_backend: str = Field("qdrant", env="VECTOR_BACKEND")  # qdrant or numpy
+    embedding_model: str = Field("nomic-embed-text", env="EMBEDDING_MODEL")
+    readiness_timeout: float = Field(2.0, env="READINESS_TIMEOUT")
+    s3_max_pool_connections: int = Field(50, env="S3_MAX_POOL_CONNECTIONS")
+    s3_connect_timeout: float = Field(5.0, env="S3_CONNECT_TIMEOUT")
+    s3_read_timeout: float = Field(60.0, env="S3_READ_TIMEOUT")
+    s3_max_attempts: int = Field(3, env="S3_MAX_ATTEMPTS")
+    mongo_max_pool_size: int = Field(100, env="MONGO_MAX_POOL_SIZE")
+    mongo_min_pool_size: int = Field(0, env="MONGO_MIN_POOL_SIZE")
+    mongo_max_idle_time_ms: int = Field(60_000, env="MONGO_MAX_IDLE_TIME_MS")
+    mongo_connect_timeout_ms: int = Field(5_000, env="MONGO_CONNECT_TIMEOUT_MS")
+    mongo_server_selection_timeout_ms: int = Field(5_000, env="MONGO_SERVER_SELECTION_TIMEOUT_MS")
+    mongo_wait_queue_timeout_ms: int = Field(10_000, env="MONGO_WAIT_QUEUE_TIMEOUT_MS")
+    llm_max_connections: int = Field(8, env="LLM_MAX_CONNECTIONS")
+    llm_connect_timeout: float = Field(5.0, env="LLM_CONNECT_TIMEOUT")
+    llm_read_timeout: float = Field(300.0, env="LLM_READ_TIMEOUT")
+    llm_connect_retries: int = Field(2, env="LLM_CONNECT_RETRIES")
+    llm_urls_ollama: str = Field("", env="OLLAMA_URIS")  # comma separated, overrides OLLAMA_URI
+    llm_keep_alive: str = Field("30m", env="LLM_KEEP_ALIVE")
+    llm_eject_failures: int = Field(3, env="LLM_EJECT_FAILURES")
+    llm_eject_seconds: float = Field(30.0, env="LLM_EJECT_SECONDS")
+    llm_slow_factor: float = Field(3.0, env="LLM_SLOW_FACTOR")
+    llm_health_interval: float = Field(15.0, env="LLM_HEALTH_INTERVAL")
+    admission_max_concurrency: int = Field(8, env="ADMISSION_MAX_CONCURRENCY")  # evaluations scored at once per process
+    admission_max_queue: int = Field(64, env="ADMISSION_MAX_QUEUE")
+    admission_interactive_wait: float = Field(30.0, env="ADMISSION_INTERACTIVE_WAIT")  # longest queueing before a 503
+    admission_batch_wait: float = Field(300.0, env="ADMISSION_BATCH_WAIT")
+    checkpoint_backend: str = Field("mongo", env="CHECKPOINT_BACKEND")  # mongo, sqlite, memory or none
+    checkpoint_path: str = Field(".checkpoints.sqlite", env="CHECKPOINT_PATH")
+    checkpoint_ttl_seconds: int = Field(24 * 3600, env="CHECKPOINT_TTL_SECONDS")
+    prompt_resume_tokens: int = Field(3000, env="PROMPT_RESUME_TOKENS")  # resume text sent for extraction
+    prompt_job_tokens: int = Field(600, env="PROMPT_JOB_TOKENS")
+    prompt_resume_info_tokens: int = Field(1500, env="PROMPT_RESUME_INFO_TOKENS")  # extracted info sent for scoring
+    prompt_feedback_tokens: int = Field(400, env="PROMPT_FEEDBACK_TOKENS")  # node reasoning summary sent for feedback
+    scorer_node_models: str = Field("", env="SCORER_NODE_MODELS")  # node=model, comma separated, e.g. generate_feedback=gemma3:4b
+    cascade_model: str = Field("", env="CASCADE_MODEL")  # escalation tier of cascade scoring, empty to disable it
+    cascade_band: float = Field(10.0, env="CASCADE_BAND")  # points around pass_threshold that escalate
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,84 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+SCORE_FIELDS = ["total_score", "technical_score", "experience_score", "cultural_fit_score", "additional_score"]
+
+# What ranking queries return; the feedback text is opt-in and the resume text is never stored here
+RANKING_PROJECTION = {
+    "_id": 0, "resume_id": 1, "filename": 1, "upload_time": 1, "evaluated_at": 1,
+    "pass_fail_status": 1, "mode": 1, "trace_id": 1, "skipped_nodes": 1, "decided_by_tier": 1, **{field: 1 for field in SCORE_FIELDS},
+}
+
+
+def job_key(job_description: str) -> str:
+    """Stable job id for evaluations submitted without one"""
+    return hashlib.sha256(job_description.strip().encode("utf-8")).hexdigest()[:16]
+
+
+class EvaluationStore:
+    """Latest evaluation of each resume per job, kept small enough to rank in an index.
+
+    One document per (job_id, resume_id) holds the scores, the pass/fail
+    status and the feedback; re-scoring a resume for the same job replaces it.
+    """
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def create_indexes(self):
+        # Top-k per job walks the first two indexes in order instead of sorting
+        await self.collection.create_index([("job_id", 1), ("total_score", -1)])
+        await self.collection.create_index([("job_id", 1), ("pass_fail_status", 1), ("total_score", -1)])
+        await self.collection.create_index([("job_id", 1), ("upload_time", -1)])
+        await self.collection.create_index("resume_id")
+
+    @staticmethod
+    def document(job_id: str, record: Dict[str, Any], result: Dict[str, Any], mode: str) -> Dict[str, Any]:
+        document = {
+            "job_id": job_id,
+            "resume_id": record["_id"],
+            "filename": record.get("filename"),
+            "upload_time": record.get("upload_time"),
+            "evaluated_at": datetime.now(timezone.utc),
+            "pass_fail_status": result.get("pass_fail_status"),
+            "detailed_feedback": result.get("detailed_feedback"),
+            "recommendations": result.get("recommendations"),
+            "mode": mode,
+            "trace_id": result.get("trace_id"),
+            # Criteria an early reject left unscored; total_score only covers the rest
+            "skipped_nodes": result.get("skipped_nodes") or [],
+            # Cascade runs only; with cascade.base it gives the agreement rate of the tiers
+            "decided_by_tier": result.get("decided_by_tier"),
+            "cascade": result.get("cascade"),
+        }
+        for field in SCORE_FIELDS:
+            document[field] = result.get(field)
+        return document
+
+    @staticmethod
+    def _key(document: Dict[str, Any]) -> Dict[str, str]:
+        return {"_id": f"{document['job_id']}:{document['resume_id']}"}
+
+    async def save(self, document: Dict[str, Any]):
+        await self.collection.update_one(self._key(document), {"$set": document}, upsert=True)
+
+    async def save_many(self, documents: List[Dict[str, Any]]):
+        """Upsert many evaluations in one round-trip"""
+        if documents:
+            await self.collection.bulk_write(
+                [UpdateOne(self._key(document), {"$set": document}, upsert=True) for document in documents],
+                ordered=False,
+            )
+
+    async def top(self, job_id: str, k: int = 10, status: Optional[str] = None, include_feedback: bool = False) -> List[Dict[str, Any]]:
+        """Best ``k`` evaluations for a job, optionally only PASS or FAIL ones"""
+        query = {"job_id": job_id}
+        if status is not None:
+            query["pass_fail_status"] = status
+        projection = dict(RANKING_PROJECTION)
+        if include_feedback:
+            projection.update({"detailed_feedback": 1, "recommendations": 1})
+        cursor = self.collection.find(query, projection).sort([("total_score", -1)]).limit(k)
+        return await cursor.to_list(length=k)
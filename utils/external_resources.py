@@ -1,6 +1,51 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import boto3
-from pymongo import MongoClient
+import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.monitoring import CommandListener, ConnectionPoolListener
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.config import settings
+from utils.metrics import IO_SECONDS, record_span
+
+class UsageCounter:
+    """Thread-safe in-flight/peak/total counter for pool utilization stats"""
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            self.in_flight += 1
+            self.total += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self, failed=False):
+        with self._lock:
+            self.in_flight -= 1
+            self.errors += failed
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "total": self.total,
+                "errors": self.errors,
+            }
+        if self.capacity:
+            stats["capacity"] = self.capacity
+            stats["utilization"] = round(stats["in_flight"] / self.capacity, 3)
+        return stats
 
 class S3Client:
     def __init__(self):
@@ -9,6 +54,18 @@ class S3Client:
             endpoint_url=settings.s3_url,
             aws_access_key_id=settings.s3_access_key,
             aws_secret_access_key=settings.s3_secret_key,
+            config=Config(
+                max_pool_connections=settings.s3_max_pool_connections,
+                connect_timeout=settings.s3_connect_timeout,
+                read_timeout=settings.s3_read_timeout,
+                retries={"max_attempts": settings.s3_max_attempts, "mode": "standard"},
+                tcp_keepalive=True,
+            ),
+        )
+        # Files above the threshold go up as multipart uploads in bounded chunks
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.s3_multipart_threshold,
+            multipart_chunksize=settings.s3_multipart_chunksize,
         )
 
     def upload_file(self, file_path, bucket_name, object_name):
@@ -17,22 +74,243 @@ class S3Client:
     def download_file(self, bucket_name, object_name, file_path):
         self.client.download_file(bucket_name, object_name, file_path)
 
+    def upload_fileobj(self, fileobj, bucket_name, object_name, content_type=None):
+        """Stream a file-like object to S3 without staging it on disk"""
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.client.upload_fileobj(
+            fileobj, bucket_name, object_name,
+            ExtraArgs=extra_args, Config=self.transfer_config,
+        )
+
+    def get_object(self, bucket_name, object_name) -> bytes:
+        """Read an object straight into memory"""
+        response = self.client.get_object(Bucket=bucket_name, Key=object_name)
+        with response["Body"] as body:
+            return body.read()
+
     def list_buckets(self):
         return self.client.list_buckets()
 
+    def head_bucket(self, bucket_name):
+        return self.client.head_bucket(Bucket=bucket_name)
+
+class PoolStatsListener(ConnectionPoolListener):
+    """Tracks Mongo connection pool usage from pymongo's CMAP events"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.open_connections = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.check_out_failures = 0
+        self.pool_clears = 0
+        self._lock = threading.Lock()
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.check_out_failures += 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "utilization": round(self.checked_out / self.capacity, 3),
+                "check_out_failures": self.check_out_failures,
+                "pool_clears": self.pool_clears,
+            }
+
+class CommandTimer(CommandListener):
+    """Records the duration of every Mongo command in the IO metrics and timing breakdown"""
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._observe(event)
+
+    def failed(self, event):
+        self._observe(event)
+
+    @staticmethod
+    def _observe(event):
+        seconds = event.duration_micros / 1e6
+        IO_SECONDS.observe(seconds, system="mongo", operation=event.command_name)
+        record_span(f"mongo.{event.command_name}", seconds)
+
+def mongo_client_options(listener):
+    """Pool sizing, timeouts and retries shared by the sync and async Mongo clients"""
+    return {
+        "username": settings.mongo_username,
+        "password": settings.mongo_password,
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+        "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "retryReads": True,
+        "retryWrites": True,
+        "event_listeners": [listener, CommandTimer()],
+    }
+
 class MongoDBClient:
     def __init__(self):
-        self.client = MongoClient(
-            settings.mongo_uri,
-            username=settings.mongo_username,
-            password=settings.mongo_password,
+        self.pool_stats = PoolStatsListener(settings.mongo_max_pool_size)
+        self.client = MongoClient(settings.mongo_uri, **mongo_client_options(self.pool_stats))
+
+    def get_database(self, db_name):
+        return self.client[db_name]
+
+class AsyncS3Client:
+    """S3 client for use from async handlers.
+
+    boto3 has no asyncio support, so each call runs the blocking client in a
+    thread pool sized to the S3 connection pool instead of on the event loop;
+    the default executor is shared with everything else and much smaller.
+    """
+    def __init__(self, s3_client=None):
+        self.s3 = s3_client or S3Client()
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.s3_max_pool_connections, thread_name_prefix="s3"
         )
+        self.usage = UsageCounter(settings.s3_max_pool_connections)
+
+    async def _call(self, fn, *args):
+        self.usage.acquire()
+        failed = True
+        start = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            failed = False
+            return result
+        finally:
+            self.usage.release(failed)
+            elapsed = time.perf_counter() - start
+            IO_SECONDS.observe(elapsed, system="s3", operation=fn.__name__)
+            record_span(f"s3.{fn.__name__}", elapsed)
+
+    async def upload_file(self, file_path, bucket_name, object_name):
+        await self._call(self.s3.upload_file, file_path, bucket_name, object_name)
+
+    async def download_file(self, bucket_name, object_name, file_path):
+        await self._call(self.s3.download_file, bucket_name, object_name, file_path)
+
+    async def upload_fileobj(self, fileobj, bucket_name, object_name, content_type=None):
+        await self._call(self.s3.upload_fileobj, fileobj, bucket_name, object_name, content_type)
+
+    async def get_object(self, bucket_name, object_name) -> bytes:
+        return await self._call(self.s3.get_object, bucket_name, object_name)
+
+    async def list_buckets(self):
+        return await self._call(self.s3.list_buckets)
+
+    async def head_bucket(self, bucket_name):
+        return await self._call(self.s3.head_bucket, bucket_name)
+
+    def pool_stats(self):
+        return self.usage.stats()
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+class AsyncMongoDBClient:
+    def __init__(self):
+        self.pool_stats = PoolStatsListener(settings.mongo_max_pool_size)
+        self.client = AsyncMongoClient(settings.mongo_uri, **mongo_client_options(self.pool_stats))
 
     def get_database(self, db_name):
         return self.client[db_name]
 
+class OllamaHTTPPool:
+    """Shared keep-alive HTTP connections to Ollama for the sync and async LLM paths.
+
+    The sync side is a requests Session with a bounded connection pool and
+    connect-only retries (a generation is never re-sent after it reached the
+    server). The async side is an aiohttp session created lazily on the loop
+    that first uses it, since aiohttp sessions are bound to one event loop.
+    """
+    def __init__(self, max_connections=None, connect_timeout=None, read_timeout=None, connect_retries=None):
+        self.max_connections = max_connections or settings.llm_max_connections
+        self.connect_timeout = connect_timeout if connect_timeout is not None else settings.llm_connect_timeout
+        self.read_timeout = read_timeout if read_timeout is not None else settings.llm_read_timeout
+        connect_retries = connect_retries if connect_retries is not None else settings.llm_connect_retries
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_connections,
+            pool_block=True,
+            max_retries=Retry(total=connect_retries, connect=connect_retries, read=0, status=0, backoff_factor=0.5),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._async_session = None
+        self._async_loop = None
+        self.sync_usage = UsageCounter(self.max_connections)
+        self.async_usage = UsageCounter(self.max_connections)
+
+    def post(self, url, **kwargs) -> requests.Response:
+        return self.session.post(url, timeout=(self.connect_timeout, self.read_timeout), **kwargs)
+
+    async def async_session(self):
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_loop is not loop:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+            )
+            self._async_loop = loop
+        return self._async_session
+
+    async def aclose(self):
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self.session.close()
+
+    def stats(self):
+        return {"sync": self.sync_usage.stats(), "async": self.async_usage.stats()}
+
 # Usage example in another file:
 # from utils.external_resources import S3Client, MongoDBClient
 # s3 = S3Client()
 # mongo = MongoDBClient()
-# s3.upload_file("local.pdf", "mybucket", "resume.pdf")
\ No newline at end of file
+# s3.upload_file("local.pdf", "mybucket", "resume.pdf")
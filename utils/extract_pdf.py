@@ -1,20 +1,106 @@
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Union
+
 import PyPDF2
 
+PDFSource = Union[str, bytes, BinaryIO]
+
+# The document a pool worker parsed once in its initializer
+_worker_reader: Optional[PyPDF2.PdfReader] = None
+
 class PDFExtractor:
-    def __init__(self, pdf_path: str):
-        self.pdf_path = pdf_path
+    def __init__(self, pdf_source: PDFSource, max_pages: Optional[int] = None, max_chars: Optional[int] = None):
+        # A path on disk, the raw bytes of the file, or an open binary file object
+        self.pdf_source = pdf_source
+        # Budgets so a huge document cannot monopolise a worker; None means unlimited
+        self.max_pages = max_pages
+        self.max_chars = max_chars
 
-    def extract_text(self) -> str:
-        text = ""
-        with open(self.pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                page_text = page.extract_text()
+    def _open(self) -> BinaryIO:
+        if isinstance(self.pdf_source, str):
+            return open(self.pdf_source, 'rb')
+        if isinstance(self.pdf_source, (bytes, bytearray)):
+            return io.BytesIO(self.pdf_source)
+        return self.pdf_source
+
+    def iter_pages(self) -> Iterator[str]:
+        """Lazily yield the text of each page, stopping at the page/char budgets"""
+        stream = self._open()
+        try:
+            reader = PyPDF2.PdfReader(stream)
+            remaining = self.max_chars
+            for index, page in enumerate(reader.pages):
+                if self.max_pages is not None and index >= self.max_pages:
+                    break
+                page_text = page.extract_text() or ""
+                if remaining is not None:
+                    page_text = page_text[:remaining]
+                    remaining -= len(page_text)
                 if page_text:
-                    text += page_text
-        return text
+                    yield page_text
+                if remaining is not None and remaining <= 0:
+                    break
+        finally:
+            if isinstance(self.pdf_source, str):
+                stream.close()
+
+    def _read_bytes(self) -> bytes:
+        if isinstance(self.pdf_source, (bytes, bytearray)):
+            return bytes(self.pdf_source)
+        if isinstance(self.pdf_source, str):
+            with open(self.pdf_source, 'rb') as file:
+                return file.read()
+        self.pdf_source.seek(0)
+        return self.pdf_source.read()
+
+    def extract_text(self) -> str:
+        return "\n".join(self.iter_pages())
+
+    def extract_text_parallel(self, workers: int) -> str:
+        """Extract one contiguous page range per worker process.
+
+        Each worker parses the document once in the pool initializer and
+        then only extracts its own pages. Pool start-up is paid per call, so
+        this only pays off for long documents on a multi-core host.
+        """
+        pdf_bytes = self._read_bytes()
+        page_total = len(PyPDF2.PdfReader(io.BytesIO(pdf_bytes)).pages)
+        if self.max_pages is not None:
+            page_total = min(page_total, self.max_pages)
+        if page_total == 0:
+            return ""
+        workers = max(1, min(workers, page_total))
+        chunk = -(-page_total // workers)
+
+        pages = []
+        remaining = self.max_chars
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_document, initargs=(pdf_bytes,)) as executor:
+            futures = [
+                executor.submit(_extract_loaded_range, start, min(start + chunk, page_total))
+                for start in range(0, page_total, chunk)
+            ]
+            for future in futures:
+                for page_text in future.result():
+                    if remaining is not None:
+                        page_text = page_text[:remaining]
+                        remaining -= len(page_text)
+                    if page_text:
+                        pages.append(page_text)
+                if remaining is not None and remaining <= 0:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+        return "\n".join(pages)
+
+def _load_document(pdf_bytes: bytes) -> None:
+    """Pool initializer: parse the document once per worker process"""
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+
+def _extract_loaded_range(start: int, stop: int) -> List[str]:
+    return [_worker_reader.pages[index].extract_text() or "" for index in range(start, stop)]
 
-# Usage example:
-extractor = PDFExtractor("RISHI-JUL_2025.pdf")
-pdf_text = extractor.extract_text()
-print(pdf_text)
\ No newline at end of file
+def extract_pdf_text(pdf_source: PDFSource, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    """Module-level entry point so extraction can run in a process pool"""
+    return PDFExtractor(pdf_source, max_pages=max_pages, max_chars=max_chars).extract_text()
@@ -0,0 +1,222 @@
+import asyncio
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """Durable job queue stored in a Mongo collection.
+
+    A claimed job stays invisible to other workers until ``available_at``;
+    if the worker dies without finishing it, the job becomes claimable again
+    once the visibility timeout passes. Progress reports extend the timeout.
+    A job whose worker dies ``max_attempts`` times (OOM, SIGKILL, a hung
+    PDF) is not claimed again; fail_abandoned marks it failed.
+    """
+    def __init__(self, collection, visibility_timeout: int = 300, max_attempts: int = 3, retry_backoff: float = 5.0, sweep_interval: float = 30.0):
+        self.collection = collection
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        # claim runs fail_abandoned at most this often
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    async def create_indexes(self):
+        await self.collection.create_index([("status", 1), ("available_at", 1)])
+        # service_seconds reads the most recently finished jobs
+        await self.collection.create_index([("status", 1), ("updated_at", -1)])
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        now = utcnow()
+        job = {
+            "_id": uuid.uuid4().hex,
+            "kind": kind,
+            "payload": payload,
+            "status": QUEUED,
+            "attempts": 0,
+            "progress": [],
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "available_at": now,
+        }
+        await self.collection.insert_one(job)
+        return job["_id"]
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest available job, including expired running ones with attempts left"""
+        if time.monotonic() >= self._next_sweep:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            await self.fail_abandoned()
+        now = utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "status": {"$in": [QUEUED, RUNNING]},
+                "available_at": {"$lte": now},
+                "attempts": {"$lt": self.max_attempts},
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "updated_at": now,
+                    "available_at": now + timedelta(seconds=self.visibility_timeout),
+                    # A re-picked job starts its progress over
+                    "progress": [],
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def report_progress(self, job_id: str, worker_id: str, node: str):
+        now = utcnow()
+        await self.collection.update_one(
+            {"_id": job_id, "worker_id": worker_id, "status": RUNNING},
+            {
+                "$push": {"progress": {"node": node, "at": now}},
+                "$set": {"updated_at": now, "available_at": now + timedelta(seconds=self.visibility_timeout)},
+            },
+        )
+
+    async def complete(self, job_id: str, worker_id: str, result: Any, seconds: Optional[float] = None):
+        """Store the result; ``seconds`` is how long the handler ran, for service_seconds"""
+        update = {"status": SUCCEEDED, "result": result, "error": None, "updated_at": utcnow()}
+        if seconds is not None:
+            update["seconds"] = seconds
+        await self.collection.update_one({"_id": job_id, "worker_id": worker_id}, {"$set": update})
+
+    async def fail(self, job: Dict[str, Any], worker_id: str, error: str):
+        """Requeue with exponential backoff, or mark failed after max_attempts"""
+        now = utcnow()
+        if job["attempts"] < self.max_attempts:
+            update = {
+                "status": QUEUED,
+                "error": error,
+                "updated_at": now,
+                "available_at": now + timedelta(seconds=self.retry_backoff * 2 ** (job["attempts"] - 1)),
+            }
+        else:
+            update = {"status": FAILED, "error": error, "updated_at": now}
+        await self.collection.update_one({"_id": job["_id"], "worker_id": worker_id}, {"$set": update})
+
+    async def fail_abandoned(self):
+        """Mark failed the expired running jobs that used up their attempts.
+
+        fail() only sees jobs whose handler raised; these are the ones whose
+        worker died on every attempt.
+        """
+        now = utcnow()
+        await self.collection.update_many(
+            {"status": RUNNING, "available_at": {"$lte": now}, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {
+                "status": FAILED,
+                "error": f"Worker lost the job on all {self.max_attempts} attempts",
+                "updated_at": now,
+            }},
+        )
+
+    async def service_seconds(self, sample: int = 20) -> Optional[float]:
+        """Mean handler time of the last ``sample`` succeeded jobs, None before any finished"""
+        cursor = self.collection.find(
+            {"status": SUCCEEDED, "seconds": {"$gte": 0}}, {"seconds": 1},
+            sort=[("updated_at", -1)], limit=sample,
+        )
+        jobs = await cursor.to_list(length=sample)
+        return sum(job["seconds"] for job in jobs) / len(jobs) if jobs else None
+
+    async def estimated_wait(self, workers: int, default_service_seconds: float = 0.0) -> Tuple[int, float]:
+        """Queued jobs, and the seconds a job enqueued now would wait for one of ``workers``.
+
+        ``workers`` counts the workers of every process draining this queue,
+        so the estimate holds when scoring runs in separate worker.py
+        processes and the API process has no backlog of its own.
+        """
+        queued = await self.collection.count_documents({"status": QUEUED})
+        running = await self.collection.count_documents({"status": RUNNING, "available_at": {"$gt": utcnow()}})
+        workers = max(workers, 1)
+        if running < workers and not queued:
+            return queued, 0.0
+        seconds = await self.service_seconds() or default_service_seconds
+        return queued, (queued + 1) * seconds / workers
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"_id": job_id})
+
+
+JobHandler = Callable[[Dict[str, Any], Callable[[str], Awaitable[None]]], Awaitable[Any]]
+
+
+class JobWorkerPool:
+    """Pool of asyncio workers draining a JobQueue.
+
+    ``handler`` receives the claimed job and a coroutine to report the name
+    of each completed step; its return value is stored as the job result.
+    """
+    def __init__(self, queue: JobQueue, handler: JobHandler, concurrency: int = 2, poll_interval: float = 1.0):
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def start(self):
+        self._stopping.clear()
+        host = socket.gethostname()
+        for index in range(self.concurrency):
+            worker_id = f"{host}-{uuid.uuid4().hex[:8]}-{index}"
+            self._tasks.append(asyncio.create_task(self._work(worker_id)))
+
+    async def stop(self):
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_forever(self):
+        self.start()
+        await asyncio.gather(*self._tasks)
+
+    async def _work(self, worker_id: str):
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.claim(worker_id)
+            except Exception as e:
+                print(f"Worker {worker_id} could not claim a job: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            async def report(node: str, job_id=job["_id"]):
+                await self.queue.report_progress(job_id, worker_id, node)
+
+            start = time.perf_counter()
+            try:
+                result = await self.handler(job, report)
+            except asyncio.CancelledError:
+                # Leave the job running; it is re-picked once its visibility timeout expires
+                raise
+            except Exception as e:
+                await self.queue.fail(job, worker_id, str(e))
+            else:
+                await self.queue.complete(job["_id"], worker_id, result, time.perf_counter() - start)
@@ -0,0 +1,196 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage
+
+
+class MongoCacheStore:
+    """Persistent cache tier backed by a Mongo collection.
+
+    Expiry is delegated to a TTL index on ``expires_at``.
+    """
+    def __init__(self, collection):
+        self.collection = collection
+        self._index_created = False
+
+    def get(self, key: str) -> Optional[str]:
+        doc = self.collection.find_one({"_id": key})
+        if not doc:
+            return None
+        # The TTL monitor only runs once a minute, don't serve stale entries
+        expires_at = doc["expires_at"].replace(tzinfo=timezone.utc)
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        return doc["content"]
+
+    def set(self, key: str, content: str, ttl_seconds: int):
+        if not self._index_created:
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._index_created = True
+        self.collection.replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "content": content,
+                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
+            },
+            upsert=True,
+        )
+
+
+class DiskCacheStore:
+    """Persistent cache tier storing one JSON file per key under a directory"""
+    def __init__(self, cache_dir: str, max_entries: int = 10000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._writes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry["expires_at"] <= time.time():
+            return None
+        return entry["content"]
+
+    def set(self, key: str, content: str, ttl_seconds: int):
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"content": content, "expires_at": time.time() + ttl_seconds}, f)
+        os.replace(tmp_path, self._path(key))
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries and the least recently written ones above max_entries"""
+        paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        now = time.time()
+        for index, path in enumerate(paths):
+            try:
+                if index >= self.max_entries:
+                    os.remove(path)
+                    continue
+                with open(path, "r") as f:
+                    if json.load(f)["expires_at"] <= now:
+                        os.remove(path)
+            except (OSError, ValueError):
+                continue
+
+
+class LLMCache:
+    """Content-addressed cache of LLM responses.
+
+    Entries are keyed by model name, model options and a hash of the
+    rendered messages. Lookups go through an in-memory LRU first and fall
+    back to an optional persistent store (Mongo or disk).
+    """
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 7 * 24 * 3600, store=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+
+    @staticmethod
+    def make_key(model_name: str, model_options: Dict[str, Any], messages: List[BaseMessage]) -> str:
+        rendered = json.dumps(
+            {
+                "model": model_name,
+                "options": model_options,
+                "messages": [[message.type, message.content] for message in messages],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(rendered.encode("utf-8")).hexdigest()
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            content, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return content
+
+    def _set_memory(self, key: str, content: str):
+        with self._lock:
+            self._entries[key] = (content, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _record(self, content: Optional[str], persistent: bool = False) -> Optional[str]:
+        with self._lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if persistent:
+                    self.persistent_hits += 1
+        return content
+
+    def get(self, key: str) -> Optional[str]:
+        content = self._get_memory(key)
+        if content is not None or self.store is None:
+            return self._record(content)
+        content = self.store.get(key)
+        if content is not None:
+            self._set_memory(key, content)
+        return self._record(content, persistent=True)
+
+    def set(self, key: str, content: str):
+        self._set_memory(key, content)
+        if self.store is not None:
+            self.store.set(key, content, self.ttl_seconds)
+
+    async def aget(self, key: str) -> Optional[str]:
+        content = self._get_memory(key)
+        if content is not None or self.store is None:
+            return self._record(content)
+        content = await asyncio.to_thread(self.store.get, key)
+        if content is not None:
+            self._set_memory(key, content)
+        return self._record(content, persistent=True)
+
+    async def aset(self, key: str, content: str):
+        self._set_memory(key, content)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, key, content, self.ttl_seconds)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,374 @@
+import asyncio
+import copy
+import statistics
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+# What LangGraph's "messages" stream mode and astream_events attach to a run
+from langchain_core.tracers._streaming import _StreamingCallbackHandler
+from pydantic import Field
+
+from utils.config import settings
+from utils.external_resources import OllamaHTTPPool
+from utils.llm_cache import LLMCache
+from utils.metrics import LLM_COALESCED, LLM_ENDPOINT_REQUESTS
+
+# Latency weight of the newest call in an endpoint's moving average
+LATENCY_ALPHA = 0.2
+
+
+class _LeaderCancelled(Exception):
+    """Set on a flight whose leading caller was cancelled; joined callers re-issue the call"""
+
+
+def configured_urls() -> List[str]:
+    """Ollama endpoints from OLLAMA_URIS (comma separated), else the single OLLAMA_URI"""
+    urls = [url.strip() for url in settings.llm_urls_ollama.split(",") if url.strip()]
+    return urls or [settings.llm_url_ollama]
+
+
+class LLMEndpoint:
+    """One Ollama server: its connection pool, chat clients and health"""
+    def __init__(self, url: str, client_factory: Callable[["LLMEndpoint", Optional[str]], BaseChatModel]):
+        self.url = url.rstrip("/")
+        self.http_pool = OllamaHTTPPool()
+        self._client_factory = client_factory
+        self._clients: Dict[Optional[str], BaseChatModel] = {}
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.total = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def client(self, format: Optional[str] = None) -> BaseChatModel:
+        if format not in self._clients:
+            self._clients[format] = self._client_factory(self, format)
+        return self._clients[format]
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def start(self):
+        with self._lock:
+            self.in_flight += 1
+            self.total += 1
+
+    def finish(self, elapsed: float, failed: bool):
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.errors += 1
+                self.consecutive_failures += 1
+            else:
+                self.consecutive_failures = 0
+                self.latency = elapsed if self.latency is None else (1 - LATENCY_ALPHA) * self.latency + LATENCY_ALPHA * elapsed
+
+    def eject(self, seconds: float, reason: str):
+        with self._lock:
+            self.ejected_until = time.monotonic() + seconds
+            self.ejections += 1
+            self.consecutive_failures = 0
+            # Comes back with a clean slate instead of being ejected again on its old average
+            self.latency = None
+        print(f"Ejected LLM endpoint {self.url} for {seconds}s: {reason}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "total": self.total,
+                "errors": self.errors,
+                "latency_ewma_s": round(self.latency, 3) if self.latency is not None else None,
+                "ejected": not self.available(time.monotonic()),
+                "ejections": self.ejections,
+                "pool": self.http_pool.stats(),
+            }
+
+
+class LLMRouter:
+    """Spreads LLM calls over several Ollama servers.
+
+    Each call goes to the available endpoint with the fewest requests in
+    flight and fails over to the next one if it errors. Endpoints that fail
+    ``eject_failures`` times in a row, fail a health check, or run more than
+    ``slow_factor`` times slower than the others are ejected for
+    ``eject_seconds``. Identical prompts in flight at the same time share one
+    upstream call. ``start`` pre-loads the model on every endpoint and keeps
+    checking their health in the background.
+    """
+    def __init__(
+        self,
+        urls: List[str],
+        model_name: str,
+        keep_alive: Optional[str] = None,
+        eject_failures: Optional[int] = None,
+        eject_seconds: Optional[float] = None,
+        slow_factor: Optional[float] = None,
+        health_interval: Optional[float] = None,
+        client_factory: Optional[Callable[[LLMEndpoint, Optional[str]], BaseChatModel]] = None,
+    ):
+        self.model_name = model_name
+        self.keep_alive = keep_alive or settings.llm_keep_alive
+        self.eject_failures = eject_failures or settings.llm_eject_failures
+        self.eject_seconds = eject_seconds if eject_seconds is not None else settings.llm_eject_seconds
+        self.slow_factor = slow_factor or settings.llm_slow_factor
+        self.health_interval = health_interval or settings.llm_health_interval
+        self.endpoints = [LLMEndpoint(url, client_factory or self._ollama_client) for url in urls]
+        self._next = 0
+        self._lock = threading.Lock()
+        self._flights: Dict[str, Future] = {}
+        self._async_flights: Dict[Any, asyncio.Future] = {}
+        self._health_task: Optional[asyncio.Task] = None
+
+    def _ollama_client(self, endpoint: LLMEndpoint, format: Optional[str]) -> BaseChatModel:
+        from utils.ollama_client import PooledChatOllama
+
+        return PooledChatOllama(
+            model=self.model_name, base_url=endpoint.url, format=format,
+            keep_alive=self.keep_alive, http_pool=endpoint.http_pool,
+        )
+
+    def chat_model(self, format: Optional[str] = None) -> "RoutedChatModel":
+        return RoutedChatModel(router=self, model=self.model_name, format=format)
+
+    def pick(self, exclude=()) -> LLMEndpoint:
+        """Least in-flight available endpoint; round-robin between ties"""
+        now = time.monotonic()
+        candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+        available = [endpoint for endpoint in candidates if endpoint.available(now)]
+        if not available:
+            # Everything is ejected: try the one that comes back first rather than failing outright
+            return min(candidates, key=lambda endpoint: endpoint.ejected_until)
+        with self._lock:
+            self._next += 1
+            offset = self._next
+        fewest = min(endpoint.in_flight for endpoint in available)
+        tied = [endpoint for endpoint in available if endpoint.in_flight == fewest]
+        return tied[offset % len(tied)]
+
+    def record(self, endpoint: LLMEndpoint, elapsed: float, failed: bool):
+        endpoint.finish(elapsed, failed)
+        LLM_ENDPOINT_REQUESTS.inc(endpoint=endpoint.url, result="error" if failed else "ok")
+        if not endpoint.available(time.monotonic()):
+            # Calls that were in flight when it got ejected
+            return
+        if failed:
+            if endpoint.consecutive_failures >= self.eject_failures:
+                endpoint.eject(self.eject_seconds, f"{self.eject_failures} consecutive failures")
+            return
+        others = [other.latency for other in self.endpoints if other is not endpoint and other.latency is not None]
+        if others and endpoint.latency is not None and endpoint.latency > self.slow_factor * statistics.median(others):
+            endpoint.eject(self.eject_seconds, f"average latency {endpoint.latency:.2f}s is over {self.slow_factor}x the others")
+
+    def candidates(self):
+        """Endpoints in the order a call should try them, picked lazily"""
+        tried = []
+        for _ in self.endpoints:
+            endpoint = self.pick(exclude=tried)
+            tried.append(endpoint)
+            yield endpoint
+
+    def call(self, fn: Callable[[LLMEndpoint], ChatResult]) -> ChatResult:
+        """Run ``fn(endpoint)``, failing over to the next endpoint when it raises"""
+        error = None
+        for endpoint in self.candidates():
+            endpoint.start()
+            start = time.perf_counter()
+            try:
+                result = fn(endpoint)
+            except Exception as e:
+                self.record(endpoint, time.perf_counter() - start, failed=True)
+                error = e
+                continue
+            self.record(endpoint, time.perf_counter() - start, failed=False)
+            return result
+        raise error
+
+    async def acall(self, fn: Callable[[LLMEndpoint], Awaitable[ChatResult]]) -> ChatResult:
+        error = None
+        for endpoint in self.candidates():
+            endpoint.start()
+            start = time.perf_counter()
+            try:
+                result = await fn(endpoint)
+            except Exception as e:
+                self.record(endpoint, time.perf_counter() - start, failed=True)
+                error = e
+                continue
+            self.record(endpoint, time.perf_counter() - start, failed=False)
+            return result
+        raise error
+
+    def coalesce(self, key: str, call: Callable[[], ChatResult]) -> ChatResult:
+        """Run ``call`` once for every concurrent caller with the same key"""
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = Future()
+            if leader:
+                break
+            try:
+                result = flight.result()
+            except _LeaderCancelled:
+                continue
+            LLM_COALESCED.inc()
+            return copy.deepcopy(result)
+        try:
+            result = call()
+            flight.set_result(result)
+            return result
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+        except BaseException:
+            # Interrupted, not failed: the callers that joined run the call themselves
+            flight.set_exception(_LeaderCancelled())
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    async def acoalesce(self, key: str, call: Callable[[], Awaitable[ChatResult]]) -> ChatResult:
+        # Futures belong to one event loop, so flights are keyed by loop too
+        key = (id(asyncio.get_running_loop()), key)
+        while (flight := self._async_flights.get(key)) is not None:
+            try:
+                # A cancelled follower must not cancel the leader's call
+                result = await asyncio.shield(flight)
+            except _LeaderCancelled:
+                # The leader's client went away; the first follower to wake leads the retry
+                continue
+            LLM_COALESCED.inc()
+            return copy.deepcopy(result)
+        flight = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await call()
+            flight.set_result(result)
+            return result
+        except BaseException as e:
+            flight.set_exception(e if isinstance(e, Exception) else _LeaderCancelled())
+            # Mark retrieved so a flight without followers does not log a warning
+            flight.exception()
+            raise
+        finally:
+            del self._async_flights[key]
+
+    def warmup(self) -> Dict[str, str]:
+        """Load the model on every endpoint so the first real request does not pay for it"""
+        results = {}
+        for endpoint in self.endpoints:
+            try:
+                # A generate request without a prompt only loads the model
+                response = endpoint.http_pool.post(
+                    f"{endpoint.url}/api/generate", json={"model": self.model_name, "keep_alive": self.keep_alive},
+                )
+                with response:
+                    response.raise_for_status()
+                results[endpoint.url] = "ok"
+            except Exception as e:
+                results[endpoint.url] = f"error: {e!r}"
+                print(f"Could not warm up {self.model_name} on {endpoint.url}: {e}")
+        return results
+
+    def check_health(self) -> Dict[str, str]:
+        """Probe every endpoint for the model; ejects the ones that fail"""
+        results = {}
+        for endpoint in self.endpoints:
+            try:
+                response = endpoint.http_pool.session.get(
+                    f"{endpoint.url}/api/tags", timeout=settings.readiness_timeout,
+                )
+                with response:
+                    response.raise_for_status()
+                    names = {model.get("name") for model in response.json().get("models", [])}
+                if self.model_name not in names and f"{self.model_name}:latest" not in names:
+                    raise LookupError(f"model {self.model_name} is not pulled")
+                results[endpoint.url] = "ok"
+            except Exception as e:
+                results[endpoint.url] = f"error: {e!r}"
+                if endpoint.available(time.monotonic()):
+                    endpoint.eject(self.eject_seconds, f"health check failed: {e!r}")
+        return results
+
+    async def _maintain(self):
+        await asyncio.to_thread(self.warmup)
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await asyncio.to_thread(self.check_health)
+            except Exception as e:
+                print(f"LLM health check failed: {e}")
+
+    def start(self):
+        """Warm up the endpoints and start the periodic health checks on the running loop"""
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._maintain())
+
+    async def aclose(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        for endpoint in self.endpoints:
+            await endpoint.http_pool.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "coalesced": LLM_COALESCED.value(),
+            "endpoints": {endpoint.url: endpoint.stats() for endpoint in self.endpoints},
+        }
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that sends each call through an LLMRouter"""
+    router: LLMRouter = Field(exclude=True)
+    model: str
+    format: Optional[str] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed-ollama"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        # Same for every endpoint, so cache keys do not depend on routing
+        params = dict(getattr(self.router.endpoints[0].client(self.format), "_identifying_params", {}))
+        params.pop("keep_alive", None)
+        return params
+
+    def _flight_key(self, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]) -> str:
+        return LLMCache.make_key(self.model, {**self._identifying_params, "stop": stop, **kwargs}, messages)
+
+    @staticmethod
+    def _streams_tokens(run_manager) -> bool:
+        """Whether the caller wants tokens as they arrive, which only the leader of a flight would get"""
+        return run_manager is not None and any(isinstance(handler, _StreamingCallbackHandler) for handler in run_manager.handlers)
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        def call():
+            return self.router.call(
+                lambda endpoint: endpoint.client(self.format)._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            )
+        if self._streams_tokens(run_manager):
+            return call()
+        return self.router.coalesce(self._flight_key(messages, stop, kwargs), call)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        def call():
+            return self.router.acall(
+                lambda endpoint: endpoint.client(self.format)._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            )
+        if self._streams_tokens(run_manager):
+            return await call()
+        return await self.router.acoalesce(self._flight_key(messages, stop, kwargs), call)
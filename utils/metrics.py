@@ -0,0 +1,248 @@
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Trace id of the request or job being handled, and its timing breakdown.
+# Context variables follow asyncio tasks and LangGraph's executor threads, so
+# spans recorded deep inside the scorer land in the caller's breakdown.
+trace_id_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+timings_var: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings", default=None)
+tokens_var: ContextVar[Optional[Dict[str, Dict[str, int]]]] = ContextVar("tokens", default=None)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}_total{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge read from a callback at scrape time"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), callback=None):
+        super().__init__(name, documentation, labelnames)
+        # callback returns {label values tuple: value}
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        try:
+            values = self.callback() if self.callback is not None else {}
+        except Exception as e:
+            # A failing source must not break the whole scrape
+            print(f"Could not collect {self.name}: {e}")
+            values = {}
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts with a trailing +Inf slot, sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels) -> int:
+        counts, _ = self._values.get(self._key(labels), ([0], 0.0))
+        return sum(counts)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, (('le', le),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "resume_http_request_seconds", "HTTP request latency by route", ("method", "route", "status"),
+))
+NODE_SECONDS = REGISTRY.register(Histogram(
+    "resume_node_seconds", "Scoring graph node latency, including reused and cached nodes", ("node",),
+))
+LLM_SECONDS = REGISTRY.register(Histogram(
+    "resume_llm_call_seconds", "Latency of LLM calls that reached the model", ("node", "model"),
+))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "resume_llm_tokens", "Tokens reported by the model", ("node", "model", "kind"),
+))
+PROMPT_TOKENS = REGISTRY.register(Histogram(
+    "resume_prompt_tokens", "Estimated prompt tokens per LLM node, before the cache lookup", ("node",),
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+))
+SKIPPED_LLM_NODES = REGISTRY.register(Counter(
+    "resume_skipped_llm_nodes", "LLM nodes not run because the resume was rejected early", ("node",),
+))
+CASCADE_DECISIONS = REGISTRY.register(Counter(
+    "resume_cascade_decisions", "Cascade results by the tier that decided them and why", ("tier", "reason"),
+))
+LLM_CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "resume_llm_cache_lookups", "LLM response cache lookups", ("node", "result"),
+))
+LLM_ERRORS = REGISTRY.register(Counter(
+    "resume_llm_errors", "Failed LLM attempts, including retried ones", ("node",),
+))
+LLM_ENDPOINT_REQUESTS = REGISTRY.register(Counter(
+    "resume_llm_endpoint_requests", "LLM calls per Ollama endpoint, including failed-over ones", ("endpoint", "result"),
+))
+LLM_COALESCED = REGISTRY.register(Counter(
+    "resume_llm_coalesced", "LLM calls answered by an identical call already in flight",
+))
+SCHEDULER_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "resume_scheduler_wait_seconds", "Time admitted evaluations waited for a scorer slot", ("priority",),
+))
+SCHEDULER_REJECTIONS = REGISTRY.register(Counter(
+    "resume_scheduler_rejections", "Evaluations shed by the admission scheduler", ("priority", "reason"),
+))
+IO_SECONDS = REGISTRY.register(Histogram(
+    "resume_io_seconds", "Latency of S3, Mongo, PDF extraction and embedding calls", ("system", "operation"),
+))
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def record_span(name: str, seconds: float):
+    """Add ``seconds`` to ``name`` in the current timing breakdown, if one is being collected"""
+    timings = timings_var.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def record_tokens(node: str, prompt: int, completion: int):
+    """Add a call's token counts to ``node`` in the current token breakdown, if one is being collected"""
+    tokens = tokens_var.get()
+    if tokens is not None:
+        counts = tokens.setdefault(node, {"prompt": 0, "completion": 0})
+        counts["prompt"] += prompt
+        counts["completion"] += completion
+
+
+@contextmanager
+def timed(histogram: Histogram, span: Optional[str] = None, **labels):
+    """Observe the duration of the block in ``histogram`` and in the timing breakdown"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed, **labels)
+        if span is not None:
+            record_span(span, elapsed)
+
+
+@contextmanager
+def collect_timings(trace_id: Optional[str] = None):
+    """Collect the spans recorded inside the block into a {span: seconds} dict.
+
+    Sets the trace id for the block too, when given.
+    """
+    timings: Dict[str, float] = {}
+    timings_token = timings_var.set(timings)
+    trace_token = trace_id_var.set(trace_id) if trace_id else None
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings["total"] = time.perf_counter() - start
+        timings_var.reset(timings_token)
+        if trace_token is not None:
+            trace_id_var.reset(trace_token)
+
+
+@contextmanager
+def collect_tokens():
+    """Collect the token counts reported inside the block into a {node: {"prompt", "completion"}} dict"""
+    tokens: Dict[str, Dict[str, int]] = {}
+    token = tokens_var.set(tokens)
+    try:
+        yield tokens
+    finally:
+        tokens_var.reset(token)
@@ -0,0 +1,97 @@
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_community.chat_models import ChatOllama
+from langchain_community.llms.ollama import OllamaEndpointNotFoundError
+from pydantic import Field
+
+from utils.external_resources import OllamaHTTPPool
+
+
+class PooledChatOllama(ChatOllama):
+    """ChatOllama that sends requests through a shared OllamaHTTPPool.
+
+    Upstream opens a new connection (and a new aiohttp session) for every
+    call; with a pool the sync and async paths reuse keep-alive connections,
+    bounded by the pool size. Without one it behaves like ChatOllama.
+    """
+    http_pool: Optional[OllamaHTTPPool] = Field(default=None, exclude=True)
+
+    def _request_payload(self, payload: Any, stop: Optional[List[str]], **kwargs: Any) -> Dict[str, Any]:
+        # Same parameter merging as _OllamaCommon._create_stream
+        if self.stop is not None and stop is not None:
+            raise ValueError("`stop` found in both the input and default params.")
+        elif self.stop is not None:
+            stop = self.stop
+
+        params = self._default_params
+        for key in self._default_params:
+            if key in kwargs:
+                params[key] = kwargs[key]
+        if "options" in kwargs:
+            params["options"] = kwargs["options"]
+        else:
+            params["options"] = {
+                **params["options"],
+                "stop": stop,
+                **{k: v for k, v in kwargs.items() if k not in self._default_params},
+            }
+
+        if payload.get("messages"):
+            return {"messages": payload.get("messages", []), **params}
+        return {"prompt": payload.get("prompt"), "images": payload.get("images", []), **params}
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Content-Type": "application/json", **(self.headers if isinstance(self.headers, dict) else {})}
+
+    def _check_status(self, status: int, detail: str):
+        if status == 404:
+            raise OllamaEndpointNotFoundError(
+                f"Ollama call failed with status code 404. Maybe your model is not found "
+                f"and you should pull the model with `ollama pull {self.model}`."
+            )
+        if status != 200:
+            raise ValueError(f"Ollama call failed with status code {status}. Details: {detail}")
+
+    def _create_stream(self, api_url: str, payload: Any, stop: Optional[List[str]] = None, **kwargs: Any) -> Iterator[str]:
+        if self.http_pool is None:
+            yield from super()._create_stream(api_url, payload, stop, **kwargs)
+            return
+
+        usage = self.http_pool.sync_usage
+        usage.acquire()
+        failed = True
+        try:
+            response = self.http_pool.post(
+                api_url, headers=self._headers(), auth=self.auth,
+                json=self._request_payload(payload, stop, **kwargs), stream=True,
+            )
+            # Closing the response hands the connection back to the pool
+            with response:
+                response.encoding = "utf-8"
+                self._check_status(response.status_code, response.text if response.status_code != 200 else "")
+                yield from response.iter_lines(decode_unicode=True)
+            failed = False
+        finally:
+            usage.release(failed)
+
+    async def _acreate_stream(self, api_url: str, payload: Any, stop: Optional[List[str]] = None, **kwargs: Any) -> AsyncIterator[str]:
+        if self.http_pool is None:
+            async for line in super()._acreate_stream(api_url, payload, stop, **kwargs):
+                yield line
+            return
+
+        usage = self.http_pool.async_usage
+        usage.acquire()
+        failed = True
+        try:
+            session = await self.http_pool.async_session()
+            async with session.post(
+                api_url, headers=self._headers(), auth=self.auth,
+                json=self._request_payload(payload, stop, **kwargs),
+            ) as response:
+                self._check_status(response.status, await response.text() if response.status != 200 else "")
+                async for line in response.content:
+                    yield line.decode("utf-8")
+            failed = False
+        finally:
+            usage.release(failed)
@@ -0,0 +1,181 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from utils.config import settings
+from utils.resume_sections import split_sections
+
+# Rough size of a token for the models we serve; close enough to budget
+# prompts without loading a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Token budget of each variable part of the prompts; the fixed instructions
+# around them are small and not counted
+DEFAULT_BUDGETS = {
+    "resume_text": settings.prompt_resume_tokens,
+    "job_description": settings.prompt_job_tokens,
+    "resume_info": settings.prompt_resume_info_tokens,
+    "feedback_context": settings.prompt_feedback_tokens,
+}
+
+TRUNCATED = "[truncated]"
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_messages(messages: List[BaseMessage]) -> int:
+    return sum(estimate_tokens(str(message.content)) for message in messages)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse the runs of spaces and blank lines PDF extraction leaves behind"""
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def truncate_text(text: str, budget: int) -> str:
+    """``text`` cut to ``budget`` tokens at a line boundary where possible"""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:max(limit - len(TRUNCATED) - 1, 0)]
+    if "\n" in cut[len(cut) // 2:]:
+        cut = cut[:cut.rindex("\n")]
+    return cut.rstrip() + "\n" + TRUNCATED
+
+
+def truncate_resume(text: str, budget: int) -> str:
+    """Resume text within ``budget`` tokens, trimmed section by section.
+
+    Short sections are kept whole and the long ones share what is left, so a
+    lengthy work history cannot push skills or education out of the prompt.
+    """
+    text = normalize_whitespace(text)
+    if estimate_tokens(text) <= budget:
+        return text
+    sections = split_sections(text)
+    if len(sections) < 2:
+        return truncate_text(text, budget)
+    # Headings are re-added below, leave room for them
+    budget -= sum(estimate_tokens(name) + 1 for name in sections)
+    sizes = {name: estimate_tokens(body) for name, body in sections.items()}
+    shares, remaining = {}, budget
+    for name in sorted(sizes, key=sizes.get):
+        share = remaining // (len(sizes) - len(shares))
+        shares[name] = min(sizes[name], max(share, 0))
+        remaining -= shares[name]
+    parts = []
+    for name, body in sections.items():
+        body = truncate_text(body, shares[name]) if shares[name] else TRUNCATED
+        parts.append(body if name == "header" else f"{name.upper()}:\n{body}")
+    return "\n\n".join(parts)
+
+
+def compact(value: Any) -> Any:
+    """``value`` without None, empty strings and empty containers, recursively"""
+    if isinstance(value, dict):
+        items = ((key, compact(item)) for key, item in value.items())
+        return {key: item for key, item in items if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        items = (compact(item) for item in value)
+        return [item for item in items if item not in (None, "", [], {})]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(compact(value), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _shrink(value: Any, max_chars: int, max_items: int) -> Any:
+    if isinstance(value, dict):
+        return {key: _shrink(item, max_chars, max_items) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_shrink(item, max_chars, max_items) for item in value[:max_items]]
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars].rstrip() + "..."
+    return value
+
+
+def fit_json(value: Any, budget: int) -> str:
+    """Compact JSON for ``value`` within ``budget`` tokens.
+
+    Long strings and lists are shortened step by step first, so the result
+    stays valid JSON; only if that is not enough is the text cut.
+    """
+    value = compact(value)
+    text = compact_json(value)
+    max_chars, max_items = 400, 20
+    while estimate_tokens(text) > budget and max_chars > 20:
+        text = compact_json(_shrink(value, max_chars, max_items))
+        max_chars, max_items = max_chars // 2, max(max_items // 2, 3)
+    return truncate_text(text, budget)
+
+
+def first_sentence(text: str) -> str:
+    """First line of ``text`` that is not a score, cut at its first sentence end"""
+    for line in str(text).splitlines():
+        line = line.strip(" -*#")
+        if line and not line.lower().startswith("score"):
+            return re.split(r"(?<=[.!?])\s", line, maxsplit=1)[0]
+    return ""
+
+
+def summarize_reasoning(messages: List[Dict[str, Any]], budget: int, skip=("extract_resume_info",)) -> str:
+    """Scores and the gist of each node's reasoning, within ``budget`` tokens.
+
+    Stands in for the full state["messages"] in the feedback prompt: the
+    extraction output is already in the shared context and the complete
+    reasoning of every node adds little over its first sentence.
+    """
+    summary = []
+    for message in messages:
+        if message.get("node") in skip:
+            continue
+        entry = {"node": message.get("node"), "score": message.get("score")}
+        if "strengths" in message:
+            # Structured mode entries already come split up
+            entry.update({key: message.get(key) for key in ("summary", "strengths", "weaknesses")})
+        elif "skill_match" in message:
+            match = message["skill_match"]
+            entry["missing_skills"] = match.get("required_missing", []) + match.get("preferred_missing", [])
+        if "reasoning" in message and "summary" not in entry:
+            entry["note"] = first_sentence(message["reasoning"])
+        summary.append(entry)
+    # Parallel nodes finish in any order; sorting keeps the prompt, and its cache key, stable
+    summary.sort(key=lambda entry: str(entry["node"]))
+    return fit_json(summary, budget)
+
+
+class PromptBuilder:
+    """Builds the LLM node prompts of ResumeScorer within per-part token budgets.
+
+    Scoring prompts start with the same system message (job description and
+    extracted resume info) and only then add the node's own instructions, so
+    a server that keeps the KV cache of a prefix, like Ollama does, prefills
+    the shared part once per resume instead of once per node.
+    """
+    def __init__(self, budgets: Optional[Dict[str, int]] = None):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+
+    def resume_text(self, resume_text: str) -> str:
+        return truncate_resume(resume_text, self.budgets["resume_text"])
+
+    def shared_context(self, job_description: str, extracted_info: Dict[str, Any]) -> SystemMessage:
+        job_description = truncate_text(normalize_whitespace(job_description), self.budgets["job_description"])
+        return SystemMessage(content=(
+            "You are evaluating a candidate for the job below. Answer only the task that follows.\n\n"
+            f"Job Description:\n{job_description}\n\n"
+            f"Resume Info:\n{fit_json(extracted_info, self.budgets['resume_info'])}"
+        ))
+
+    def scoring_messages(self, job_description: str, extracted_info: Dict[str, Any], instructions: str) -> List[BaseMessage]:
+        return [self.shared_context(job_description, extracted_info), HumanMessage(content=instructions)]
+
+    def feedback_context(self, messages: List[Dict[str, Any]]) -> str:
+        return summarize_reasoning(messages, self.budgets["feedback_context"])
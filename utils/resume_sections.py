@@ -0,0 +1,82 @@
+import difflib
+import hashlib
+import re
+from typing import Any, Dict, Set
+
+# Canonical section names and the headings that introduce them
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "professional summary", "objective", "about me"],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history",
+    ],
+    "education": ["education", "academic background", "qualifications", "academics"],
+    "skills": ["skills", "technical skills", "core competencies", "technologies", "tech stack", "tools"],
+    "projects": ["projects", "personal projects", "side projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses", "licenses & certifications"],
+    "achievements": ["achievements", "awards", "honors", "honours", "accomplishments", "publications"],
+}
+
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+_HEADING_RE = re.compile(
+    r"^[ \t]*(" + "|".join(sorted((re.escape(h) for h in _HEADING_TO_SECTION), key=len, reverse=True)) + r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Split resume text into canonical sections keyed by name.
+
+    Text before the first recognised heading (name, contact details) is
+    returned as "header". Repeated headings for the same section are merged.
+    """
+    sections: Dict[str, str] = {}
+    matches = list(_HEADING_RE.finditer(text))
+    header = text[:matches[0].start()] if matches else text
+    if header.strip():
+        sections["header"] = header.strip()
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        body = text[match.end():end].strip()
+        if not body:
+            continue
+        section = _HEADING_TO_SECTION[match.group(1).lower()]
+        sections[section] = f"{sections[section]}\n{body}" if section in sections else body
+    return sections
+
+
+def section_hashes(text: str) -> Dict[str, str]:
+    """Short content hash of every section, whitespace-insensitive"""
+    return {
+        section: hashlib.sha256(" ".join(body.split()).encode("utf-8")).hexdigest()[:16]
+        for section, body in split_sections(text).items()
+    }
+
+
+def changed_sections(old_hashes: Dict[str, str], new_hashes: Dict[str, str]) -> Set[str]:
+    return {section for section in set(old_hashes) | set(new_hashes) if old_hashes.get(section) != new_hashes.get(section)}
+
+
+def diff_sections(old_text: str, new_text: str, context: int = 1) -> Dict[str, Dict[str, Any]]:
+    """Per-section status (added, removed, changed, unchanged) with a unified diff of changed ones"""
+    old_sections, new_sections = split_sections(old_text), split_sections(new_text)
+    diff = {}
+    for section in list(dict.fromkeys([*old_sections, *new_sections])):
+        old, new = old_sections.get(section), new_sections.get(section)
+        if old is None:
+            status = "added"
+        elif new is None:
+            status = "removed"
+        elif " ".join(old.split()) == " ".join(new.split()):
+            diff[section] = {"status": "unchanged"}
+            continue
+        else:
+            status = "changed"
+        lines = difflib.unified_diff(
+            (old or "").splitlines(), (new or "").splitlines(), lineterm="", n=context,
+        )
+        # Drop the ---/+++ file headers, the section name already says what this is
+        diff[section] = {"status": status, "diff": [line for line in lines if not line.startswith(("---", "+++"))]}
+    return diff
@@ -0,0 +1,93 @@
+import hashlib
+import re
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from utils.resume_sections import section_hashes
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# What version listings return; never the resume text
+VERSION_PROJECTION = {
+    "_id": 1, "filename": 1, "upload_time": 1, "candidate_id": 1, "version": 1,
+    "previous_version_id": 1, "section_hashes": 1, "evaluation.total_score": 1,
+}
+
+
+def candidate_key(text: str) -> Optional[str]:
+    """Candidate id derived from the first e-mail address in the resume.
+
+    The address is hashed, so the id can be shared without exposing it.
+    """
+    match = EMAIL_RE.search(text)
+    if match is None:
+        return None
+    return "email-" + hashlib.sha256(match.group(0).lower().encode("utf-8")).hexdigest()[:16]
+
+
+class ResumeVersions:
+    """Links uploads of the same candidate into numbered versions.
+
+    Uploads carry a candidate_id when the client sends one; otherwise it is
+    derived from the resume's e-mail address once the text is extracted.
+    Each linked record points at the version before it and stores the hash
+    of every section, so later uploads can be diffed section by section.
+
+    Versions follow upload order, not the order in which uploads are
+    processed: linking an upload older than the candidate's latest version
+    renumbers the ones after it. A unique index on (candidate_id, version)
+    keeps concurrent links from handing out the same number; the loser
+    re-reads the candidate's uploads and tries again.
+    """
+    def __init__(self, collection, max_attempts: int = 5):
+        self.collection = collection
+        self.max_attempts = max_attempts
+
+    async def create_indexes(self):
+        await self.collection.create_index(
+            [("candidate_id", 1), ("version", 1)], unique=True,
+            partialFilterExpression={"version": {"$exists": True}},
+        )
+
+    async def link(self, record: Dict[str, Any], resume_text: str) -> Dict[str, Any]:
+        """Store section hashes and version links on ``record``; updates it in place too"""
+        update = {"section_hashes": section_hashes(resume_text)}
+        candidate_id = record.get("candidate_id") or candidate_key(resume_text)
+        if candidate_id is not None:
+            update["candidate_id"] = candidate_id
+        await self.collection.update_one({"_id": record["_id"]}, {"$set": update})
+        if candidate_id is not None:
+            update.update(await self._renumber(candidate_id, record["_id"]))
+        record.update(update)
+        return update
+
+    async def _renumber(self, candidate_id: str, resume_id: str) -> Dict[str, Any]:
+        """Number the candidate's uploads by upload time; returns the links of ``resume_id``"""
+        for attempt in range(self.max_attempts):
+            cursor = self.collection.find(
+                {"candidate_id": candidate_id}, {"_id": 1, "version": 1, "previous_version_id": 1},
+            ).sort([("upload_time", 1), ("_id", 1)])
+            uploads = await cursor.to_list(length=None)
+            links = {}
+            try:
+                # Newest first: numbers only move up, so each one is free by the time it is taken
+                for index in range(len(uploads) - 1, -1, -1):
+                    upload = uploads[index]
+                    links[upload["_id"]] = {
+                        "version": index + 1,
+                        "previous_version_id": uploads[index - 1]["_id"] if index else None,
+                    }
+                    if any(upload.get(key) != value for key, value in links[upload["_id"]].items()):
+                        await self.collection.update_one({"_id": upload["_id"]}, {"$set": links[upload["_id"]]})
+            except DuplicateKeyError:
+                if attempt == self.max_attempts - 1:
+                    raise
+                continue
+            return links[resume_id]
+
+    async def versions(self, candidate_id: str) -> List[Dict[str, Any]]:
+        cursor = self.collection.find(
+            {"candidate_id": candidate_id, "version": {"$exists": True}}, VERSION_PROJECTION,
+        ).sort([("version", 1)])
+        return await cursor.to_list(length=None)
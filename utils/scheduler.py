@@ -0,0 +1,169 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from utils.metrics import SCHEDULER_REJECTIONS, SCHEDULER_WAIT_SECONDS
+
+# Lower runs first: a user waiting on one resume goes ahead of batch screening
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+
+class Overloaded(Exception):
+    """Raised instead of admitting work the scheduler cannot serve in time.
+
+    ``status_code`` is 429 when the wait queue is full and 503 when the
+    request's deadline cannot be met; ``retry_after`` is the estimated number
+    of seconds until there is room again.
+    """
+    def __init__(self, reason: str, status_code: int, retry_after: float):
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"Scorer overloaded ({reason}), retry after {self.retry_after}s")
+
+
+class _Waiter:
+    def __init__(self, priority: int, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionScheduler:
+    """Bounded concurrency in front of the scorer, with a bounded priority queue.
+
+    At most ``max_concurrency`` evaluations run at once, which should match
+    what the LLM endpoints can serve in parallel. Up to ``max_queue`` more
+    wait, highest priority first and FIFO within a priority; when the queue
+    is full a newcomer displaces the newest waiter of a lower priority, or
+    is rejected. A request whose estimated wait already exceeds its deadline
+    is rejected on arrival instead of timing out later, so the ones that are
+    admitted keep a predictable latency.
+    """
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 64, default_service_seconds: float = 0.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.in_flight = 0
+        # EWMA of how long an admitted evaluation holds its slot
+        self.service_seconds = default_service_seconds
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self.admitted = {name: 0 for name in PRIORITIES}
+        self.rejected = {name: 0 for name in PRIORITIES}
+
+    def queued(self, priority: Optional[str] = None) -> int:
+        waiters = [waiter for waiter in self._queue if not waiter.future.done()]
+        if priority is None:
+            return len(waiters)
+        return sum(1 for waiter in waiters if waiter.priority == PRIORITIES[priority])
+
+    def estimated_wait(self, priority: str) -> float:
+        """Seconds a request of ``priority`` arriving now would wait for a slot"""
+        if self.in_flight < self.max_concurrency and not self.queued():
+            return 0.0
+        ahead = sum(1 for waiter in self._queue if not waiter.future.done() and waiter.priority <= PRIORITIES[priority])
+        return (ahead + 1) * self.service_seconds / self.max_concurrency
+
+    def _reject(self, priority: str, reason: str, status_code: int, retry_after: float) -> Overloaded:
+        self.rejected[priority] += 1
+        SCHEDULER_REJECTIONS.inc(priority=priority, reason=reason)
+        return Overloaded(reason, status_code, retry_after)
+
+    def check(self, priority: str, max_wait: Optional[float] = None):
+        """Raise Overloaded if a request of ``priority`` would be shed now, without queueing it"""
+        wait = self.estimated_wait(priority)
+        if max_wait is not None and wait > max_wait:
+            raise self._reject(priority, "deadline", 503, wait)
+        if self.queued() >= self.max_queue and not self._displaceable(PRIORITIES[priority]):
+            raise self._reject(priority, "queue_full", 429, wait)
+
+    def check_backlog(self, priority: str, queued: int, wait: float, max_wait: Optional[float] = None):
+        """Like check, for a backlog kept outside this scheduler.
+
+        The Mongo job queue is drained by every worker process, so its depth
+        and estimated wait come from the queue rather than from this process.
+        """
+        if max_wait is not None and wait > max_wait:
+            raise self._reject(priority, "deadline", 503, wait)
+        if queued >= self.max_queue:
+            raise self._reject(priority, "queue_full", 429, wait)
+
+    def _displaceable(self, level: int) -> Optional[_Waiter]:
+        """Newest waiter with a lower priority than ``level``, if any"""
+        candidates = [waiter for waiter in self._queue if not waiter.future.done() and waiter.priority > level]
+        return max(candidates, key=lambda waiter: (waiter.priority, waiter.seq), default=None)
+
+    async def acquire(self, priority: str = "interactive", max_wait: Optional[float] = None):
+        """Wait for a slot; ``max_wait`` is the longest the caller is willing to queue"""
+        level = PRIORITIES[priority]
+        start = time.perf_counter()
+        if self.in_flight < self.max_concurrency and not self.queued():
+            self.in_flight += 1
+            self.admitted[priority] += 1
+            SCHEDULER_WAIT_SECONDS.observe(0.0, priority=priority)
+            return
+        self.check(priority, max_wait)
+        if self.queued() >= self.max_queue:
+            victim = self._displaceable(level)
+            victim_priority = next(name for name, value in PRIORITIES.items() if value == victim.priority)
+            victim.future.set_exception(self._reject(victim_priority, "displaced", 503, self.estimated_wait(victim_priority)))
+
+        waiter = _Waiter(level, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=max_wait)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                raise self._reject(priority, "timeout", 503, self.estimated_wait(priority))
+            if waiter.future.exception() is not None:
+                # Displaced just as the deadline passed
+                raise waiter.future.exception()
+            # Handed a slot just as the deadline passed; keep it
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                # The slot was handed over, pass it on
+                self.release()
+            else:
+                waiter.future.cancel()
+            raise
+        self.admitted[priority] += 1
+        SCHEDULER_WAIT_SECONDS.observe(time.perf_counter() - start, priority=priority)
+
+    def release(self, elapsed: Optional[float] = None):
+        """Give the slot back, handing it straight to the best waiter"""
+        if elapsed is not None:
+            self.service_seconds = elapsed if not self.service_seconds else 0.8 * self.service_seconds + 0.2 * elapsed
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: str = "interactive", max_wait: Optional[float] = None):
+        await self.acquire(priority, max_wait)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": {name: self.queued(name) for name in PRIORITIES},
+            "service_seconds": round(self.service_seconds, 3),
+            "admitted": dict(self.admitted),
+            "rejected": dict(self.rejected),
+        }
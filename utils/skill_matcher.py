@@ -0,0 +1,209 @@
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.resume_sections import split_sections
+
+# Canonical skill -> alternative spellings. Matching is case-insensitive and
+# on token boundaries, so short aliases such as "ML" do not match inside words.
+DEFAULT_SKILL_ALIASES = {
+    "Python": ["python3", "cpython"],
+    "SQL": ["mysql", "postgresql", "postgres", "sqlite", "t-sql", "pl/sql", "sql server"],
+    "Data Analysis": ["data analytics", "data analyst", "statistical analysis", "analyzing data", "analysing data"],
+    "Machine Learning": ["ml", "machine-learning"],
+    "Deep Learning": ["neural networks"],
+    "Artificial Intelligence": [],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "AWS": ["amazon web services", "ec2", "sagemaker"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Azure": ["microsoft azure"],
+    "Docker": ["docker-compose", "dockerfile"],
+    "Kubernetes": ["k8s"],
+    "JavaScript": ["js", "ecmascript"],
+    "TypeScript": [],
+    "React": ["react.js", "reactjs"],
+    "Node.js": ["nodejs"],
+    "Pandas": [],
+    "NumPy": [],
+    "TensorFlow": [],
+    "PyTorch": ["torch"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "Spark": ["pyspark", "apache spark"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Git": ["github", "gitlab"],
+    "CI/CD": ["continuous integration", "continuous delivery", "github actions", "jenkins"],
+}
+
+# Aliases too ambiguous for free text: "CV" is usually the resume itself, "AI"
+# and "TS" can be initials, "node" is an ordinary word. They only count in the
+# skills section, where a bare token is a skill.
+SKILLS_SECTION_ALIASES = {
+    "Deep Learning": ["dl"],
+    "Artificial Intelligence": ["ai"],
+    "Computer Vision": ["cv"],
+    "TypeScript": ["ts"],
+    "Node.js": ["node"],
+    "TensorFlow": ["tf"],
+}
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+
+
+def _date_point(prefix: str) -> str:
+    """Optional month name or number followed by a year, with named groups"""
+    return (
+        rf"(?:(?P<{prefix}m>{_MONTH})\s*,?\s*|(?P<{prefix}n>\d{{1,2}})\s*[/.-]\s*)?"
+        rf"(?P<{prefix}y>(?:19|20)\d{{2}})"
+    )
+
+
+_DATE_RANGE_RE = re.compile(
+    _date_point("s")
+    + r"\s*(?:-|–|—|to|until|till)\s*"
+    + rf"(?:(?P<present>present|current|now|today|ongoing)|{_date_point('e')})",
+    re.IGNORECASE,
+)
+
+
+def _alternation(names: Iterable[str]) -> "re.Pattern[str]":
+    # Longest names first so "machine learning" wins over "ml"-style prefixes
+    names = sorted(names, key=len, reverse=True)
+    pattern = "|".join(re.escape(name) for name in names) if names else r"(?!)"
+    return re.compile(rf"(?<![\w+#])({pattern})(?![\w+#])", re.IGNORECASE)
+
+
+class SkillMatcher:
+    """Find canonical skills in text with a single precompiled alternation.
+
+    ``section_aliases`` are only matched in the skills section of the text.
+    """
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, List[str]]] = None, section_aliases: Optional[Dict[str, List[str]]] = None):
+        aliases = DEFAULT_SKILL_ALIASES if aliases is None else aliases
+        section_aliases = SKILLS_SECTION_ALIASES if section_aliases is None else section_aliases
+        alias_lookup = {canonical.lower(): names for canonical, names in aliases.items()}
+        section_lookup = {canonical.lower(): names for canonical, names in section_aliases.items()}
+        self.skills = list(dict.fromkeys(skills))
+        self._canonical: Dict[str, str] = {}
+        self._section_canonical: Dict[str, str] = {}
+        for skill in self.skills:
+            for name in [skill, *alias_lookup.get(skill.lower(), [])]:
+                self._canonical.setdefault(name.lower(), skill)
+            for name in section_lookup.get(skill.lower(), []):
+                if name.lower() not in self._canonical:
+                    self._section_canonical.setdefault(name.lower(), skill)
+        self._pattern = _alternation(self._canonical)
+        self._section_pattern = _alternation(self._section_canonical) if self._section_canonical else None
+
+    def find(self, text: str) -> Set[str]:
+        found = {self._canonical[match.group(1).lower()] for match in self._pattern.finditer(text)}
+        if self._section_pattern is not None:
+            skills_section = split_sections(text).get("skills", "")
+            found.update(self._section_canonical[match.group(1).lower()] for match in self._section_pattern.finditer(skills_section))
+        return found
+
+
+@lru_cache(maxsize=256)
+def get_matcher(skills: Tuple[str, ...]) -> SkillMatcher:
+    """Matchers are cheap to use but not to compile, so reuse them per skill set"""
+    return SkillMatcher(skills)
+
+
+def _month_index(year: str, month_name: Optional[str], month_number: Optional[str], default_month: int) -> int:
+    month = default_month
+    if month_name:
+        month = _MONTHS.get(month_name.lower().rstrip(".")[:4], _MONTHS.get(month_name.lower()[:3], default_month))
+    elif month_number and 1 <= int(month_number) <= 12:
+        month = int(month_number)
+    return int(year) * 12 + month - 1
+
+
+def years_of_experience(text: str, today: Optional[date] = None) -> float:
+    """Total years covered by date ranges in ``text``, counting overlaps once.
+
+    Only the experience section is used when one can be found, so education
+    date ranges do not inflate the total.
+    """
+    today = today or date.today()
+    text = split_sections(text).get("experience", text)
+    now = today.year * 12 + today.month - 1
+
+    intervals = []
+    for match in _DATE_RANGE_RE.finditer(text):
+        start = _month_index(match.group("sy"), match.group("sm"), match.group("sn"), 1)
+        if match.group("present"):
+            end = now
+        else:
+            end = _month_index(match.group("ey"), match.group("em"), match.group("en"), 12)
+        if start <= end <= now:
+            intervals.append((start, end))
+
+    months = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end + 1:
+            if current_end is not None:
+                months += current_end - current_start + 1
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start + 1
+    return round(months / 12, 1)
+
+
+def score_technical(text: str, technical_criteria: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    """Deterministic technical score using the weights of the LLM prompt.
+
+    Required skills are 60% of ``max_points``, preferred skills 25% and years
+    of experience against ``min_years_experience`` the remaining 15%.
+    """
+    max_points = technical_criteria.get("max_points", 35)
+    required = technical_criteria.get("required_skills", [])
+    preferred = technical_criteria.get("preferred_skills", [])
+    min_years = technical_criteria.get("min_years_experience", 0)
+
+    found = get_matcher(tuple(required) + tuple(preferred)).find(text)
+    required_matched = [skill for skill in required if skill in found]
+    preferred_matched = [skill for skill in preferred if skill in found]
+    years = years_of_experience(text, today)
+
+    required_points = max_points * 0.60 * (len(required_matched) / len(required) if required else 1.0)
+    preferred_points = max_points * 0.25 * (len(preferred_matched) / len(preferred) if preferred else 1.0)
+    experience_points = max_points * 0.15 * (min(years / min_years, 1.0) if min_years else 1.0)
+
+    return {
+        "required_matched": required_matched,
+        "required_missing": [skill for skill in required if skill not in found],
+        "preferred_matched": preferred_matched,
+        "preferred_missing": [skill for skill in preferred if skill not in found],
+        "years_experience": years,
+        "required_points": round(required_points, 2),
+        "preferred_points": round(preferred_points, 2),
+        "experience_points": round(experience_points, 2),
+        "score": round(required_points + preferred_points + experience_points, 2),
+        "max_points": max_points,
+    }
+
+
+def prefilter(resumes: Dict[str, str], technical_criteria: Dict[str, Any], min_required_ratio: float = 1.0, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """Rank resumes by local technical score before any LLM call.
+
+    ``resumes`` maps an id to resume text. Resumes matching fewer than
+    ``min_required_ratio`` of the required skills are dropped.
+    """
+    required = technical_criteria.get("required_skills", [])
+    ranked = []
+    for resume_id, text in resumes.items():
+        result = score_technical(text, technical_criteria, today)
+        ratio = len(result["required_matched"]) / len(required) if required else 1.0
+        if ratio >= min_required_ratio:
+            ranked.append({"resume_id": resume_id, **result})
+    ranked.sort(key=lambda item: item["score"], reverse=True)
+    return ranked
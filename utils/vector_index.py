@@ -0,0 +1,154 @@
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.resume_sections import split_sections
+
+CHUNK_CHARS = 1500
+
+
+def chunk_resume(text: str, chunk_chars: int = CHUNK_CHARS) -> List[Tuple[str, str]]:
+    """Split resume text into (section, chunk) pairs no longer than ``chunk_chars``"""
+    chunks = []
+    for section, body in split_sections(text).items():
+        lines, size = [], 0
+        for line in body.splitlines():
+            if lines and size + len(line) > chunk_chars:
+                chunks.append((section, "\n".join(lines)))
+                lines, size = [], 0
+            lines.append(line[:chunk_chars])
+            size += len(line) + 1
+        if lines:
+            chunks.append((section, "\n".join(lines)))
+    return [(section, chunk) for section, chunk in chunks if chunk.strip()]
+
+
+class NumpyVectorIndex:
+    """In-process brute-force cosine index, for local runs and tests"""
+    def __init__(self):
+        # Empty again after a restart, so every process gets its own name
+        self.name = f"numpy:{uuid.uuid4().hex}"
+        self._vectors: Optional[np.ndarray] = None
+        self._payloads: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def upsert(self, resume_id: str, vectors: List[List[float]], payloads: List[Dict[str, Any]]):
+        matrix = np.asarray(vectors, dtype=np.float32)
+        # Normalise once at write time so search is a single matrix product
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        with self._lock:
+            self._delete(resume_id)
+            self._vectors = matrix if self._vectors is None else np.vstack([self._vectors, matrix])
+            self._payloads.extend({**payload, "resume_id": resume_id} for payload in payloads)
+
+    def _delete(self, resume_id: str):
+        if self._vectors is None:
+            return
+        keep = [index for index, payload in enumerate(self._payloads) if payload["resume_id"] != resume_id]
+        self._vectors = self._vectors[keep] if keep else None
+        self._payloads = [self._payloads[index] for index in keep]
+
+    def delete(self, resume_id: str):
+        with self._lock:
+            self._delete(resume_id)
+
+    def search(self, vector: List[float], limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            if self._vectors is None:
+                return []
+            query = np.asarray(vector, dtype=np.float32)
+            query /= np.linalg.norm(query) + 1e-12
+            scores = self._vectors @ query
+            limit = min(limit, len(scores))
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[index]), self._payloads[index]) for index in top]
+
+
+class QdrantVectorIndex:
+    """Qdrant-backed index; needs the optional qdrant-client package"""
+    def __init__(self, url: str, collection_name: str = "resume_chunks"):
+        from qdrant_client import QdrantClient
+
+        self.client = QdrantClient(url=url)
+        self.collection_name = collection_name
+        self.name = f"qdrant:{url}/{collection_name}"
+        self._dimension: Optional[int] = None
+
+    def _ensure_collection(self, dimension: int):
+        from qdrant_client.models import Distance, VectorParams
+
+        if self._dimension == dimension:
+            return
+        if not self.client.collection_exists(self.collection_name):
+            self.client.create_collection(
+                self.collection_name,
+                vectors_config=VectorParams(size=dimension, distance=Distance.COSINE),
+            )
+        self._dimension = dimension
+
+    def upsert(self, resume_id: str, vectors: List[List[float]], payloads: List[Dict[str, Any]]):
+        from qdrant_client.models import PointStruct
+
+        self._ensure_collection(len(vectors[0]))
+        self.delete(resume_id)
+        points = [
+            # Deterministic ids so re-indexing a resume overwrites its chunks
+            PointStruct(id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{resume_id}:{index}")), vector=vector, payload={**payload, "resume_id": resume_id})
+            for index, (vector, payload) in enumerate(zip(vectors, payloads))
+        ]
+        self.client.upsert(self.collection_name, points=points)
+
+    def delete(self, resume_id: str):
+        from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchValue
+
+        if not self.client.collection_exists(self.collection_name):
+            return
+        self.client.delete(
+            self.collection_name,
+            points_selector=FilterSelector(filter=Filter(must=[FieldCondition(key="resume_id", match=MatchValue(value=resume_id))])),
+        )
+
+    def search(self, vector: List[float], limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+        if not self.client.collection_exists(self.collection_name):
+            return []
+        response = self.client.query_points(self.collection_name, query=vector, limit=limit, with_payload=True)
+        return [(point.score, point.payload) for point in response.points]
+
+
+class ResumeIndex:
+    """Embeds resume chunks and job descriptions and shortlists resumes by similarity.
+
+    ``embeddings`` is any LangChain Embeddings implementation and ``backend``
+    one of the vector index classes above.
+    """
+    def __init__(self, embeddings, backend):
+        self.embeddings = embeddings
+        self.backend = backend
+        # What a resume record stores once indexed here; another backend or
+        # embedding model means the resume has to be embedded again
+        self.name = f"{backend.name}:{getattr(embeddings, 'model', type(embeddings).__name__)}"
+
+    def index_resume(self, resume_id: str, text: str) -> int:
+        chunks = chunk_resume(text)
+        if not chunks:
+            return 0
+        vectors = self.embeddings.embed_documents([chunk for _, chunk in chunks])
+        payloads = [{"section": section, "text": chunk[:200]} for section, chunk in chunks]
+        self.backend.upsert(resume_id, vectors, payloads)
+        return len(chunks)
+
+    def remove_resume(self, resume_id: str):
+        self.backend.delete(resume_id)
+
+    def shortlist(self, job_description: str, k: int = 50, chunks_per_resume: int = 8) -> List[Dict[str, Any]]:
+        """Top-k resumes for a job description, scored by their best matching chunk"""
+        vector = self.embeddings.embed_query(job_description)
+        best: Dict[str, Dict[str, Any]] = {}
+        for score, payload in self.backend.search(vector, k * chunks_per_resume):
+            resume_id = payload["resume_id"]
+            if resume_id not in best or score > best[resume_id]["score"]:
+                best[resume_id] = {"resume_id": resume_id, "score": score, "best_section": payload.get("section")}
+        return sorted(best.values(), key=lambda item: item["score"], reverse=True)[:k]
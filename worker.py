@@ -0,0 +1,29 @@
+"""Run resume processing workers outside the API process.
+
+    JOB_WORKERS=0 uvicorn service:app   # API only enqueues
+    python worker.py --concurrency 4    # one or more worker processes drain the queue
+"""
+import argparse
+import asyncio
+
+from utils.config import settings
+from utils.job_queue import JobWorkerPool
+
+
+async def main(concurrency: int):
+    import service
+
+    await service.init_resources()
+    pool = JobWorkerPool(service.job_queue, service.run_evaluation_job, concurrency=concurrency)
+    try:
+        await pool.run_forever()
+    finally:
+        await pool.stop()
+        await service.close_resources()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume processing worker")
+    parser.add_argument("--concurrency", type=int, default=max(settings.job_workers, 1))
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))